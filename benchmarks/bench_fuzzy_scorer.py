@@ -0,0 +1,119 @@
+"""
+Нечеткий поиск: прежний путь поисковиков (fuzzywuzzy.process.extract
+с fuzz.token_sort_ratio и поиском индекса через list.index) против
+пакетной оценки services/fuzzy_scorer (rapidfuzz.process.cdist).
+
+Корпуса - синтетические ФИО и названия организаций на 100, 1 000 и 10 000 записей.
+Поисковики нормализуют корпус на каждый запрос, поэтому в первых двух
+вариантах нормализация входит в замер; "prepared" - корпус подготовлен заранее,
+как в ProfessionSearcher; "index" - FuzzyIndex с отбором кандидатов по триграммам
+(fuzzy_shortlist_size; небольшие корпуса оцениваются целиком),
+"build" - время построения индекса триграмм.
+
+Запуск:
+    python benchmarks/bench_fuzzy_scorer.py [--sizes 100,1000,10000] [--queries 50]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fuzzywuzzy import fuzz, process
+
+from services.fio_searcher import FioSearcher
+from services.fuzzy_scorer import FuzzyIndex, NgramIndex, fuzzy_scorer
+
+LAST_NAMES = ['Иванов', 'Петров', 'Сидоров', 'Кузнецов', 'Смирнов', 'Попов', 'Васильев', 'Соколов',
+              'Михайлов', 'Новиков', 'Федоров', 'Морозов', 'Волков', 'Алексеев', 'Лебедев', 'Семенов']
+FIRST_NAMES = ['Иван', 'Петр', 'Сергей', 'Андрей', 'Дмитрий', 'Алексей', 'Михаил', 'Николай',
+               'Елена', 'Ольга', 'Наталья', 'Мария', 'Анна', 'Татьяна', 'Ирина', 'Светлана']
+MIDDLE_NAMES = ['Иванович', 'Петрович', 'Сергеевич', 'Андреевич', 'Дмитриевич', 'Алексеевич',
+                'Михайловна', 'Николаевна', 'Владимировна', 'Александровна', 'Юрьевна', 'Олеговна']
+ORG_WORDS = ['ГБУЗ ТО', 'Городская поликлиника', 'Областная больница', 'Детская', 'Стоматологическая',
+             'Консультативно-диагностический центр', 'Перинатальный центр', 'филиал', 'отделение']
+STREETS = ['Ленина', 'Республики', 'Мельникайте', 'Широтная', 'Пермякова', 'Котовского', 'Холодильная']
+
+
+def build_corpus(size: int, rng: random.Random) -> list:
+    corpus = []
+    for i in range(size):
+        if i % 2:
+            corpus.append(f"{rng.choice(LAST_NAMES)}{i} {rng.choice(FIRST_NAMES)} {rng.choice(MIDDLE_NAMES)}")
+        else:
+            corpus.append(f"{rng.choice(ORG_WORDS)} №{i} г. Тюмень, ул. {rng.choice(STREETS)}, д. {i % 150}")
+    return corpus
+
+
+def make_query(text: str, rng: random.Random) -> str:
+    """Фраза пользователя: часть слов, переставленных, с опечаткой."""
+    words = text.split()
+    words = rng.sample(words, max(1, len(words) - 1))
+    word = words[0]
+    if len(word) > 3:
+        position = rng.randrange(len(word))
+        words[0] = word[:position] + word[position + 1:]
+    return ' '.join(words)
+
+
+def legacy_extract(query: str, corpus: list, limit: int = 5) -> list:
+    normalize = FioSearcher._normalize_text
+    normalized_input = normalize(query)
+    normalized = [normalize(text) for text in corpus]
+    matches = process.extract(normalized_input, normalized, scorer=fuzz.token_sort_ratio, limit=limit)
+    return [(normalized.index(matched), score) for matched, score in matches]
+
+
+def engine_extract(query: str, corpus: list, limit: int = 5) -> list:
+    normalize = FioSearcher._normalize_text
+    normalized = [normalize(text) for text in corpus]
+    return fuzzy_scorer.extract(normalize(query), normalized, limit=limit)
+
+
+def timed(function, queries) -> tuple:
+    start = time.perf_counter()
+    results = [function(query) for query in queries]
+    return (time.perf_counter() - start) / len(queries) * 1000, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Бенчмарк пакетной нечеткой оценки')
+    parser.add_argument('--sizes', default='100,1000,10000')
+    parser.add_argument('--queries', type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'corpus':>7} {'fuzzywuzzy, ms':>15} {'scorer, ms':>11} {'prepared, ms':>13} {'index, ms':>10} "
+          f"{'build, ms':>10} {'same top-1':>11} {'index top-1':>12}")
+    for size in (int(size) for size in args.sizes.split(',')):
+        rng = random.Random(size)
+        corpus = build_corpus(size, rng)
+        queries = [make_query(rng.choice(corpus), rng) for _ in range(args.queries)]
+        normalized = [FioSearcher._normalize_text(text) for text in corpus]
+        prepared = fuzzy_scorer.prepare(normalized)
+
+        legacy_ms, legacy = timed(lambda query: legacy_extract(query, corpus), queries)
+        engine_ms, engine = timed(lambda query: engine_extract(query, corpus), queries)
+        prepared_ms, _ = timed(
+            lambda query: fuzzy_scorer.extract(FioSearcher._normalize_text(query), prepared, prepared=True), queries
+        )
+        start = time.perf_counter()
+        NgramIndex(prepared)
+        build_ms = (time.perf_counter() - start) * 1000
+        # Индекс триграмм строится в конструкторе (для корпусов больше shortlist_size * fuzzy_shortlist_min_ratio)
+        index = FuzzyIndex(normalized)
+        index_ms, indexed = timed(lambda query: index.extract(FioSearcher._normalize_text(query)), queries)
+
+        # list.index в прежнем пути возвращает первый из одинаковых текстов - сравниваем оценки и тексты
+        def top1(matches):
+            return [(normalized[i], s) for i, s in matches[:1]]
+
+        same = sum(top1(old) == top1(new) for old, new in zip(legacy, engine))
+        same_index = sum(top1(old) == top1(new) for old, new in zip(legacy, indexed))
+        print(f"{size:>7} {legacy_ms:>15.2f} {engine_ms:>11.2f} {prepared_ms:>13.2f} {index_ms:>10.2f} "
+              f"{build_ms:>10.1f} {same:>8}/{len(queries)} {same_index:>9}/{len(queries)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Время и память загрузки таблицы mo_alias: прежнее чтение xlsx через pandas
+против скомпилированного mo_alias.bin (utils/mo_alias_artifact).
+
+Каждый вариант запускается в отдельном процессе, чтобы замерить холодный
+старт вместе с импортами; память - пиковый RSS процесса (ru_maxrss).
+
+Запуск:
+    python benchmarks/bench_mo_alias_startup.py [--xlsx mo_alias.xlsx] [--runs 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils.mo_alias_artifact import compile_artifact
+
+MEASURE = '''
+import json, resource, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+{body}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    'seconds': elapsed,
+    'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'records': len(mo_alias),
+    'pandas': 'pandas' in sys.modules,
+}}))
+'''
+
+LEGACY = '''
+import pandas as pd
+df = pd.read_excel({xlsx!r})
+mo_alias = {{}}
+for _, row in df.iterrows():
+    short_text = row['Короткое наименование (текст)']
+    short_ttl = row['Короткое наименование (ttl)']
+    mo_alias[str(row['OID']).strip()] = {{
+        'short_name_text': None if pd.isna(short_text) else str(short_text),
+        'short_name_ttl': None if pd.isna(short_ttl) else str(short_ttl),
+    }}
+'''
+
+ARTIFACT = '''
+from utils.mo_alias_artifact import MoAliasArtifact
+artifact = MoAliasArtifact({artifact!r})
+mo_alias = artifact.to_dict()
+'''
+
+BASELINE = '''
+mo_alias = {{}}
+'''
+
+
+def run(body: str, runs: int) -> dict:
+    results = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', MEASURE.format(root=ROOT, body=body)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        results.append(json.loads(output))
+    return {
+        'seconds': statistics.median(result['seconds'] for result in results),
+        'rss_mb': statistics.median(result['rss_mb'] for result in results),
+        'records': results[0]['records'],
+        'pandas': results[0]['pandas'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Бенчмарк загрузки mo_alias')
+    parser.add_argument('--xlsx', default=os.path.join(ROOT, 'mo_alias.xlsx'))
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        artifact = os.path.join(tmp, 'mo_alias.bin')
+        compile_artifact(args.xlsx, artifact)
+        print(f"mo_alias.bin: {os.path.getsize(artifact) / 1024:.1f} KB")
+
+        variants = {
+            'interpreter': BASELINE.format(),
+            'pandas xlsx': LEGACY.format(xlsx=args.xlsx),
+            'mo_alias.bin': ARTIFACT.format(artifact=artifact),
+        }
+        print(f"{'variant':<14} {'records':>8} {'load, ms':>9} {'max RSS, MB':>12} {'pandas':>7}")
+        for name, body in variants.items():
+            result = run(body, args.runs)
+            print(f"{name:<14} {result['records']:>8} {result['seconds'] * 1000:>9.1f} "
+                  f"{result['rss_mb']:>12.1f} {str(result['pandas']):>7}")
+
+
+if __name__ == '__main__':
+    main()
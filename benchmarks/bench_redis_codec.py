@@ -0,0 +1,125 @@
+"""
+Сравнение кодирования значений сессии в Redis: прежний JSON против кодеков
+из services/redis_codec (json/msgpack, со сжатием zlib и без).
+
+Запуск:
+    python benchmarks/bench_redis_codec.py [--days 28] [--slots-per-day 40] [--medics 30] [--mos 20]
+    python benchmarks/bench_redis_codec.py --redis-url redis://localhost:6379/15 --sessions 1000
+
+С --redis-url в указанную базу пишется --sessions сессий каждым кодеком
+и замеряется память Redis на одну сессию (MEMORY USAGE); ключи удаляются.
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.redis_codec import ValueCodec
+from utils.fer_decoders import MedicalOrganization, Slot
+
+
+class LegacyJson:
+    """Прежний encode_value/decode_value: json.dumps с экранированием кириллицы."""
+
+    def encode(self, value):
+        return value if isinstance(value, (str, int, float)) else json.dumps(value)
+
+    def decode(self, value):
+        try:
+            return json.loads(value)
+        except (json.JSONDecodeError, TypeError):
+            return value
+
+
+CODECS = {
+    'legacy json': LegacyJson(),
+    'json': ValueCodec('json', compress_min_bytes=0),
+    'json+zlib': ValueCodec('json', compress_min_bytes=1024),
+    'msgpack': ValueCodec('msgpack', compress_min_bytes=0),
+    'msgpack+zlib': ValueCodec('msgpack', compress_min_bytes=1024),
+}
+
+
+def build_session(days: int, slots_per_day: int, medics: int, mos: int) -> dict:
+    start = datetime(2025, 1, 1, 8, 0)
+    slots = {}
+    for d in range(days):
+        for s in range(slots_per_day):
+            visit = start + timedelta(days=d, minutes=15 * s)
+            slot = Slot(str(d * 1000 + s), visit.strftime('%d.%m.%Y'), visit.strftime('%H:%M'), f"Кабинет {s % 10}")
+            slots.setdefault(slot.date, {})[slot.time] = slot.to_dict()
+    return {
+        'patient_id': '5f1c2a9e-4b7d-4c1e-9a3f-2d8e6b0c7a11',
+        'post_id': 109,
+        'medic_orgs': [
+            MedicalOrganization(str(100 + i), f"1.2.643.5.1.13.13.12.2.72.{9000 + i}",
+                                f'ГБУЗ ТО "Городская поликлиника №{i + 1}"',
+                                f"г. Тюмень, ул. Ленина, д. {i + 1}", '+7 (3452) 000000').to_dict()
+            for i in range(mos)
+        ],
+        'available_specialists': {f"Иванов{i} Иван Иванович": str(10000000000 + i) for i in range(medics)},
+        'selected_specialist': {'fio': 'Иванов1 Иван Иванович', 'snils': '10000000001'},
+        'available_slots': slots,
+        'selected_date': '01.01.2025',
+    }
+
+
+def bench_codecs(session: dict, number: int):
+    slots = session['available_slots']
+    print(f"{'codec':<14} {'slots, KB':>10} {'session, KB':>12} {'encode, ms':>11} {'decode, ms':>11}")
+    for name, codec in CODECS.items():
+        encoded = codec.encode(slots)
+        assert codec.decode(encoded) == slots, f"{name}: round trip differs"
+        size = len(encoded if isinstance(encoded, bytes) else str(encoded).encode('utf-8'))
+        session_size = sum(
+            len(value if isinstance(value, bytes) else str(value).encode('utf-8'))
+            for value in (codec.encode(value) for value in session.values())
+        )
+        encode_ms = timeit.timeit(lambda: codec.encode(slots), number=number) / number * 1000
+        decode_ms = timeit.timeit(lambda: codec.decode(encoded), number=number) / number * 1000
+        print(f"{name:<14} {size / 1024:>10.1f} {session_size / 1024:>12.1f} {encode_ms:>11.2f} {decode_ms:>11.2f}")
+
+
+def bench_redis_memory(session: dict, redis_url: str, sessions: int):
+    import redis
+
+    client = redis.Redis.from_url(redis_url)
+    print(f"\n{'codec':<14} {'memory per session, KB':>24}")
+    for name, codec in CODECS.items():
+        mapping = {field: codec.encode(value) for field, value in session.items()}
+        keys = [f"bench:codec:{i}:session" for i in range(sessions)]
+        with client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.hset(key, mapping=mapping)
+            pipe.execute()
+        with client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.memory_usage(key)
+            usage = pipe.execute()
+        client.delete(*keys)
+        print(f"{name:<14} {sum(usage) / len(usage) / 1024:>24.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Бенчмарк кодеков значений Redis')
+    parser.add_argument('--days', type=int, default=28)
+    parser.add_argument('--slots-per-day', type=int, default=40)
+    parser.add_argument('--medics', type=int, default=30)
+    parser.add_argument('--mos', type=int, default=20)
+    parser.add_argument('--number', type=int, default=50)
+    parser.add_argument('--redis-url', help='База Redis для замера памяти (ключи bench:codec:*)')
+    parser.add_argument('--sessions', type=int, default=1000)
+    args = parser.parse_args()
+
+    session = build_session(args.days, args.slots_per_day, args.medics, args.mos)
+    bench_codecs(session, args.number)
+    if args.redis_url:
+        bench_redis_memory(session, args.redis_url, args.sessions)
+
+
+if __name__ == '__main__':
+    main()
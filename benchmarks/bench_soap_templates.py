@@ -0,0 +1,58 @@
+"""
+Сравнение формирования SOAP конвертов: чтение шаблона с диска + str.format
+(прежний FERClient.load_xml_template) против предкомпилированного реестра.
+
+Запуск: python benchmarks/bench_soap_templates.py [--number 20000]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from clients.soap_templates import soap_templates, TEMPLATES_DIR
+
+
+SAMPLE_DATA = {
+    'session_id': 'a1b2c3d4-e5f6-7890-abcd-ef1234567890',
+    'snils': '11223344595',
+    'first_name': 'Иван',
+    'last_name': 'Иванов',
+    'middle_name': 'Иванович',
+    'birth_date': '1980-01-01',
+    'gender': 'M',
+    'phone': '+7(919)9340710',
+    'post_id': 109,
+    'oid': '1.2.643.5.1.13.13.12.2.72.7326.0.20901',
+    'specialist_snils': '11223344595',
+    'date_start': '2025-01-01',
+    'date_end': '2025-01-15',
+    'time_start': '06:00:00',
+    'time_end': '23:59:59',
+    'slot_id': '123456',
+}
+
+
+def legacy_render(action, data):
+    with open(os.path.join(TEMPLATES_DIR, f"{action}.xml"), 'r', encoding='utf-8') as file:
+        xml_template = file.read()
+    return xml_template.format(**data).encode('utf-8')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Бенчмарк формирования SOAP конвертов')
+    parser.add_argument('--number', type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'action':<32} {'legacy, us':>12} {'compiled, us':>14} {'speedup':>9}")
+    for action in sorted(soap_templates.actions()):
+        legacy = timeit.timeit(lambda: legacy_render(action, SAMPLE_DATA), number=args.number)
+        compiled = timeit.timeit(lambda: soap_templates.render(action, SAMPLE_DATA), number=args.number)
+        legacy_us = legacy / args.number * 1e6
+        compiled_us = compiled / args.number * 1e6
+        print(f"{action:<32} {legacy_us:>12.2f} {compiled_us:>14.2f} {legacy_us / compiled_us:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
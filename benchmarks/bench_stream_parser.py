@@ -0,0 +1,149 @@
+"""
+Сравнение разбора больших ответов GetMOResourceInfo / GetScheduleInfo:
+etree.fromstring + xpath (прежний PatientService) против потокового iterparse.
+
+Запуск:
+    python benchmarks/bench_stream_parser.py [--medics 300] [--days 28] [--slots-per-day 40]
+    python benchmarks/bench_stream_parser.py --medics-file resp.xml --slots-file resp.xml
+    python benchmarks/bench_stream_parser.py --corpus fer_corpus   # самые большие ответы из записанного корпуса
+"""
+import argparse
+import os
+import sys
+import timeit
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lxml import etree
+
+from clients.fer_recorder import load_corpus
+from utils.slots_parser import prepare_slots
+from utils.fer_stream_parser import parse_medics_stream, parse_slots_stream
+
+
+NAMESPACES = {
+    'soap': 'http://schemas.xmlsoap.org/soap/envelope/',
+    'ns': 'http://www.rt-eu.ru/med/er/v2_0'
+}
+
+ENVELOPE = (
+    '<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">'
+    '<soap:Body>{body}</soap:Body></soap:Envelope>'
+)
+
+
+def build_medics_response(medics: int, days: int) -> str:
+    start = datetime(2025, 1, 1)
+    resources = []
+    for i in range(medics):
+        dates = ''.join(
+            f"<Available_Date>{(start + timedelta(days=d)).strftime('%Y-%m-%d')}</Available_Date>"
+            for d in range(days)
+        ) if i % 5 else ''
+        resources.append(
+            '<Resource>'
+            f'<Specialist><SNILS>{10000000000 + i}</SNILS><Last_Name>Иванов{i}</Last_Name>'
+            f'<First_Name>Иван</First_Name><Middle_Name>Иванович</Middle_Name></Specialist>'
+            f'<Available_Dates>{dates}</Available_Dates>'
+            '</Resource>'
+        )
+    body = (
+        '<GetMOResourceInfoResponse xmlns="http://www.rt-eu.ru/med/er/v2_0"><MO_Resource_List>'
+        f'<MO_Available><Resource_Available>{"".join(resources)}</Resource_Available></MO_Available>'
+        '</MO_Resource_List></GetMOResourceInfoResponse>'
+    )
+    return ENVELOPE.format(body=body)
+
+
+def build_slots_response(days: int, slots_per_day: int) -> str:
+    start = datetime(2025, 1, 1, 8, 0)
+    slots = []
+    for d in range(days):
+        for s in range(slots_per_day):
+            visit = start + timedelta(days=d, minutes=15 * s)
+            slots.append(
+                f'<Slots><Slot_Id>{d * 1000 + s}</Slot_Id>'
+                f'<VisitTime>{visit.strftime("%Y-%m-%dT%H:%M:%S")}</VisitTime>'
+                f'<Room>Кабинет {s % 10}</Room></Slots>'
+            )
+    body = (
+        '<GetScheduleInfoResponse xmlns="http://www.rt-eu.ru/med/er/v2_0">'
+        f'<Schedule>{"".join(slots)}</Schedule></GetScheduleInfoResponse>'
+    )
+    return ENVELOPE.format(body=body)
+
+
+def legacy_medics(response: str):
+    root = etree.fromstring(response)
+    resource_elements = root.xpath(
+        '//ns:GetMOResourceInfoResponse/ns:MO_Resource_List/ns:MO_Available/ns:Resource_Available/ns:Resource',
+        namespaces=NAMESPACES
+    )
+    medics = defaultdict(dict)
+    for resource in resource_elements:
+        last_name = resource.xpath('ns:Specialist/ns:Last_Name/text()', namespaces=NAMESPACES)
+        first_name = resource.xpath('ns:Specialist/ns:First_Name/text()', namespaces=NAMESPACES)
+        middle_name = resource.xpath('ns:Specialist/ns:Middle_Name/text()', namespaces=NAMESPACES)
+        snils = resource.xpath('ns:Specialist/ns:SNILS/text()', namespaces=NAMESPACES)
+        no_schedule_reason = resource.xpath('ns:No_Schedule_Reason/ns:No_Schedule_Reason_Сode/text()', namespaces=NAMESPACES)
+        available_dates = resource.xpath('ns:Available_Dates/ns:Available_Date/text()', namespaces=NAMESPACES)
+        if len(no_schedule_reason) > 0 or len(available_dates) == 0:
+            continue
+        specialist = f"{last_name[0] if last_name else ''} {first_name[0] if first_name else ''} {middle_name[0] if middle_name else ''}"
+        medics[specialist] = snils[0] if snils else None
+    return medics
+
+
+def legacy_slots(response: str):
+    root = etree.fromstring(response)
+    slots_elements = root.xpath('//ns:GetScheduleInfoResponse/ns:Schedule/ns:Slots', namespaces=NAMESPACES)
+    return prepare_slots(slots_elements, NAMESPACES)
+
+
+def bench(name: str, response: str, legacy, stream, number: int):
+    assert legacy(response) == stream(response), f"{name}: results differ"
+    legacy_ms = timeit.timeit(lambda: legacy(response), number=number) / number * 1000
+    stream_ms = timeit.timeit(lambda: stream(response), number=number) / number * 1000
+    size_kb = len(response.encode('utf-8')) / 1024
+    print(f"{name:<28} {size_kb:>9.0f} {legacy_ms:>12.2f} {stream_ms:>12.2f} {legacy_ms / stream_ms:>8.1f}x")
+
+
+def read(path: str) -> str:
+    with open(path, 'r', encoding='utf-8') as file:
+        return file.read()
+
+
+def largest_recorded(corpus_dir: str, action: str) -> str:
+    records = load_corpus(corpus_dir, action)
+    if not records:
+        raise SystemExit(f"В корпусе {corpus_dir} нет записей {action}")
+    return max((record['response'] for record in records), key=len)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Бенчмарк разбора больших ответов FER')
+    parser.add_argument('--medics', type=int, default=300)
+    parser.add_argument('--days', type=int, default=28)
+    parser.add_argument('--slots-per-day', type=int, default=40)
+    parser.add_argument('--number', type=int, default=20)
+    parser.add_argument('--medics-file', help='Записанный ответ GetMOResourceInfoResponse')
+    parser.add_argument('--slots-file', help='Записанный ответ GetScheduleInfoResponse')
+    parser.add_argument('--corpus', help='Каталог корпуса, записанного с FER_RECORD_DIR')
+    args = parser.parse_args()
+
+    if args.corpus:
+        medics_response = largest_recorded(args.corpus, 'GetMOResourceInfoRequest')
+        slots_response = largest_recorded(args.corpus, 'GetScheduleInfoRequest')
+    else:
+        medics_response = read(args.medics_file) if args.medics_file else build_medics_response(args.medics, args.days)
+        slots_response = read(args.slots_file) if args.slots_file else build_slots_response(args.days, args.slots_per_day)
+
+    print(f"{'response':<28} {'size, KB':>9} {'xpath, ms':>12} {'stream, ms':>12} {'speedup':>9}")
+    bench('GetMOResourceInfoResponse', medics_response, legacy_medics, parse_medics_stream, args.number)
+    bench('GetScheduleInfoResponse', slots_response, legacy_slots, parse_slots_stream, args.number)
+
+
+if __name__ == '__main__':
+    main()
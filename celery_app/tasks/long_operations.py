@@ -1,7 +1,7 @@
 from celery_app.app import celery_app
 from typing import Dict, Any
 from services.patient_service import patient_service
-from services.redis_service import redis_service
+from services.user_session import set_session_field
 import logging
 
 logger = logging.getLogger(__name__)
@@ -40,7 +40,7 @@ def process_get_mo(
         medic_orgs = patient_service.get_mo(patient_data, post_id)
         print(medic_orgs)
         if len(medic_orgs) > 0:
-            redis_service.hset(f"user:{user_id}:session", 'medic_orgs', medic_orgs, 900)
+            set_session_field(user_id, 'medic_orgs', medic_orgs, 900)
             pass
         return True
     except Exception as exc:
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Dict, Any, Optional
+
+import aiohttp
+
+from clients.fer_client import FERClient
+from clients.fer_errors import FERClientError
+from clients.fer_circuit_breaker import fer_breakers
+from clients.fer_coalescer import fer_coalescer
+from clients.fer_recorder import fer_recorder, fer_replay
+from config import config
+
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncFERClient(FERClient):
+    """Асинхронный клиент для работы с FER SOAP API.
+
+    Все запросы процесса идут через один aiohttp.ClientSession с ограниченным
+    пулом keep-alive соединений и кэшем DNS, поэтому вызовы FER не блокируют
+    цикл событий и не открывают новое TLS соединение на каждый запрос.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Ленивая инициализация HTTP сессии (создается внутри работающего цикла событий)."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=config.fer_pool_size,                    # Всего соединений в пуле
+                limit_per_host=config.fer_pool_size_per_host,  # Соединений к одному хосту
+                keepalive_timeout=config.fer_keepalive_timeout,
+                use_dns_cache=True,
+                ttl_dns_cache=config.fer_dns_cache_ttl,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.default_timeout),
+                headers={
+                    'Content-Type': 'text/xml; charset=utf-8',
+                    'Authorization': self.token,
+                },
+            )
+            logger.info("AsyncFERClient session created")
+        return self._session
+
+    async def send(
+        self,
+        action: str,
+        data: Dict[str, Any]
+    ) -> str:
+        # Одинаковые запросы в полете объединяются внутри процесса и между воркерами
+        return await fer_coalescer.send(action, data, self._send)
+
+    async def _send(
+        self,
+        action: str,
+        data: Dict[str, Any]
+    ) -> str:
+        xml_body = self.render_xml(action, data)
+
+        if fer_replay.enabled:
+            response_text, latency = fer_replay.lookup(action, data)
+            await asyncio.sleep(latency)
+            return response_text
+
+        breaker = fer_breakers.get(action)
+        is_probe = await breaker.aacquire()
+        start_time = time.monotonic()
+        ok = False
+        cancelled = False
+        try:
+            async with self.session.post(
+                self.endpoint_url.get_secret_value(),
+                data=xml_body,
+                headers={'SOAPAction': action},
+                timeout=aiohttp.ClientTimeout(total=breaker.timeout())
+            ) as response:
+                if response.status != 200:
+                    logger.error(f"FER API request failed with status code {response.status}")
+                    raise FERClientError(f"FER API request failed with status code {response.status}")
+                text = await response.text()
+                ok = True
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"FER API request {action} failed: {e!r}")
+            raise FERClientError(f"FER API request {action} failed: {e!r}") from e
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        finally:
+            latency = time.monotonic() - start_time
+            if cancelled:
+                # Запрос отменил вызывающий код (например, find_patient) - это не отказ FER
+                breaker.cancel(is_probe)
+            else:
+                await breaker.arelease(is_probe, ok, latency)
+
+        if fer_recorder.enabled:
+            await asyncio.to_thread(fer_recorder.record, action, data, text, latency)
+        return text
+
+    async def close(self):
+        """Закрывает HTTP сессию и пул соединений."""
+        if self._session and not self._session.closed:
+            await self._session.close()
+            logger.info("AsyncFERClient session closed")
+        self._session = None
+
+
+# Создаем глобальный экземпляр сервиса
+async_fer_client = AsyncFERClient()
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import logging
+import time
+from collections import Counter, deque
+from typing import Dict
+
+from redis.exceptions import RedisError
+
+from clients.fer_errors import FERServiceBusyError
+from config import config
+from services.async_redis_service import async_redis_service
+from services.redis_service import redis_service
+
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """
+    Предохранитель для одного SOAP действия FER.
+
+    Ведет скользящее окно результатов и времени ответа. Если доля ошибок
+    (включая таймауты) в окне превышает порог, предохранитель размыкается:
+    запросы сразу отклоняются с FERServiceBusyError, а состояние публикуется
+    в Redis, чтобы остальные воркеры тоже перестали нагружать FER.
+    По истечении паузы пропускается один пробный запрос (half-open).
+
+    Общее состояние читается и публикуется синхронным клиентом Redis
+    в acquire/release (FERClient, Celery) и асинхронным - в aacquire/arelease
+    (AsyncFERClient), чтобы не блокировать цикл событий.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    # Как часто (сек) сверяться с общим состоянием в Redis
+    shared_state_interval = 1.0
+
+    def __init__(self, action: str):
+        self.action = action
+        self.redis_key = f"fer:breaker:{action}"
+        self._calls = deque(maxlen=1000)  # (время завершения, успех, длительность)
+        self._inflight = 0
+        self._open_until = 0.0
+        self._probe_in_flight = False
+        self._shared_checked_at = 0.0
+        self._timeout = float(config.fer_timeout)
+        self._timeout_computed_at = 0.0
+        self.stats = Counter()
+
+    @property
+    def state(self) -> str:
+        now = time.time()
+        self._sync_shared_state(now)
+        return self._local_state(now)
+
+    async def astate(self) -> str:
+        now = time.time()
+        await self._async_sync_shared_state(now)
+        return self._local_state(now)
+
+    def _local_state(self, now: float) -> str:
+        if now < self._open_until:
+            return self.OPEN
+        if self._open_until:
+            return self.HALF_OPEN
+        return self.CLOSED
+
+    def acquire(self) -> bool:
+        """
+        Резервирует место для запроса.
+
+        Returns:
+            bool: True, если запрос пробный (half-open)
+
+        Raises:
+            FERServiceBusyError: предохранитель разомкнут или превышен лимит одновременных запросов
+        """
+        return self._admit(self.state)
+
+    async def aacquire(self) -> bool:
+        """Асинхронный вариант acquire."""
+        return self._admit(await self.astate())
+
+    def _admit(self, state: str) -> bool:
+        is_probe = False
+
+        if state == self.OPEN:
+            self.stats['rejected_open'] += 1
+            raise FERServiceBusyError(f"FER {self.action}: circuit open")
+
+        if state == self.HALF_OPEN:
+            if self._probe_in_flight:
+                self.stats['rejected_open'] += 1
+                raise FERServiceBusyError(f"FER {self.action}: circuit half-open, probe in flight")
+            self._probe_in_flight = True
+            is_probe = True
+
+        if self._inflight >= config.fer_max_inflight:
+            if is_probe:
+                self._probe_in_flight = False
+            self.stats['shed'] += 1
+            raise FERServiceBusyError(f"FER {self.action}: too many requests in flight")
+
+        self._inflight += 1
+        return is_probe
+
+    def release(self, is_probe: bool, ok: bool, latency: float):
+        """Фиксирует результат запроса, зарезервированного через acquire."""
+        if self._record(is_probe, ok, latency):
+            try:
+                redis_service.client.set(self.redis_key, 1, px=self._open_ms())
+            except RedisError as e:
+                logger.warning(f"Failed to publish circuit state for {self.action}: {e}")
+
+    async def arelease(self, is_probe: bool, ok: bool, latency: float):
+        """Асинхронный вариант release."""
+        if self._record(is_probe, ok, latency):
+            try:
+                await async_redis_service.client.set(self.redis_key, 1, px=self._open_ms())
+            except RedisError as e:
+                logger.warning(f"Failed to publish circuit state for {self.action}: {e}")
+
+    def _record(self, is_probe: bool, ok: bool, latency: float) -> bool:
+        """Учитывает результат; True - предохранитель разомкнулся и состояние нужно опубликовать."""
+        now = time.time()
+        self._inflight -= 1
+        self._calls.append((now, ok, latency))
+        self.stats['success' if ok else 'failure'] += 1
+
+        if is_probe:
+            self._probe_in_flight = False
+            if ok:
+                logger.info(f"FER {self.action}: circuit closed")
+                self._open_until = 0.0
+                self._calls.clear()
+                return False
+            self._trip(now)
+            return True
+
+        if not ok and self._error_rate(now) >= config.fer_breaker_error_rate:
+            self._trip(now)
+            return True
+        return False
+
+    def cancel(self, is_probe: bool):
+        """Освобождает место отмененного запроса, не учитывая его в статистике."""
+        self._inflight -= 1
+        if is_probe:
+            self._probe_in_flight = False
+
+    def timeout(self) -> float:
+        """
+        Таймаут запроса по наблюдаемому p95 времени ответа.
+
+        Пока статистики мало - используется config.fer_timeout.
+        """
+        now = time.time()
+        if now - self._timeout_computed_at < 1.0:
+            return self._timeout
+
+        since = now - config.fer_breaker_window
+        latencies = sorted(latency for finished, ok, latency in self._calls if ok and finished >= since)
+        if len(latencies) < config.fer_breaker_min_calls:
+            self._timeout = float(config.fer_timeout)
+        else:
+            p95 = latencies[int(0.95 * (len(latencies) - 1))]
+            self._timeout = min(
+                float(config.fer_timeout),
+                max(config.fer_timeout_min, p95 * config.fer_timeout_p95_factor)
+            )
+        self._timeout_computed_at = now
+        return self._timeout
+
+    def _error_rate(self, now: float) -> float:
+        since = now - config.fer_breaker_window
+        window = [ok for finished, ok, _ in self._calls if finished >= since]
+        if len(window) < config.fer_breaker_min_calls:
+            return 0.0
+        return window.count(False) / len(window)
+
+    def _trip(self, now: float):
+        logger.warning(f"FER {self.action}: circuit opened for {config.fer_breaker_open_seconds}s")
+        self.stats['opened'] += 1
+        self._open_until = now + config.fer_breaker_open_seconds
+        self._calls.clear()
+
+    @staticmethod
+    def _open_ms() -> int:
+        return int(config.fer_breaker_open_seconds * 1000)
+
+    def _shared_state_due(self, now: float) -> bool:
+        if now - self._shared_checked_at < self.shared_state_interval:
+            return False
+        self._shared_checked_at = now
+        return True
+
+    def _apply_shared_ttl(self, now: float, ttl_ms):
+        if ttl_ms and ttl_ms > 0:
+            self._open_until = max(self._open_until, now + ttl_ms / 1000)
+
+    def _sync_shared_state(self, now: float):
+        if not self._shared_state_due(now):
+            return
+        try:
+            ttl_ms = redis_service.client.pttl(self.redis_key)
+        except RedisError:
+            return
+        self._apply_shared_ttl(now, ttl_ms)
+
+    async def _async_sync_shared_state(self, now: float):
+        if not self._shared_state_due(now):
+            return
+        try:
+            ttl_ms = await async_redis_service.client.pttl(self.redis_key)
+        except RedisError:
+            return
+        self._apply_shared_ttl(now, ttl_ms)
+
+
+class CircuitBreakerRegistry:
+    """Предохранители по SOAP действиям."""
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, action: str) -> CircuitBreaker:
+        breaker = self._breakers.get(action)
+        if breaker is None:
+            breaker = self._breakers[action] = CircuitBreaker(action)
+        return breaker
+
+    def states(self) -> Dict[str, str]:
+        return {action: breaker.state for action, breaker in self._breakers.items()}
+
+
+# Создаем глобальный экземпляр сервиса
+fer_breakers = CircuitBreakerRegistry()
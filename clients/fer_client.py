@@ -3,18 +3,20 @@ from __future__ import annotations
 import os
 import requests
 import logging
+import time
 from typing import Dict, Any
 from config import config
+from clients.soap_templates import soap_templates
+from clients.fer_coalescer import fer_coalescer
+from clients.fer_errors import FERClientError
+from clients.fer_circuit_breaker import fer_breakers
+from clients.fer_recorder import fer_recorder, fer_replay
 import base64
 
 
 logger = logging.getLogger(__name__)
 
 
-class FERClientError(Exception):
-    """Базовое исключение для ошибок FER клиента."""
-
-
 class FERClient:
     """Клиент для работы с FER SOAP API."""
     
@@ -30,54 +32,91 @@ class FERClient:
         
         self.base_dir = os.path.dirname(os.path.abspath(__file__))
         self.templates_dir = os.path.join(self.base_dir, 'templates')
+        self.templates = soap_templates
         
         logger.info(f"FERClient initialized with endpoint: {self.endpoint_url}")
 
-    def load_xml_template(
+    def render_xml(
         self,
         action: str,
-        data: Dict[str, str]
-    ) -> str:
+        data: Dict[str, Any]
+    ) -> bytes:
         """
-        Формирует строку SOAP XML запроса.
+        Формирует тело SOAP XML запроса в UTF-8 по предкомпилированному шаблону.
         """
-        filename = f"{action}.xml"
-        template_path = os.path.join(self.templates_dir, filename)
-        
         try:
-            with open(template_path, 'r', encoding='utf-8') as file:
-                xml_template = file.read()
-            return xml_template.format(**data)
-        except FileNotFoundError:
-            logger.error(f"XML template not found: {template_path}")
-            raise FERClientError(f"XML template not found: {template_path}")        
+            return self.templates.render(action, data)
         except KeyError as e:
             missing_key = str(e)
             logger.error(f"Missing required data key in XML template: {missing_key}")
             raise FERClientError(
                f"Missing required data key in XML template: {missing_key}"
             )
+        except LookupError as e:
+            logger.error(str(e))
+            raise FERClientError(str(e))
         except Exception as e:
             logger.error(f"Error loading XML template: {str(e)}")
             raise FERClientError(f"Error loading XML template: {str(e)}")
+
+    def load_xml_template(
+        self,
+        action: str,
+        data: Dict[str, Any]
+    ) -> str:
+        """
+        Формирует строку SOAP XML запроса.
+        """
+        return self.render_xml(action, data).decode('utf-8')
         
     def send(
         self,
         action: str,
         data: Dict[str, str]
     ) -> str:
-        xml_body = self.load_xml_template(action, data)
-                
+        # Одинаковые запросы из разных процессов выполняются один раз
+        return fer_coalescer.send_sync(action, data, self._send)
+
+    def _send(
+        self,
+        action: str,
+        data: Dict[str, str]
+    ) -> str:
+        xml_body = self.render_xml(action, data)
+
+        if fer_replay.enabled:
+            response_text, latency = fer_replay.lookup(action, data)
+            time.sleep(latency)
+            return response_text
+
         headers = {
             'Content-Type': 'text/xml; charset=utf-8',
             'Authorization': self.token,
             'SOAPAction': action
         }
-        response = requests.post(self.endpoint_url.get_secret_value(), data=xml_body, headers=headers)
-        if response.status_code != 200:
-            logger.error(f"FER API request failed with status code {response.status_code}")
-            raise FERClientError(f"FER API request failed with status code {response.status_code}")
-        
+        breaker = fer_breakers.get(action)
+        is_probe = breaker.acquire()
+        start_time = time.monotonic()
+        ok = False
+        try:
+            response = requests.post(
+                self.endpoint_url.get_secret_value(),
+                data=xml_body,
+                headers=headers,
+                timeout=breaker.timeout()
+            )
+            if response.status_code != 200:
+                logger.error(f"FER API request failed with status code {response.status_code}")
+                raise FERClientError(f"FER API request failed with status code {response.status_code}")
+            ok = True
+        except requests.RequestException as e:
+            logger.error(f"FER API request {action} failed: {e!r}")
+            raise FERClientError(f"FER API request {action} failed: {e!r}") from e
+        finally:
+            latency = time.monotonic() - start_time
+            breaker.release(is_probe, ok, latency)
+
+        fer_recorder.record(action, data, response.text, latency)
         return response.text
         
         
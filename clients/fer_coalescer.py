@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import Counter
+from typing import Dict, Any, Awaitable, Callable, Optional
+
+from redis.exceptions import RedisError
+
+from config import config
+from services.redis_service import redis_service
+from services.async_redis_service import async_redis_service
+
+
+logger = logging.getLogger(__name__)
+
+# Поля запроса, определяющие логический запрос (Session_ID пользователя не учитывается)
+COALESCED_ACTIONS = {
+    'GetMOInfoExtendedRequest': ('post_id',),
+    'GetMOResourceInfoRequest': ('oid', 'post_id', 'date_start', 'date_end'),
+    'GetScheduleInfoRequest': ('specialist_snils', 'post_id', 'date_start', 'date_end', 'time_start', 'time_end'),
+}
+
+
+def coalesce_key(action: str, data: Dict[str, Any]) -> Optional[str]:
+    """
+    Ключ логического запроса к FER.
+
+    Returns:
+        Optional[str]: Ключ или None, если действие нельзя объединять
+    """
+    fields = COALESCED_ACTIONS.get(action)
+    if fields is None:
+        return None
+    return ':'.join([action, *(str(data.get(field)) for field in fields)])
+
+
+class FERRequestCoalescer:
+    """
+    Объединение одинаковых одновременных запросов к FER (singleflight).
+
+    Внутри процесса одинаковые запросы ждут одну задачу asyncio.
+    Между воркерами запрос выполняет тот, кто взял блокировку в Redis,
+    остальные дожидаются результата по ключу fer:result:<ключ>.
+    """
+
+    def __init__(self):
+        self.lock_timeout = config.fer_timeout + 1
+        self.wait_timeout = config.fer_timeout
+        self.result_ttl = config.fer_coalesce_result_ttl
+        self.poll_interval = 0.05
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats = Counter()
+
+    @staticmethod
+    def _lock_key(key: str) -> str:
+        return f"fer:inflight:{key}"
+
+    @staticmethod
+    def _result_key(key: str) -> str:
+        return f"fer:result:{key}"
+
+    async def send(
+        self,
+        action: str,
+        data: Dict[str, Any],
+        sender: Callable[[str, Dict[str, Any]], Awaitable[str]]
+    ) -> str:
+        """
+        Выполняет запрос через sender, объединяя его с такими же запросами в полете.
+        """
+        key = coalesce_key(action, data)
+        if key is None:
+            return await sender(action, data)
+
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._send_across_workers(key, action, data, sender))
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.stats['shared_local'] += 1
+
+        # shield: отмена одного ожидающего не должна отменять запрос остальным
+        return await asyncio.shield(future)
+
+    async def _send_across_workers(
+        self,
+        key: str,
+        action: str,
+        data: Dict[str, Any],
+        sender: Callable[[str, Dict[str, Any]], Awaitable[str]]
+    ) -> str:
+        try:
+            lock = await self._aacquire(key)
+        except RedisError as e:
+            logger.warning(f"Coalescing via Redis unavailable: {e}")
+            return await sender(action, data)
+
+        if isinstance(lock, str):
+            self.stats['shared_remote'] += 1
+            return lock
+
+        if lock is None:
+            deadline = time.monotonic() + self.wait_timeout
+            while time.monotonic() < deadline:
+                await asyncio.sleep(self.poll_interval)
+                try:
+                    response, in_flight = await self._apoll(key)
+                except RedisError:
+                    break
+                if response is not None:
+                    self.stats['shared_remote'] += 1
+                    return response
+                if not in_flight:
+                    break
+            self.stats['fallback'] += 1
+            return await sender(action, data)
+
+        self.stats['leader'] += 1
+        try:
+            response = await sender(action, data)
+            await self._astore(key, response)
+            return response
+        finally:
+            await self._arelease(lock)
+
+    def send_sync(
+        self,
+        action: str,
+        data: Dict[str, Any],
+        sender: Callable[[str, Dict[str, Any]], str]
+    ) -> str:
+        """
+        Синхронный вариант send для FERClient (Celery): объединение только между процессами.
+        """
+        key = coalesce_key(action, data)
+        if key is None:
+            return sender(action, data)
+
+        try:
+            lock = self._acquire(key)
+        except RedisError as e:
+            logger.warning(f"Coalescing via Redis unavailable: {e}")
+            return sender(action, data)
+
+        if isinstance(lock, str):
+            self.stats['shared_remote'] += 1
+            return lock
+
+        if lock is None:
+            deadline = time.monotonic() + self.wait_timeout
+            while time.monotonic() < deadline:
+                time.sleep(self.poll_interval)
+                try:
+                    response, in_flight = self._poll(key)
+                except RedisError:
+                    break
+                if response is not None:
+                    self.stats['shared_remote'] += 1
+                    return response
+                if not in_flight:
+                    break
+            self.stats['fallback'] += 1
+            return sender(action, data)
+
+        self.stats['leader'] += 1
+        try:
+            response = sender(action, data)
+            self._store(key, response)
+            return response
+        finally:
+            self._release(lock)
+
+    def _acquire(self, key: str):
+        """
+        Returns:
+            str: готовый результат другого воркера
+            Lock: блокировка взята, запрос выполняет текущий воркер
+            None: запрос уже выполняет другой воркер
+        """
+        client = redis_service.client
+        response = client.get(self._result_key(key))
+        if response is not None:
+            return response
+
+        lock = client.lock(
+            self._lock_key(key),
+            timeout=self.lock_timeout,
+            blocking=False,
+            thread_local=False,
+        )
+        return lock if lock.acquire() else None
+
+    def _poll(self, key: str):
+        pipe = redis_service.client.pipeline(transaction=False)
+        pipe.get(self._result_key(key))
+        pipe.exists(self._lock_key(key))
+        response, in_flight = pipe.execute()
+        return response, bool(in_flight)
+
+    def _store(self, key: str, response: str):
+        try:
+            redis_service.client.set(self._result_key(key), response, ex=self.result_ttl)
+        except RedisError as e:
+            logger.warning(f"Failed to store coalesced FER result: {e}")
+
+    @staticmethod
+    def _release(lock):
+        try:
+            lock.release()
+        except Exception as e:
+            logger.warning(f"Failed to release FER coalescing lock: {e}")
+
+    # Асинхронные варианты для send: те же операции через redis.asyncio
+
+    async def _aacquire(self, key: str):
+        client = async_redis_service.client
+        response = await client.get(self._result_key(key))
+        if response is not None:
+            return response
+
+        lock = client.lock(
+            self._lock_key(key),
+            timeout=self.lock_timeout,
+            blocking=False,
+            thread_local=False,
+        )
+        return lock if await lock.acquire() else None
+
+    async def _apoll(self, key: str):
+        async with async_redis_service.pipeline(transaction=False) as pipe:
+            pipe.get(self._result_key(key))
+            pipe.exists(self._lock_key(key))
+            response, in_flight = await pipe.execute()
+        return response, bool(in_flight)
+
+    async def _astore(self, key: str, response: str):
+        try:
+            await async_redis_service.client.set(self._result_key(key), response, ex=self.result_ttl)
+        except RedisError as e:
+            logger.warning(f"Failed to store coalesced FER result: {e}")
+
+    @staticmethod
+    async def _arelease(lock):
+        try:
+            await lock.release()
+        except Exception as e:
+            logger.warning(f"Failed to release FER coalescing lock: {e}")
+
+
+# Создаем глобальный экземпляр сервиса
+fer_coalescer = FERRequestCoalescer()
@@ -0,0 +1,6 @@
+class FERClientError(Exception):
+    """Базовое исключение для ошибок FER клиента."""
+
+
+class FERServiceBusyError(FERClientError):
+    """FER перегружен или недоступен: запрос отклонен без обращения к сервису."""
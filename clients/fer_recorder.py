@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from lxml import etree
+
+from clients.fer_coalescer import coalesce_key
+from clients.fer_errors import FERClientError
+from config import config
+
+
+logger = logging.getLogger(__name__)
+
+# Поля запроса с персональными данными
+SENSITIVE_FIELDS = {
+    'phone', 'snils', 'specialist_snils', 'first_name', 'last_name', 'middle_name', 'birth_date',
+}
+# Элементы ответа с персональными данными
+SENSITIVE_TAGS = {
+    'Patient_Id', 'Last_Name', 'First_Name', 'Middle_Name', 'SNILS', 'Birth_Date', 'Phone', 'Session_ID', 'Book_Id_Mis',
+}
+# Поля, не влияющие на ответ FER
+IGNORED_FIELDS = {'session_id'}
+
+LOWER = 'абвгдежзийклмнопрстуфхцчшщъыьэюя'
+UPPER = LOWER.upper()
+
+
+class FERSanitizer:
+    """
+    Обезличивание запросов и ответов FER.
+
+    Значения заменяются псевдонимами той же длины и того же типа символов,
+    поэтому размер и структура ответов сохраняются. Замена детерминирована:
+    СНИЛС врача из ответа GetMOResourceInfo и из запроса GetScheduleInfo
+    получают один псевдоним, и записанные пары остаются связанными.
+    """
+
+    def __init__(self, salt: str = ''):
+        self.salt = salt.encode('utf-8')
+
+    def pseudonym(self, value: str) -> str:
+        digest = hashlib.blake2b(value.encode('utf-8'), key=self.salt[:64], digest_size=64).digest()
+        result = []
+        for i, char in enumerate(value):
+            byte = digest[i % len(digest)] + i // len(digest)
+            if char.isdigit():
+                result.append(str(byte % 10))
+            elif char in LOWER:
+                result.append(LOWER[byte % len(LOWER)])
+            elif char in UPPER:
+                result.append(UPPER[byte % len(UPPER)])
+            elif 'a' <= char.lower() <= 'z':
+                letter = chr(ord('a') + byte % 26)
+                result.append(letter.upper() if char.isupper() else letter)
+            else:
+                result.append(char)
+        return ''.join(result)
+
+    def request(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            field: self.pseudonym(str(value)) if field in SENSITIVE_FIELDS and value else value
+            for field, value in data.items()
+            if field not in IGNORED_FIELDS
+        }
+
+    def response(self, response: str) -> str:
+        try:
+            root = etree.fromstring(response.encode('utf-8'))
+        except etree.XMLSyntaxError:
+            # Не XML - персональные данные не разобрать, такой ответ не сохраняем
+            raise ValueError('Response is not valid XML')
+        for element in root.iter():
+            if isinstance(element.tag, str) and element.text and etree.QName(element).localname in SENSITIVE_TAGS:
+                element.text = self.pseudonym(element.text)
+        return etree.tostring(root, encoding='unicode')
+
+
+def replay_key(action: str, data: Dict[str, Any]) -> str:
+    """Ключ записи по обезличенному логическому запросу."""
+    key = coalesce_key(action, data)
+    if key is not None:
+        return key
+    return ':'.join([action, *(f"{field}={data[field]}" for field in sorted(data) if field not in IGNORED_FIELDS)])
+
+
+class FERRecorder:
+    """
+    Запись обезличенных пар запрос/ответ FER в корпус на диске.
+
+    Корпус - каталог с файлом <action>.jsonl.gz на каждое действие,
+    одна запись на строку: {'key', 'request', 'response', 'latency', 'recorded_at'}.
+    Включается настройкой FER_RECORD_DIR.
+    """
+
+    def __init__(self, corpus_dir: Optional[str] = None):
+        self.corpus_dir = corpus_dir
+        self.sanitizer = FERSanitizer(config.fer_record_salt.get_secret_value())
+        self.stats = Counter()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.corpus_dir)
+
+    def record(self, action: str, data: Dict[str, Any], response: str, latency: float):
+        """Сохраняет ответ; ошибки записи не влияют на запрос пользователя."""
+        if not self.enabled:
+            return
+        try:
+            request = self.sanitizer.request(data)
+            line = json.dumps({
+                'key': replay_key(action, request),
+                'request': request,
+                'response': self.sanitizer.response(response),
+                'latency': round(latency, 4),
+                'recorded_at': int(time.time()),
+            }, ensure_ascii=False)
+            with self._lock:
+                os.makedirs(self.corpus_dir, exist_ok=True)
+                with gzip.open(os.path.join(self.corpus_dir, f"{action}.jsonl.gz"), 'at', encoding='utf-8') as file:
+                    file.write(line + '\n')
+            self.stats[action] += 1
+        except Exception as e:
+            logger.warning(f"Failed to record FER {action} response: {e}")
+
+
+def load_corpus(corpus_dir: str, action: str) -> List[Dict[str, Any]]:
+    """Записи корпуса по действию (пустой список, если действие не записывалось)."""
+    path = os.path.join(corpus_dir, f"{action}.jsonl.gz")
+    if not os.path.exists(path):
+        return []
+    with gzip.open(path, 'rt', encoding='utf-8') as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+class FERReplayTransport:
+    """
+    Воспроизведение записанного корпуса вместо запросов к FER.
+
+    Запрос обезличивается так же, как при записи, и ищется по ключу.
+    Повторы одного ключа отдаются по кругу в порядке записи. Если точного
+    совпадения нет, отдается запись того же действия, выбранная по хэшу ключа
+    (ответ реальной формы для произвольных входных данных), а в строгом режиме
+    (FER_REPLAY_STRICT) - FERClientError. Включается настройкой FER_REPLAY_DIR.
+    """
+
+    def __init__(self, corpus_dir: Optional[str] = None):
+        self.corpus_dir = corpus_dir
+        self.strict = config.fer_replay_strict
+        self.with_latency = config.fer_replay_latency
+        self.sanitizer = FERSanitizer(config.fer_record_salt.get_secret_value())
+        self.stats = Counter()
+        self._records: Dict[str, Tuple[List[Dict[str, Any]], Dict[str, List[Dict[str, Any]]]]] = {}
+        self._cursors: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.corpus_dir)
+
+    def _action_records(self, action: str):
+        records = self._records.get(action)
+        if records is None:
+            records = load_corpus(self.corpus_dir, action)
+            by_key = defaultdict(list)
+            for record in records:
+                by_key[record['key']].append(record)
+            records = self._records[action] = (records, by_key)
+            logger.info(f"Loaded {len(records[0])} recorded FER {action} responses")
+        return records
+
+    def lookup(self, action: str, data: Dict[str, Any]) -> Tuple[str, float]:
+        """
+        Returns:
+            Tuple[str, float]: Записанный ответ и время ответа FER при записи (сек)
+        """
+        records, by_key = self._action_records(action)
+        key = replay_key(action, self.sanitizer.request(data))
+        if key not in by_key:
+            # Значения из воспроизведенных ответов (СНИЛС врача и т.п.) уже обезличены
+            raw_key = replay_key(action, data)
+            key = raw_key if raw_key in by_key else key
+
+        with self._lock:
+            matches = by_key.get(key)
+            if matches:
+                record = matches[self._cursors[key] % len(matches)]
+                self._cursors[key] += 1
+                self.stats['hit'] += 1
+            elif records and not self.strict:
+                index = int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'big')
+                record = records[index % len(records)]
+                self.stats['fallback'] += 1
+            else:
+                self.stats['miss'] += 1
+                raise FERClientError(f"No recorded FER response for {key}")
+
+        return record['response'], record['latency'] if self.with_latency else 0.0
+
+
+# Создаем глобальный экземпляр сервиса
+fer_recorder = FERRecorder(config.fer_record_dir)
+fer_replay = FERReplayTransport(config.fer_replay_dir)
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import os
+import logging
+from string import Formatter
+from typing import Dict, Any, List, Optional
+from xml.sax.saxutils import escape
+
+
+logger = logging.getLogger(__name__)
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+
+
+class SoapTemplate:
+    """
+    Скомпилированный шаблон SOAP конверта.
+
+    Шаблон разбирается один раз на список литеральных кусков и имен полей,
+    рендер только экранирует значения и склеивает строку.
+    """
+
+    __slots__ = ('action', 'fields', '_literals', '_placeholders')
+
+    def __init__(self, action: str, source: str):
+        self.action = action
+        self._literals: List[str] = []
+        self._placeholders: List[Optional[str]] = []
+
+        for literal, field_name, format_spec, conversion in Formatter().parse(source):
+            if field_name is not None and (format_spec or conversion or not field_name.isidentifier()):
+                raise ValueError(f"Unsupported placeholder {{{field_name}}} in template {action}")
+            self._literals.append(literal)
+            self._placeholders.append(field_name)
+
+        self.fields = frozenset(name for name in self._placeholders if name)
+
+    def render(self, data: Dict[str, Any]) -> bytes:
+        """
+        Формирует SOAP XML запрос.
+
+        Args:
+            data: Значения полей шаблона (экранируются для XML)
+
+        Returns:
+            bytes: Тело запроса в UTF-8
+
+        Raises:
+            KeyError: если в data нет поля, используемого в шаблоне
+        """
+        parts = []
+        for literal, field_name in zip(self._literals, self._placeholders):
+            parts.append(literal)
+            if field_name is not None:
+                parts.append(escape(str(data[field_name])))
+        return ''.join(parts).encode('utf-8')
+
+
+class SoapTemplateRegistry:
+    """Реестр SOAP шаблонов, загружаемых из clients/templates один раз при старте."""
+
+    def __init__(self, templates_dir: str = TEMPLATES_DIR):
+        self.templates_dir = templates_dir
+        self._templates: Dict[str, SoapTemplate] = {}
+
+    def load(self) -> 'SoapTemplateRegistry':
+        """Загружает и компилирует все *.xml шаблоны каталога."""
+        templates = {}
+        for filename in sorted(os.listdir(self.templates_dir)):
+            action, ext = os.path.splitext(filename)
+            if ext != '.xml':
+                continue
+            with open(os.path.join(self.templates_dir, filename), 'r', encoding='utf-8') as file:
+                templates[action] = SoapTemplate(action, file.read())
+
+        self._templates = templates
+        logger.info(f"Loaded {len(templates)} SOAP templates from {self.templates_dir}")
+        return self
+
+    def get(self, action: str) -> SoapTemplate:
+        """
+        Возвращает шаблон для действия.
+
+        Raises:
+            LookupError: если шаблон не найден
+        """
+        try:
+            return self._templates[action]
+        except KeyError:
+            raise LookupError(f"XML template not found: {action}") from None
+
+    def render(self, action: str, data: Dict[str, Any]) -> bytes:
+        return self.get(action).render(data)
+
+    def actions(self) -> List[str]:
+        return list(self._templates)
+
+
+# Шаблоны компилируются один раз при импорте (до форка воркеров gunicorn)
+soap_templates = SoapTemplateRegistry().load()
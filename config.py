@@ -1,12 +1,40 @@
 from pydantic_settings import BaseSettings
 from pydantic import SecretStr, Field
+from typing import Optional
 
 class Settings(BaseSettings):
     skill_id: SecretStr
     fer_url: SecretStr
     fer_timeout: int = Field(default=10)
+    fer_timeout_min: float = Field(default=1.0)
+    fer_timeout_p95_factor: float = Field(default=2.0)
+    fer_breaker_window: int = Field(default=30)
+    fer_breaker_min_calls: int = Field(default=10)
+    fer_breaker_error_rate: float = Field(default=0.5)
+    fer_breaker_open_seconds: int = Field(default=15)
+    fer_max_inflight: int = Field(default=20)
     fer_login: SecretStr
     fer_password: SecretStr
+    fer_pool_size: int = Field(default=100)
+    fer_pool_size_per_host: int = Field(default=30)
+    fer_keepalive_timeout: int = Field(default=30)
+    fer_dns_cache_ttl: int = Field(default=300)
+    fer_coalesce_result_ttl: int = Field(default=5)
+    fer_cache_enabled: bool = Field(default=True)
+    fer_cache_mo_ttl: int = Field(default=6 * 3600)
+    fer_cache_medics_ttl: int = Field(default=300)
+    fer_cache_slots_ttl: int = Field(default=30)
+    fer_find_patient_mode: str = Field(default='concurrent')  # 'concurrent' или 'sequential'
+    fer_find_patient_strategies: str = Field(default='snils,fio,phone')  # Порядок приоритета
+    fer_slots_strategy: str = Field(default='auto')  # 'auto', 'wide' или 'concurrent'
+    fer_slots_max_days: int = Field(default=28)
+    fer_slots_step_days: int = Field(default=7)
+    fer_slots_wide_max_slots: int = Field(default=300)
+    fer_record_dir: Optional[str] = Field(default=None)
+    fer_record_salt: SecretStr = Field(default=SecretStr(''))
+    fer_replay_dir: Optional[str] = Field(default=None)
+    fer_replay_strict: bool = Field(default=False)
+    fer_replay_latency: bool = Field(default=True)
     
     web_server_host: str = Field(default="127.0.0.1")
     web_server_port: int = Field(default=8000)
@@ -17,6 +45,26 @@ class Settings(BaseSettings):
     redis_url: str = Field(default="redis://localhost:6379/0")
     celery_broker_url: str = Field(default="redis://localhost:6379/0")
     celery_result_backend: str = Field(default="redis://localhost:6379/0")
+    redis_pool_size: int = Field(default=50)
+    redis_socket_timeout: float = Field(default=5.0)
+    redis_health_check_interval: int = Field(default=30)
+    redis_user_index_ttl: int = Field(default=24 * 3600)
+    redis_user_index_scan_fallback: bool = Field(default=False)  # SCAN, если остались ключи, записанные до индекса
+    redis_codec: str = Field(default='msgpack')  # 'msgpack' или 'json'
+    redis_compress_min_bytes: int = Field(default=1024)  # 0 - без сжатия
+    redis_l1_enabled: bool = Field(default=True)
+    redis_l1_max_entries: int = Field(default=1000)
+    redis_l1_ttl: int = Field(default=30)
+    redis_l1_channel: str = Field(default="cache:invalidate")
+    # 'api' (хранилище Алисы) или 'redis' (хеш сессии пользователя). Данные пациента в FSM
+    # живут fsm_ttl, а состояние, сохраненное Алисой, не переносится: 'redis' - только после миграции
+    fsm_storage: str = Field(default='api')
+    fsm_ttl: int = Field(default=3600)
+    fuzzy_shortlist_size: int = Field(default=100)  # кандидатов после отбора по триграммам
+    fuzzy_shortlist_min_ratio: int = Field(default=10)  # отбор по триграммам - для корпусов больше shortlist_size * ratio
+    org_index_cache_size: int = Field(default=64)  # индексов OrgSearcher в памяти процесса
+    mo_alias_artifact_path: Optional[str] = Field(default=None)  # по умолчанию mo_alias.bin рядом с mo_alias.xlsx
+    spec_lemmas_path: Optional[str] = Field(default=None)  # по умолчанию spec_list.lemmas.json рядом с spec_list.csv
     
     class Config:
         env_file = ".env"
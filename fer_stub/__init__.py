@@ -0,0 +1 @@
+"""Локальная заглушка FER для нагрузочного тестирования (см. fer_stub/server.py)."""
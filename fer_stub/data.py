@@ -0,0 +1,205 @@
+import random
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+
+LAST_NAMES = ['Иванов', 'Петров', 'Сидоров', 'Смирнов', 'Кузнецов', 'Попов', 'Васильев', 'Соколов', 'Михайлов', 'Новиков']
+FIRST_NAMES = ['Иван', 'Петр', 'Алексей', 'Сергей', 'Андрей', 'Дмитрий', 'Николай', 'Михаил', 'Павел', 'Егор']
+MIDDLE_NAMES = ['Иванович', 'Петрович', 'Алексеевич', 'Сергеевич', 'Андреевич', 'Дмитриевич', 'Николаевич']
+STREETS = ['Ленина', 'Республики', 'Мельникайте', 'Широтная', 'Малыгина', 'Холодильная', 'Пермякова']
+
+SLOT_MINUTES = 15
+DAY_START = time(8, 0)
+
+
+@dataclass(slots=True)
+class StubPatient:
+    patient_id: str
+    last_name: str
+    first_name: str
+    middle_name: str
+    birth_date: str  # ГГГГ-ММ-ДД
+    gender: str
+    snils: str
+    phone: str
+
+
+@dataclass(slots=True)
+class StubMO:
+    id: str
+    oid: str
+    name: str
+    address: str
+    phone: str
+
+
+@dataclass(slots=True)
+class StubMedic:
+    snils: str
+    last_name: str
+    first_name: str
+    middle_name: str
+    room: str
+    no_schedule_reason: Optional[str] = None
+
+
+def _name_key(last_name: str, first_name: str, middle_name: str, birth_date: str) -> Tuple[str, str, str, str]:
+    return (
+        (last_name or '').strip().lower(),
+        (first_name or '').strip().lower(),
+        (middle_name or '').strip().lower(),
+        (birth_date or '')[:10],
+    )
+
+
+class FERDataset:
+    """
+    Синтетические данные заглушки FER.
+
+    Пациенты, МО и врачи создаются при старте, слоты расписания вычисляются
+    детерминированно по СНИЛС врача и дате, поэтому объем расписания
+    не ограничен памятью. Один и тот же seed дает одинаковые данные.
+    """
+
+    def __init__(
+        self,
+        patients: int = 1000,
+        mos: int = 20,
+        medics_per_mo: int = 30,
+        slots_per_day: int = 24,
+        slot_fill: float = 0.7,
+        day_off_rate: float = 0.3,
+        no_schedule_rate: float = 0.1,
+        seed: int = 42
+    ):
+        self.slots_per_day = slots_per_day
+        self.slot_fill = slot_fill
+        self.day_off_rate = day_off_rate
+        self.seed = seed
+        self.booked: Set[str] = set()
+
+        rng = random.Random(seed)
+
+        self.patients: List[StubPatient] = []
+        for i in range(patients):
+            birth_date = date(1940, 1, 1) + timedelta(days=rng.randrange(365 * 65))
+            self.patients.append(StubPatient(
+                patient_id=str(1000000 + i),
+                last_name=rng.choice(LAST_NAMES),
+                first_name=rng.choice(FIRST_NAMES),
+                middle_name=rng.choice(MIDDLE_NAMES),
+                birth_date=birth_date.isoformat(),
+                gender='M',
+                snils=f"{20000000000 + i}",
+                phone=f"79{i:09d}",
+            ))
+        self.patients_by_phone = {patient.phone: patient for patient in self.patients}
+        self.patients_by_snils = {patient.snils: patient for patient in self.patients}
+        self.patients_by_name = {
+            _name_key(p.last_name, p.first_name, p.middle_name, p.birth_date): p for p in self.patients
+        }
+
+        self.mos: List[StubMO] = []
+        self.medics: Dict[str, List[StubMedic]] = {}
+        self.medics_by_snils: Dict[str, StubMedic] = {}
+        for m in range(mos):
+            mo = StubMO(
+                id=str(100 + m),
+                oid=f"1.2.643.5.1.13.13.12.2.72.{9000 + m}",
+                name=f"ГБУЗ ТО \"Городская поликлиника №{m + 1}\"",
+                address=f"г. Тюмень, ул. {rng.choice(STREETS)}, д. {rng.randint(1, 150)}",
+                phone=f"+7 (3452) {rng.randint(200000, 699999)}",
+            )
+            self.mos.append(mo)
+            self.medics[mo.oid] = []
+            for k in range(medics_per_mo):
+                medic = StubMedic(
+                    snils=f"{30000000000 + m * 1000 + k}",
+                    last_name=rng.choice(LAST_NAMES),
+                    first_name=rng.choice(FIRST_NAMES),
+                    middle_name=rng.choice(MIDDLE_NAMES),
+                    room=f"Кабинет {rng.randint(100, 450)}",
+                    no_schedule_reason='1' if rng.random() < no_schedule_rate else None,
+                )
+                self.medics[mo.oid].append(medic)
+                self.medics_by_snils[medic.snils] = medic
+
+    def find_patient(self, fields: Dict[str, str], lenient: bool = False) -> Optional[StubPatient]:
+        """Поиск по СНИЛС или ФИО + дате рождения (GetPatientInfoRequest)."""
+        patient = None
+        if fields.get('SNILS'):
+            patient = self.patients_by_snils.get(fields['SNILS'])
+        if patient is None:
+            patient = self.patients_by_name.get(_name_key(
+                fields.get('Last_Name'), fields.get('First_Name'), fields.get('Middle_Name'), fields.get('Birth_Date')
+            ))
+        if patient is None and lenient:
+            # Неизвестный пациент "находится" со стабильным идентификатором
+            key = '|'.join(_name_key(
+                fields.get('Last_Name'), fields.get('First_Name'), fields.get('Middle_Name'), fields.get('Birth_Date')
+            ))
+            patient = StubPatient(
+                str(5000000 + random.Random(f"{self.seed}:{key}").randrange(1000000)),
+                fields.get('Last_Name', ''), fields.get('First_Name', ''), fields.get('Middle_Name', ''),
+                fields.get('Birth_Date', ''), fields.get('Sex', ''), fields.get('SNILS', ''), ''
+            )
+        return patient
+
+    def _working_day(self, snils: str, day: date) -> Optional[random.Random]:
+        rng = random.Random(f"{self.seed}:{snils}:{day.isoformat()}")
+        if day.weekday() == 6 or rng.random() < self.day_off_rate:
+            return None
+        return rng
+
+    def available_dates(self, medic: StubMedic, date_start: date, date_end: date) -> List[date]:
+        if medic.no_schedule_reason:
+            return []
+        return [day for day in _days(date_start, date_end) if self._working_day(medic.snils, day)]
+
+    def slots(
+        self,
+        snils: str,
+        date_start: date,
+        date_end: date,
+        time_start: time = time(0, 0),
+        time_end: time = time(23, 59, 59)
+    ) -> Iterator[Tuple[str, datetime, str]]:
+        """Свободные слоты врача: (Slot_Id, время визита, кабинет)."""
+        medic = self.medics_by_snils.get(snils)
+        if medic is None or medic.no_schedule_reason:
+            return
+
+        for day in _days(date_start, date_end):
+            rng = self._working_day(snils, day)
+            if rng is None:
+                continue
+            for i in range(self.slots_per_day):
+                free = rng.random() < self.slot_fill
+                visit = datetime.combine(day, DAY_START) + timedelta(minutes=SLOT_MINUTES * i)
+                if not free or not time_start <= visit.time() <= time_end:
+                    continue
+                slot_id = f"{snils}-{visit.strftime('%Y%m%d%H%M')}"
+                if slot_id in self.booked:
+                    continue
+                yield slot_id, visit, medic.room
+
+    def book(self, slot_id: str) -> str:
+        """Статус CreateAppointmentResponse для слота."""
+        if slot_id in self.booked:
+            return 'APPOINT_TIME_IS_BUSY'
+        try:
+            visit = datetime.strptime(slot_id.rsplit('-', 1)[1], '%Y%m%d%H%M')
+        except (IndexError, ValueError):
+            return 'APPOINT_TIME_IS_BUSY'
+        if visit < datetime.now():
+            return 'APPOINT_VISIT_TIME_HAS_PASSED'
+        self.booked.add(slot_id)
+        return 'SUCCESS'
+
+
+def _days(date_start: date, date_end: date) -> Iterator[date]:
+    day = date_start
+    while day <= date_end:
+        yield day
+        day += timedelta(days=1)
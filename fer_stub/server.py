@@ -0,0 +1,327 @@
+"""
+Локальная заглушка FER для нагрузочного тестирования.
+
+Реализует семь SOAP действий из clients/templates на синтетических данных,
+с настраиваемыми задержками и долей ошибок. Подключается через FER_URL:
+
+    python -m fer_stub.server --port 8765 --latency lognormal:0.3,0.5 --error-rate 0.02
+    FER_URL=http://127.0.0.1:8765/ python main.py
+
+Служебные эндпоинты:
+    GET /stats     - количество запросов и ошибок по действиям
+    GET /patients  - синтетические пациенты (для сценариев нагрузки)
+"""
+import argparse
+import asyncio
+import logging
+import math
+import random
+from collections import Counter
+from dataclasses import asdict
+from datetime import date, datetime, time
+from typing import Callable, Dict, Optional
+from xml.sax.saxutils import escape
+
+from aiohttp import web
+from lxml import etree
+
+from fer_stub.data import FERDataset
+
+
+logger = logging.getLogger(__name__)
+
+ENVELOPE = (
+    '<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/"><soap:Body>'
+    '{body}'
+    '</soap:Body></soap:Envelope>'
+)
+FAULT = '<soap:Fault><faultcode>soap:Server</faultcode><faultstring>{reason}</faultstring></soap:Fault>'
+NS = 'http://www.rt-eu.ru/med/er/v2_0'
+
+ACTIONS = (
+    'CreateAppointmentRequest',
+    'GetMOInfoExtendedRequest',
+    'GetMOResourceInfoRequest',
+    'GetPatientInfoBySnilsRequest',
+    'GetPatientInfoRequest',
+    'GetScheduleInfoRequest',
+    'IdentifyPatientByPhoneRequest',
+)
+
+
+class Latency:
+    """
+    Распределение задержки ответа, задается строкой:
+
+        fixed:0.2            - всегда 200 мс
+        uniform:0.05,0.5     - равномерно от 50 до 500 мс
+        lognormal:0.3,0.5    - логнормальное с медианой 300 мс и sigma 0.5
+    """
+
+    def __init__(self, spec: str = 'fixed:0'):
+        kind, _, params = spec.partition(':')
+        values = [float(value) for value in params.split(',') if value]
+        if kind == 'fixed' and len(values) == 1:
+            self._sample = lambda: values[0]
+        elif kind == 'uniform' and len(values) == 2:
+            self._sample = lambda: random.uniform(values[0], values[1])
+        elif kind == 'lognormal' and len(values) == 2:
+            mu = math.log(values[0]) if values[0] > 0 else 0.0
+            self._sample = lambda: random.lognormvariate(mu, values[1])
+        else:
+            raise ValueError(f"Некорректное распределение задержки: {spec}")
+        self.spec = spec
+
+    def sample(self) -> float:
+        return max(0.0, self._sample())
+
+
+def _per_action(values, parse: Callable[[str], object], default) -> Dict[str, object]:
+    """Разбор списка вида ['0.1', 'GetScheduleInfoRequest=0.3'] в {action: value}."""
+    result = {None: parse(default)}
+    for value in values or []:
+        action, sep, spec = value.partition('=')
+        if sep and action in ACTIONS:
+            result[action] = parse(spec)
+        elif sep:
+            raise ValueError(f"Неизвестное действие: {action}")
+        else:
+            result[None] = parse(value)
+    return result
+
+
+def _fields(root) -> Dict[str, str]:
+    """Значения листовых элементов запроса по локальному имени (первое совпадение)."""
+    fields = {}
+    for element in root.iter():
+        if not isinstance(element.tag, str) or len(element):
+            continue
+        name = etree.QName(element).localname
+        if name not in fields and element.text:
+            fields[name] = element.text.strip()
+    return fields
+
+
+def _date(value: Optional[str], default: date) -> date:
+    try:
+        return date.fromisoformat(value[:10])
+    except (TypeError, ValueError):
+        return default
+
+
+def _time(value: Optional[str], default: time) -> time:
+    try:
+        return time.fromisoformat(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _tag(name: str, value) -> str:
+    return f"<{name}>{escape(str(value))}</{name}>" if value is not None else ''
+
+
+class FERStub:
+    """Обработчик SOAP запросов заглушки."""
+
+    def __init__(
+        self,
+        dataset: FERDataset,
+        latency: Dict[Optional[str], Latency],
+        error_rate: Dict[Optional[str], float],
+        hang_rate: float = 0.0,
+        hang_seconds: float = 30.0,
+        lenient_patients: bool = True
+    ):
+        self.dataset = dataset
+        self.latency = latency
+        self.error_rate = error_rate
+        self.hang_rate = hang_rate
+        self.hang_seconds = hang_seconds
+        self.lenient_patients = lenient_patients
+        self.stats = Counter()
+        self.builders = {
+            'IdentifyPatientByPhoneRequest': self.identify_patient_by_phone,
+            'GetPatientInfoRequest': self.get_patient_info,
+            'GetPatientInfoBySnilsRequest': self.get_patient_info,
+            'GetMOInfoExtendedRequest': self.get_mo_info,
+            'GetMOResourceInfoRequest': self.get_mo_resource_info,
+            'GetScheduleInfoRequest': self.get_schedule_info,
+            'CreateAppointmentRequest': self.create_appointment,
+        }
+
+    async def handle(self, request: web.Request) -> web.Response:
+        try:
+            root = etree.fromstring(await request.read())
+        except etree.XMLSyntaxError:
+            return self._fault('Malformed request', status=400)
+
+        body = root.find('{http://schemas.xmlsoap.org/soap/envelope/}Body')
+        operation = etree.QName(body[0]).localname if body is not None and len(body) else None
+        action = request.headers.get('SOAPAction', '').strip('"') or operation
+        builder = self.builders.get(action)
+        if builder is None:
+            return self._fault(f'Unknown action {action}', status=400)
+
+        self.stats[f'{action}:requests'] += 1
+        await asyncio.sleep(self.latency.get(action, self.latency[None]).sample())
+
+        if self.hang_rate and random.random() < self.hang_rate:
+            self.stats[f'{action}:hangs'] += 1
+            await asyncio.sleep(self.hang_seconds)
+
+        if random.random() < self.error_rate.get(action, self.error_rate[None]):
+            self.stats[f'{action}:errors'] += 1
+            return self._fault('Injected error', status=500)
+
+        body = builder(_fields(root))
+        return web.Response(
+            body=ENVELOPE.format(body=body).encode('utf-8'),
+            content_type='text/xml',
+            charset='utf-8'
+        )
+
+    def _fault(self, reason: str, status: int) -> web.Response:
+        return web.Response(
+            body=ENVELOPE.format(body=FAULT.format(reason=escape(reason))).encode('utf-8'),
+            status=status,
+            content_type='text/xml',
+            charset='utf-8'
+        )
+
+    def identify_patient_by_phone(self, fields: Dict[str, str]) -> str:
+        patient = self.dataset.patients_by_phone.get(fields.get('Phone', '').lstrip('+'))
+        if patient is None:
+            return f'<IdentifyPatientByPhoneResponse xmlns="{NS}"/>'
+        return (
+            f'<IdentifyPatientByPhoneResponse xmlns="{NS}"><Patient_Data>'
+            f'{_tag("Patient_Id", patient.patient_id)}{_tag("Last_Name", patient.last_name)}'
+            f'{_tag("First_Name", patient.first_name)}{_tag("Middle_Name", patient.middle_name)}'
+            f'</Patient_Data></IdentifyPatientByPhoneResponse>'
+        )
+
+    def get_patient_info(self, fields: Dict[str, str]) -> str:
+        patient = self.dataset.find_patient(fields, lenient=self.lenient_patients)
+        patient_id = _tag('Patient_Id', patient.patient_id) if patient else ''
+        return f'<GetPatientInfoResponse xmlns="{NS}">{patient_id}</GetPatientInfoResponse>'
+
+    def get_mo_info(self, fields: Dict[str, str]) -> str:
+        mos = ''.join(
+            f'<MO>{_tag("MO_Id", mo.id)}{_tag("MO_OID", mo.oid)}{_tag("MO_Name", mo.name)}'
+            f'{_tag("MO_Address", mo.address)}{_tag("MO_Phone", mo.phone)}</MO>'
+            for mo in self.dataset.mos
+        )
+        return f'<GetMOInfoExtendedResponse xmlns="{NS}"><MO_List>{mos}</MO_List></GetMOInfoExtendedResponse>'
+
+    def get_mo_resource_info(self, fields: Dict[str, str]) -> str:
+        today = date.today()
+        date_start = _date(fields.get('Start_Date_Range'), today)
+        date_end = _date(fields.get('End_Date_Range'), date_start)
+
+        resources = []
+        for medic in self.dataset.medics.get(fields.get('MO_OID'), []):
+            dates = ''.join(
+                _tag('Available_Date', day.isoformat())
+                for day in self.dataset.available_dates(medic, date_start, date_end)
+            )
+            reason = (
+                f'<No_Schedule_Reason>{_tag("No_Schedule_Reason_Сode", medic.no_schedule_reason)}</No_Schedule_Reason>'
+                if medic.no_schedule_reason else ''
+            )
+            resources.append(
+                f'<Resource><Specialist>{_tag("SNILS", medic.snils)}{_tag("Last_Name", medic.last_name)}'
+                f'{_tag("First_Name", medic.first_name)}{_tag("Middle_Name", medic.middle_name)}</Specialist>'
+                f'<Available_Dates>{dates}</Available_Dates>{reason}</Resource>'
+            )
+        return (
+            f'<GetMOResourceInfoResponse xmlns="{NS}"><MO_Resource_List><MO_Available>'
+            f'{_tag("MO_OID", fields.get("MO_OID"))}<Resource_Available>{"".join(resources)}</Resource_Available>'
+            f'</MO_Available></MO_Resource_List></GetMOResourceInfoResponse>'
+        )
+
+    def get_schedule_info(self, fields: Dict[str, str]) -> str:
+        today = date.today()
+        date_start = _date(fields.get('Start_Date_Range'), today)
+        date_end = _date(fields.get('End_Date_Range'), date_start)
+        time_start = _time(fields.get('Start_Time_Range'), time(0, 0))
+        time_end = _time(fields.get('End_Time_Range'), time(23, 59, 59))
+
+        slots = ''.join(
+            f'<Slots>{_tag("Slot_Id", slot_id)}{_tag("VisitTime", visit.isoformat())}{_tag("Room", room)}</Slots>'
+            for slot_id, visit, room in self.dataset.slots(
+                fields.get('Specialist_SNILS'), date_start, date_end, time_start, time_end
+            )
+        )
+        return f'<GetScheduleInfoResponse xmlns="{NS}"><Schedule>{slots}</Schedule></GetScheduleInfoResponse>'
+
+    def create_appointment(self, fields: Dict[str, str]) -> str:
+        status = self.dataset.book(fields.get('Slot_Id', ''))
+        book_id = _tag('Book_Id_Mis', f"STUB-{datetime.now():%Y%m%d%H%M%S%f}") if status == 'SUCCESS' else ''
+        return (
+            f'<CreateAppointmentResponse xmlns="{NS}"><Status>{_tag("Status_Code", status)}</Status>'
+            f'{book_id}</CreateAppointmentResponse>'
+        )
+
+
+def create_app(stub: FERStub) -> web.Application:
+    async def stats(request: web.Request) -> web.Response:
+        return web.json_response(dict(stub.stats))
+
+    async def patients(request: web.Request) -> web.Response:
+        limit = int(request.query.get('limit', 100))
+        return web.json_response([asdict(patient) for patient in stub.dataset.patients[:limit]])
+
+    app = web.Application(client_max_size=10 * 1024 * 1024)
+    app.router.add_get('/stats', stats)
+    app.router.add_get('/patients', patients)
+    app.router.add_post('/{tail:.*}', stub.handle)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Локальная заглушка FER')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--patients', type=int, default=1000)
+    parser.add_argument('--mos', type=int, default=20, help='Количество МО в GetMOInfoExtended')
+    parser.add_argument('--medics-per-mo', type=int, default=30, help='Врачей в GetMOResourceInfo')
+    parser.add_argument('--slots-per-day', type=int, default=24, help='Слотов по 15 минут в рабочем дне')
+    parser.add_argument('--slot-fill', type=float, default=0.7, help='Доля свободных слотов')
+    parser.add_argument('--day-off-rate', type=float, default=0.3, help='Доля дней без приема')
+    parser.add_argument('--no-schedule-rate', type=float, default=0.1, help='Доля врачей без расписания')
+    parser.add_argument('--latency', action='append',
+                        help='Задержка: fixed:0.2 | uniform:0.05,0.5 | lognormal:0.3,0.5; '
+                             'для одного действия - GetScheduleInfoRequest=fixed:1')
+    parser.add_argument('--error-rate', action='append', help='Доля ответов 500: 0.05 или Action=0.2')
+    parser.add_argument('--hang-rate', type=float, default=0.0, help='Доля "зависших" запросов')
+    parser.add_argument('--hang-seconds', type=float, default=30.0)
+    parser.add_argument('--strict-patients', action='store_true',
+                        help='Находить только синтетических пациентов (по умолчанию находится любой)')
+    args = parser.parse_args()
+
+    dataset = FERDataset(
+        patients=args.patients,
+        mos=args.mos,
+        medics_per_mo=args.medics_per_mo,
+        slots_per_day=args.slots_per_day,
+        slot_fill=args.slot_fill,
+        day_off_rate=args.day_off_rate,
+        no_schedule_rate=args.no_schedule_rate,
+        seed=args.seed
+    )
+    stub = FERStub(
+        dataset,
+        latency=_per_action(args.latency, Latency, 'fixed:0'),
+        error_rate=_per_action(args.error_rate, float, '0'),
+        hang_rate=args.hang_rate,
+        hang_seconds=args.hang_seconds,
+        lenient_patients=not args.strict_patients
+    )
+
+    logging.basicConfig(level=logging.INFO)
+    random.seed(args.seed)
+    web.run_app(create_app(stub), host=args.host, port=args.port)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from aliceio.fsm.state import State
+from aliceio.fsm.storage.base import DEFAULT_DESTINY, BaseStorage, StateType, StorageKey
+from aliceio.fsm.strategy import FSMStrategy
+
+from config import config
+from services.user_session import FSM_PREFIX, UserSession, in_session_scope, user_session
+
+logger = logging.getLogger(__name__)
+
+# Обработчики открывают сессию по message.session.user_id - это id приложения
+# (устаревшее поле session.user_id запроса Алисы), и у авторизованного пользователя тоже.
+# FSM хранится по приложению, чтобы попасть в тот же хеш user:{id}:session
+FSM_STRATEGY = FSMStrategy.APPLICATION
+
+
+class RedisSessionStorage(BaseStorage):
+    """
+    FSM хранилище aliceio в хеше сессии пользователя user:{id}:session.
+
+    Вместо хранилища API Алисы (use_api_storage) состояние и данные FSM
+    лежат на сервере - в полях fsm:state и fsm:data того же хеша, что
+    и сессия обработчиков. Внутри session_scope() (SessionMiddleware)
+    хеш читается одним HGETALL на запрос, а изменения FSM уходят в Redis
+    вместе с полями сессии одной транзакцией при формировании ответа.
+    Поля FSM живут fsm_ttl секунд с последнего изменения, как и остальные
+    поля сессии со своим сроком жизни. user_session().clear() их не трогает.
+
+    Вне session_scope() (Celery, скрипты) каждая операция читает и пишет
+    Redis сразу.
+
+    Включается config.fsm_storage='redis'. По умолчанию FSM остается
+    в хранилище Алисы: new_session узнает вернувшегося пользователя по
+    фамилии и дате рождения в данных FSM, а здесь они живут fsm_ttl,
+    и состояние, сохраненное Алисой ранее, не читается.
+    """
+
+    def __init__(self, ttl: Optional[int] = None, prefix: str = FSM_PREFIX):
+        self.ttl = ttl or config.fsm_ttl
+        self.prefix = prefix
+
+    @staticmethod
+    def user_id(key: StorageKey) -> str:
+        # При FSM_STRATEGY - id приложения, тот же, что message.session.user_id в обработчиках
+        return key.application_id or key.user_id or key.session_id
+
+    def field(self, key: StorageKey, part: str) -> str:
+        if key.destiny == DEFAULT_DESTINY:
+            return f"{self.prefix}:{part}"
+        return f"{self.prefix}:{key.destiny}:{part}"
+
+    def _session(self, key: StorageKey) -> Tuple[UserSession, bool]:
+        """Сессия пользователя и признак того, что ее запишет session_scope()."""
+        if in_session_scope():
+            return user_session(self.user_id(key)), True
+        return UserSession(self.user_id(key)), False
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        session, scoped = self._session(key)
+        state = state.state if isinstance(state, State) else state
+        if state is None:
+            session.delete(self.field(key, "state"))
+        else:
+            session.set(self.field(key, "state"), state, self.ttl)
+        if not scoped:
+            await session.flush()
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        session, _ = self._session(key)
+        return await session.get(self.field(key, "state"))
+
+    async def set_data(self, key: StorageKey, data: Dict[str, Any]) -> None:
+        session, scoped = self._session(key)
+        if data:
+            session.set(self.field(key, "data"), dict(data), self.ttl)
+        else:
+            session.delete(self.field(key, "data"))
+        if not scoped:
+            await session.flush()
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        session, _ = self._session(key)
+        data = await session.get(self.field(key, "data"))
+        return dict(data) if isinstance(data, dict) else {}
+
+    async def close(self) -> None:
+        pass
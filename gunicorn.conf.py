@@ -12,6 +12,10 @@ worker_class = "aiohttp.GunicornWebWorker"
 # Добавляем путь к проекту в Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+# Индекс специализаций строится в master-процессе до fork:
+# воркеры получают его готовым и делят страницы памяти (copy-on-write)
+import services.profession_searcher  # noqa: E402,F401
+
 bind = "0.0.0.0:8000"
 
 # Логирование
@@ -7,14 +7,16 @@ from aliceio.types import Message, Response
 from fsm.states import PatientInfo
 from utils.declension_fio import declension
 from utils.date_parser import get_iso_date_from_entities
-from services.redis_service import redis_service
+from services.user_session import user_session
 from services.patient_service import patient_service
+from services.fer_cache import fer_cache
+from utils.fer_decoders import Slot
 from pytrovich.enums import Case
 from datetime import datetime, timedelta
 from utils.date_parser import get_time_from_entities
 from utils.orgsPrepare import prepareOrgsList
 from utils.dates_utils import format_date_russian
-from services.profession_searcher import ProfessionSearcher
+from services.profession_searcher import profession_searcher
 from services.org_searcher import OrgSearcher
 from services.fio_searcher import FioSearcher
 from celery_app.tasks.long_operations import process_create_appointment
@@ -27,7 +29,7 @@ class PatientAppointmentHandlers:
     async def handle_appointment(self, message: Message, state: FSMContext) -> Response:
         user_id = message.session.user_id
         patient_data = await state.get_data()
-        selected_slot = redis_service.hget(f"user:{user_id}:session", "selected_slot")
+        selected_slot = await user_session(user_id).get("selected_slot")
 
         if selected_slot is None:
             print('handle_appointment error: slot empty')
@@ -37,12 +39,9 @@ class PatientAppointmentHandlers:
                 tts="Произошла ошибка, - попробуйте сначала"
             )
 
-        time = selected_slot['time']
-        slot_id = selected_slot['slot_id']
-        room = selected_slot['room']
-        date = selected_slot['date']
-        
-        task = process_create_appointment.delay(patient_data, slot_id)
+        slot = Slot.from_dict(selected_slot)
+
+        task = process_create_appointment.delay(patient_data, slot.slot_id)
         await state.update_data(appointment_task_id=task.id)
 
         try:
@@ -70,9 +69,9 @@ class PatientAppointmentHandlers:
             state,
             user_id,
             result_data,
-            time,
-            room,
-            date
+            slot.time,
+            slot.room,
+            slot.date
         )
 
     async def handle_check_appointment_status(self, message: Message, state: FSMContext) -> Response:
@@ -88,7 +87,7 @@ class PatientAppointmentHandlers:
                 end_session=True
             )
 
-        selected_slot = redis_service.hget(f"user:{user_id}:session", "selected_slot")
+        selected_slot = await user_session(user_id).get("selected_slot")
         if selected_slot is None:
             await state.set_state(PatientInfo.zero)
             return Response(
@@ -117,13 +116,14 @@ class PatientAppointmentHandlers:
         await state.update_data(appointment_task_id=None)
         result_data = task_result.result
         task_result.forget()
+        slot = Slot.from_dict(selected_slot)
         return await self._build_appointment_response(
             state,
             user_id,
             result_data,
-            selected_slot['time'],
-            selected_slot['room'],
-            selected_slot['date']
+            slot.time,
+            slot.room,
+            slot.date
         )
 
     async def handle_waiting_status_prompt(self, message: Message, state: FSMContext) -> Response:
@@ -154,11 +154,17 @@ class PatientAppointmentHandlers:
 
         print(result, book_id)
 
+        if result in ("SUCCESS", "APPOINT_TIME_IS_BUSY"):
+            # Расписание врача изменилось - сбрасываем общий кэш слотов
+            specialist = await user_session(user_id).get("selected_specialist")
+            if specialist and specialist.get('snils'):
+                await fer_cache.ainvalidate_slots(specialist['snils'])
+
         if result == "SUCCESS":
-            specialist = redis_service.hget(f"user:{user_id}:session", "selected_specialist")
+            specialist = await user_session(user_id).get("selected_specialist")
             specialist_fio = specialist['fio']
             fio = declension(specialist_fio, Case.DATIVE)
-            selected_date = redis_service.hget(f"user:{user_id}:session", "selected_date")
+            selected_date = await user_session(user_id).get("selected_date")
             await state.update_data(
                 appointments={
                     selected_date: {
@@ -180,7 +186,7 @@ class PatientAppointmentHandlers:
 
         if result == "APPOINT_TIME_IS_BUSY":
             await state.set_state(PatientInfo.getting_medic)
-            medics = redis_service.hget(f"user:{user_id}:session", "available_specialists")
+            medics = await user_session(user_id).get("available_specialists")
             specialists = medics.keys()
             specialists = '\n'.join(specialists)
             return Response(
@@ -191,7 +197,7 @@ class PatientAppointmentHandlers:
 
         if result == "APPOINT_VISIT_TIME_HAS_PASSED":
             await state.set_state(PatientInfo.getting_medic)
-            medics = redis_service.hget(f"user:{user_id}:session", "available_specialists")
+            medics = await user_session(user_id).get("available_specialists")
             specialists = medics.keys()
             specialists = '\n'.join(specialists)
             return Response(
@@ -202,7 +208,7 @@ class PatientAppointmentHandlers:
 
         if result == "APPOINT_PATIENT_REGISTERED_OTHER_SPECIALIST":
             await state.set_state(PatientInfo.getting_medic)
-            medics = redis_service.hget(f"user:{user_id}:session", "available_specialists")
+            medics = await user_session(user_id).get("available_specialists")
             specialists = medics.keys()
             specialists = '\n'.join(specialists)
             return Response(
@@ -213,7 +219,7 @@ class PatientAppointmentHandlers:
 
         if result == "APPOINT_PATIENT_REGISTERED_SPECIALIST":
             await state.set_state(PatientInfo.zero)
-            redis_service.delete_by_pattern(f"user:{user_id}")
+            await user_session(user_id).clear()
             return Response(
                 text="Извините, запись невозможна. Пациент уже записан к этому специалисту.",
                 tts="Извините, запись невозможна. - Пациент уже записан к этому специалисту.",
@@ -222,7 +228,7 @@ class PatientAppointmentHandlers:
 
         if result == "APPOINT_TIME_AVAILABLE_PATIENT_OTHER_AGE":
             await state.set_state(PatientInfo.zero)
-            redis_service.delete_by_pattern(f"user:{user_id}")
+            await user_session(user_id).clear()
             return Response(
                 text="Извините, запись невозможна. Выбранное время доступно только для записи пациентов в другом возрасте",
                 tts="Извините, запись невозможна. Выбранное время доступно только для записи пациентов в другом возрасте",
@@ -231,7 +237,7 @@ class PatientAppointmentHandlers:
 
         if result == "VACCINATION_COMPLETED":
             await state.set_state(PatientInfo.zero)
-            redis_service.delete_by_pattern(f"user:{user_id}")
+            await user_session(user_id).clear()
             return Response(
                 text="Вакцинация уже выполнена гражданину",
                 tts="Вакцинация уже выполнена гражданину",
@@ -239,7 +245,7 @@ class PatientAppointmentHandlers:
             )
         if result == "VACCINATION_TIME_NOT_COME":
             await state.set_state(PatientInfo.zero)
-            redis_service.delete_by_pattern(f"user:{user_id}")
+            await user_session(user_id).clear()
             return Response(
                 text="Срок вакцинации не подошел",
                 tts="Срок вакцинации не подошел",
@@ -247,7 +253,7 @@ class PatientAppointmentHandlers:
             )
         if result == "VACCINATIONS_MEDICAL_RECUSAL":
             await state.set_state(PatientInfo.zero)
-            redis_service.delete_by_pattern(f"user:{user_id}")
+            await user_session(user_id).clear()
             return Response(
                 text="Медицинский отвод от прививок",
                 tts="Медицинский отвод от прививок",
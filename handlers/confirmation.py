@@ -4,7 +4,7 @@ from aliceio.types import Message, Response
 from utils.declension_fio import declension
 from fsm.states import PatientInfo
 from utils.dates_utils import format_dates_russian
-from services.redis_service import redis_service
+from services.user_session import user_session
 from handlers.appointment import PatientAppointmentHandlers
 from handlers.patient_introduction import PatientIntroductionHandlers
 from handlers.doctor_selection import DoctorSelectionHandler
@@ -57,7 +57,7 @@ class ConfirmationHandlers:
         elif next_step == 'ask_appointment_other':
             user_id = message.session.user_id
             await state.clear()
-            redis_service.delete_by_pattern(f"user:{user_id}")
+            await user_session(user_id).clear()
             await state.set_state(PatientInfo.getting_name)
             await state.update_data(next_step=None, previus_step=None)
             return Response(
@@ -100,7 +100,7 @@ class ConfirmationHandlers:
         # Записать вас?
         if previus_step == 'ask_appointment_you':
             user_id = message.session.user_id
-            redis_service.delete_by_pattern(f"user:{user_id}")
+            await user_session(user_id).clear()
             await state.set_state(PatientInfo.confirmation)
             await state.update_data(
                 next_step='ask_appointment_other',
@@ -4,14 +4,14 @@ from aliceio.types import Message, Response
 from fsm.states import PatientInfo
 from utils.declension_fio import declension
 from utils.date_parser import get_iso_date_from_entities
-from services.redis_service import redis_service
-from services.patient_service import patient_service
+from services.user_session import user_session
+from services.async_patient_service import async_patient_service
 from pytrovich.enums import Case
 from datetime import datetime, timedelta
 from utils.date_parser import get_time_from_entities
 from utils.orgsPrepare import prepareOrgsList
 from utils.dates_utils import format_dates_russian
-from services.profession_searcher import ProfessionSearcher
+from services.profession_searcher import profession_searcher
 from services.org_searcher import OrgSearcher
 from services.fio_searcher import FioSearcher
 
@@ -29,9 +29,7 @@ class DoctorSelectionHandler:
         )
 
     async def show_available_post(self, message: Message, state: FSMContext) -> Response:
-        searcher = ProfessionSearcher()
-        professions = searcher._load_professions()
-        professions = list(filter(lambda row: row['show_in_help'] == '1', professions))
+        professions = profession_searcher.help_professions
 
         examples_text = " \n  ".join([" - " + item['name'] for item in professions])
         examples_tts = " \n  ".join([" - " + item['name'] for item in professions])
@@ -47,8 +45,7 @@ class DoctorSelectionHandler:
     async def handle_given_post(self, message: Message, state: FSMContext) -> Response:
         user_id = message.session.user_id
         post_name = message.command
-        searcher = ProfessionSearcher()
-        result = searcher.search(post_name)
+        result = profession_searcher.search(post_name)
 
         if result is None:
             return Response(
@@ -59,7 +56,7 @@ class DoctorSelectionHandler:
         elif isinstance(result, dict):
             # Один результат
             post_id = result['id']
-            redis_service.hset(f"user:{user_id}:session", "post_id", post_id, 2000)
+            user_session(user_id).set("post_id", post_id, 2000)
             await state.set_state(PatientInfo.show_mo)
             await state.update_data(next_step='unknown')
             return await self.handle_show_mo(message, state)
@@ -88,8 +85,8 @@ class DoctorSelectionHandler:
         user_id = message.session.user_id
 
         await state.set_state(PatientInfo.getting_mo)
-        medic_orgs = redis_service.hget(f"user:{user_id}:session", "medic_orgs")
-        post_id = redis_service.hget(f"user:{user_id}:session", "post_id")
+        medic_orgs = await user_session(user_id).get("medic_orgs")
+        post_id = await user_session(user_id).get("post_id")
 
         if post_id is None:
             await state.set_state(PatientInfo.getting_post)
@@ -101,9 +98,9 @@ class DoctorSelectionHandler:
         if medic_orgs is None or post_id != 109:
             print(f"medic_orgs empty, or post_id wrong, load again. post_id: {post_id}")
             patient_data = await state.get_data()
-            medic_orgs = patient_service.get_mo(patient_data, post_id)
+            medic_orgs = await async_patient_service.get_mo(patient_data, post_id)
             if len(medic_orgs) > 0:
-                redis_service.hset(f"user:{user_id}:session", 'medic_orgs', medic_orgs, 900)
+                user_session(user_id).set('medic_orgs', medic_orgs, 900)
 
         if medic_orgs is None or len(medic_orgs) == 0:
             await state.set_state(PatientInfo.getting_post)
@@ -126,7 +123,8 @@ class DoctorSelectionHandler:
         user_answer = message.original_text.lower()
         patient_data = await state.get_data()
         entities = message.nlu.entities
-        medic_orgs = redis_service.hget(f"user:{user_id}:session", "medic_orgs")
+        medic_orgs = await user_session(user_id).get("medic_orgs")
+        post_id = await user_session(user_id).get("post_id")
         organizations_list, organizations_list_ttl = prepareOrgsList(medic_orgs)
 
         if organizations_list is None:
@@ -172,8 +170,8 @@ class DoctorSelectionHandler:
         if geo_entity:
             parts = [geo_entity.value.city, geo_entity.value.street, geo_entity.value.house_number]
             entity_input = ', '.join(part for part in parts if part is not None)
-            searcher = OrgSearcher(medic_orgs)
-            result = searcher.search(entity_input)
+            searcher = OrgSearcher(medic_orgs, post_id)
+            result = await searcher.asearch(entity_input)
             if isinstance(result, dict):
                 mo = result
             else:
@@ -183,8 +181,8 @@ class DoctorSelectionHandler:
                 )
 
         if mo is None:
-            searcher = OrgSearcher(medic_orgs)
-            result = searcher.search(user_answer)
+            searcher = OrgSearcher(medic_orgs, post_id)
+            result = await searcher.asearch(user_answer)
             if isinstance(result, dict):
                 mo = result
             else:
@@ -193,7 +191,6 @@ class DoctorSelectionHandler:
                     tts=f"Ответ не распознан\n - Выберите медицинскую организацию, - указав номер пункта из списка или ее адрес:\n\n{organizations_list_ttl}"
                 )
 
-        post_id = redis_service.hget(f"user:{user_id}:session", "post_id")
         if post_id is None:
             await state.set_state(PatientInfo.getting_post)
             return Response(
@@ -201,9 +198,9 @@ class DoctorSelectionHandler:
                 tts=f"Не выбрана должность врача. - Выберите должность"
             )
 
-        redis_service.hset(f"user:{user_id}:session", "selected_org", mo, 900)
+        user_session(user_id).set("selected_org", mo, 900)
         oid = mo['oid']
-        medics = patient_service.get_medics(patient_data, oid, post_id)
+        medics = await async_patient_service.get_medics(patient_data, oid, post_id)
 
         if medics is None or len(medics) == 0:
             await state.set_state(PatientInfo.show_mo)
@@ -212,7 +209,7 @@ class DoctorSelectionHandler:
                 tts=f"Слотов в данной организации нет, - выбрать другую организацию?"
             )
 
-        redis_service.hset(f"user:{user_id}:session", "available_specialists", medics, 900)
+        user_session(user_id).set("available_specialists", medics, 900)
 
         # Вывести список врачей
         specialists = medics.keys()
@@ -227,7 +224,7 @@ class DoctorSelectionHandler:
         user_id = message.session.user_id
         user_text = message.original_text.lower()
         entity = next((e for e in message.nlu.entities if e.type == 'YANDEX.FIO'), None)
-        specialists = redis_service.hget(f"user:{user_id}:session", "available_specialists")
+        specialists = await user_session(user_id).get("available_specialists")
 
         if entity is None:
             if len(specialists) == 1 and user_text == "да":
@@ -239,8 +236,8 @@ class DoctorSelectionHandler:
                         tts=f"Врач не распознан. - Повторите"
                     )
 
-                redis_service.hset(f"user:{user_id}:session", 'selected_specialist',
-                                   {'fio': specialist_fio, 'snils': specialist_snils}, 900)
+                user_session(user_id).set('selected_specialist',
+                                          {'fio': specialist_fio, 'snils': specialist_snils}, 900)
 
                 await state.set_state(PatientInfo.getting_expected_date)
                 return Response(
@@ -279,7 +276,7 @@ class DoctorSelectionHandler:
                 tts=f"Врач не распознан. - Повторите"
             )
 
-        redis_service.hset(f"user:{user_id}:session", 'selected_specialist', {'fio': specialist_fio, 'snils': specialist_snils}, 900)
+        user_session(user_id).set('selected_specialist', {'fio': specialist_fio, 'snils': specialist_snils}, 900)
 
         await state.set_state(PatientInfo.getting_expected_date)
         return Response(
@@ -1,7 +1,9 @@
 from aliceio import F, Router
+from aliceio.filters import ExceptionTypeFilter
 from aliceio.fsm.context import FSMContext
-from aliceio.types import Message, Response
+from aliceio.types import ErrorEvent, Message, Response
 
+from clients.fer_errors import FERServiceBusyError
 from fsm.states import PatientInfo
 
 router = Router()
@@ -13,6 +15,14 @@ class ErrorHandlers:
             tts = f"Ничего не понял, повторите"
             ) 
 
+    async def handle_service_busy(self, event: ErrorEvent) -> Response:
+        """FER перегружен: отвечаем сразу, состояние диалога не меняем"""
+        print(f"FER busy: {event.exception}")
+        return Response(
+            text = f"Сервис записи сейчас перегружен. Пожалуйста, повторите через минуту",
+            tts = f"Сервис записи сейчас перегружен. - Пожалуйста, повторите через минуту"
+            )
+
 # Регистрация обработчиков
 def setup_error_handlers(
     router: Router
@@ -22,3 +32,8 @@ def setup_error_handlers(
     router.message.register(
         handlers.handle_error
     )
+
+    router.errors.register(
+        handlers.handle_service_busy,
+        ExceptionTypeFilter(FERServiceBusyError)
+    )
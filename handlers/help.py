@@ -2,7 +2,7 @@ from aliceio import F, Router
 from aliceio.fsm.context import FSMContext
 from aliceio.types import Message, Response
 from fsm.states import PatientInfo
-from services.redis_service import redis_service
+from services.user_session import user_session
 from aliceio.fsm.state import State, StatesGroup
 from aliceio.filters import StateFilter
 from handlers.doctor_selection import DoctorSelectionHandler
@@ -48,7 +48,7 @@ class HelpHandlers:
         
         # Очищаем состояние
         await state.clear()
-        redis_service.delete_by_pattern(f"user:{user_id}")
+        await user_session(user_id).clear()
         await state.set_state(PatientInfo.getting_name)
         
         return Response(
@@ -7,8 +7,8 @@ from utils.date_parser import get_birth_date_from_entities
 from utils.dates_utils import format_date_russian
 from utils.gender_detector import detect_gender_by_name
 from datetime import datetime, date
-from services.redis_service import redis_service
-from services.patient_service import patient_service
+from services.user_session import user_session
+from services.async_patient_service import async_patient_service
 from validators.phone_number_validator import PhoneNumberValidator
 from validators.snils_number_validator import SnilsNumberValidator
 from pydantic import ValidationError
@@ -29,7 +29,7 @@ class PatientIntroductionHandlers:
                 patient_data.get('middle_name').capitalize() if patient_data.get('middle_name') else '')
             session_id = str(uuid.uuid4())
             patient_data['fer_session_id'] = session_id
-            patient_id = patient_service.find_patient(patient_data)
+            patient_id = await async_patient_service.find_patient(patient_data)
             if patient_id:
                 await state.set_state(PatientInfo.confirmation)
                 await state.update_data(
@@ -38,7 +38,7 @@ class PatientIntroductionHandlers:
                     fer_session_id=session_id
                 )
 
-                redis_service.hset(f"user:{user_id}:session", "patient_id", patient_id, 900)
+                user_session(user_id).set("patient_id", patient_id, 900)
                 result = process_get_mo.delay(user_id, patient_data, 109)
                 result.forget()
                 return Response(
@@ -47,7 +47,7 @@ class PatientIntroductionHandlers:
                 )
 
         await state.clear()
-        redis_service.delete_by_pattern(f"user:{user_id}")
+        await user_session(user_id).clear()
         await state.set_state(PatientInfo.getting_name)
         text = (
             "Здравствуйте. Я помогу вам записаться на прием к врачу в городе Тюмень и Тюменской области.\n"
@@ -166,7 +166,7 @@ class PatientIntroductionHandlers:
         patient_data['fer_session_id'] = session_id
         patient_data['birth_date'] = birth_date
         print(f"patient_data: {patient_data}")
-        patient_id = patient_service.find_patient_by_fio(patient_data)
+        patient_id = await async_patient_service.find_patient_by_fio(patient_data)
 
         if patient_id:
             await state.set_state(PatientInfo.confirmation)
@@ -175,7 +175,7 @@ class PatientIntroductionHandlers:
                 previus_step='ask_appointment_you',
                 fer_session_id=session_id
             )
-            redis_service.hset(f"user:{user_id}:session", "patient_id", patient_id, 900)
+            user_session(user_id).set("patient_id", patient_id, 900)
             result = process_get_mo.delay(user_id, patient_data, 109)
             result.forget()
             return Response(
@@ -217,7 +217,7 @@ class PatientIntroductionHandlers:
         patient_data['fer_session_id'] = session_id
         patient_data['phone'] = phone
         print(f"handle_given_phone: try find_patient_by_phone")
-        patient_id = patient_service.find_patient_by_phone(patient_data)
+        patient_id = await async_patient_service.find_patient_by_phone(patient_data)
         print(f"handle_given_phone: {patient_id}")
         if patient_id:
             await state.set_state(PatientInfo.confirmation)
@@ -226,7 +226,7 @@ class PatientIntroductionHandlers:
                 previus_step='ask_appointment_you',
                 fer_session_id=session_id
             )
-            redis_service.hset(f"user:{user_id}:session", "patient_id", patient_id, 900)
+            user_session(user_id).set("patient_id", patient_id, 900)
             result = process_get_mo.delay(user_id, patient_data, 109)
             result.forget()
             return Response(
@@ -271,7 +271,7 @@ class PatientIntroductionHandlers:
         patient_data['fer_session_id'] = session_id
         patient_data['snils'] = snils
         formatted_snils = f"{snils[:3]}-{snils[3:6]}-{snils[6:9]} {snils[9:]}"
-        patient_id = patient_service.find_patient_by_snils(patient_data)
+        patient_id = await async_patient_service.find_patient_by_snils(patient_data)
         if patient_id:
             await state.set_state(PatientInfo.confirmation)
             await state.update_data(
@@ -279,7 +279,7 @@ class PatientIntroductionHandlers:
                 previus_step='ask_appointment_you',
                 fer_session_id=session_id
             )
-            redis_service.hset(f"user:{user_id}:session", "patient_id", patient_id, 900)
+            user_session(user_id).set("patient_id", patient_id, 900)
             result = process_get_mo.delay(user_id, patient_data, 109)
             result.forget()
             return Response(
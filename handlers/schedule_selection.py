@@ -4,14 +4,14 @@ from aliceio.types import Message, Response
 from fsm.states import PatientInfo
 from utils.declension_fio import declension
 from utils.date_parser import get_iso_date_from_entities
-from services.redis_service import redis_service
-from services.patient_service import patient_service
+from services.user_session import user_session
+from services.async_patient_service import async_patient_service
 from pytrovich.enums import Case
 from datetime import datetime, timedelta
 from utils.date_parser import get_time_from_entities
 from utils.orgsPrepare import prepareOrgsList
 from utils.dates_utils import format_dates_russian, find_nearest_date, find_nearest_time, format_date_russian
-from services.profession_searcher import ProfessionSearcher
+from services.profession_searcher import profession_searcher
 from services.org_searcher import OrgSearcher
 from services.fio_searcher import FioSearcher
 from typing import Any, Dict, List, Optional, Tuple
@@ -65,14 +65,14 @@ class ScheduleSelectionHandler:
                     'а какие есть',
                 ]:
                     # Поиск ближайших
-                    post_id = redis_service.hget(f"user:{user_id}:session", "post_id")
+                    post_id = await user_session(user_id).get("post_id")
                     if post_id is None:
                         await state.set_state(PatientInfo.getting_post)
                         return Response(
                             text=f"Не выбрана должность врача. Выберите должность",
                             tts=f"Не выбрана должность врача. Выберите должность"
                         )
-                    specialist = redis_service.hget(f"user:{user_id}:session", "selected_specialist")
+                    specialist = await user_session(user_id).get("selected_specialist")
                     if specialist is None:
                         await state.set_state(PatientInfo.getting_post)
                         return Response(
@@ -81,14 +81,14 @@ class ScheduleSelectionHandler:
                         )
                     specialist_snils = specialist['snils']
                     expected_date = datetime.now()
-                    slots = patient_service.get_slots(patient_data, specialist_snils, post_id, expected_date)
+                    slots = await async_patient_service.get_slots(patient_data, specialist_snils, post_id, expected_date)
                     if slots is None or len(slots) == 0:
                         return Response(
                             text=f"Слотов на ближайшее время нет, попробуйте другую дату",
                             tts=f"Слотов на ближайшую неделю нет, попробуйте другую дату"
                         )
 
-                    redis_service.hset(f"user:{user_id}:session", "available_slots", slots, 900)
+                    user_session(user_id).set("available_slots", slots, 900)
                     return await self.answer_choose_date(message, state)
                 return Response(
                     text=f"Дата некорректна, выберите другую",
@@ -104,7 +104,7 @@ class ScheduleSelectionHandler:
                 tts=f"Дата некорректна, - выберите другую"
             )
 
-        specialist = redis_service.hget(f"user:{user_id}:session", "selected_specialist")
+        specialist = await user_session(user_id).get("selected_specialist")
         if specialist is None:
             await state.set_state(PatientInfo.getting_post)
             return Response(
@@ -113,7 +113,7 @@ class ScheduleSelectionHandler:
             )
         specialist_snils = specialist['snils']
 
-        post_id = redis_service.hget(f"user:{user_id}:session", "post_id")
+        post_id = await user_session(user_id).get("post_id")
         if post_id is None:
             await state.set_state(PatientInfo.getting_post)
             return Response(
@@ -125,23 +125,23 @@ class ScheduleSelectionHandler:
         expected_time = expected_date.strftime('%H:%M')
         expected_time = None if expected_time == "00:00" else expected_time
 
-        slots = patient_service.get_slots(patient_data, specialist_snils, post_id, expected_date)
+        slots = await async_patient_service.get_slots(patient_data, specialist_snils, post_id, expected_date)
         if slots is None or len(slots) == 0:
             return Response(
                 text=f"Слотов на этот период нет, выберите другую дату",
                 tts=f"Слотов на этот период нет, - выберите другую дату"
             )
 
-        redis_service.hset(f"user:{user_id}:session", "available_slots", slots, 900)
-        redis_service.hset(f"user:{user_id}:session", "expected_date", expected_date_str, 900)
-        redis_service.hset(f"user:{user_id}:session", "expected_time", expected_time, 900)
+        user_session(user_id).set("available_slots", slots, 900)
+        user_session(user_id).set("expected_date", expected_date_str, 900)
+        user_session(user_id).set("expected_time", expected_time, 900)
 
         dates = list(slots.keys())
 
         if expected_date_str in dates:
             times_slots = slots[expected_date_str]
             times = list(times_slots.keys())
-            redis_service.hset(f"user:{user_id}:session", "selected_date", expected_date_str, 900)
+            user_session(user_id).set("selected_date", expected_date_str, 900)
 
             if expected_time and expected_time in times:
                 return await self.answer_guessed_all(message, state, expected_date_str, expected_time)
@@ -158,7 +158,7 @@ class ScheduleSelectionHandler:
         else:
             nearest_date = find_nearest_date(dates, expected_date)
             if nearest_date:
-                redis_service.hset(f"user:{user_id}:session", "nearest_date", nearest_date.date().strftime('%d.%m.%Y'), 900)
+                user_session(user_id).set("nearest_date", nearest_date.date().strftime('%d.%m.%Y'), 900)
                 return await self.answer_suggest_another_date(message, state, expected_date_str, nearest_date.strftime('%d.%m.%Y'), expected_time)
 
         return Response(
@@ -205,8 +205,8 @@ class ScheduleSelectionHandler:
                 tts=f"Не удалось распознать время, - повторите"
             )
 
-        slots = redis_service.hget(f"user:{user_id}:session", "available_slots")
-        selected_date_str = redis_service.hget(f"user:{user_id}:session", "selected_date")
+        slots = await user_session(user_id).get("available_slots")
+        selected_date_str = await user_session(user_id).get("selected_date")
 
         print(f"selected_date_str: {selected_date_str}")
 
@@ -229,10 +229,10 @@ class ScheduleSelectionHandler:
                                  selected_time: str) -> Response:
         print('answer_guessed_all')
         user_id = message.session.user_id
-        redis_service.hset(f"user:{user_id}:session", "selected_date", selected_date, 900)
-        redis_service.hset(f"user:{user_id}:session", "selected_time", selected_time, 900)
+        user_session(user_id).set("selected_date", selected_date, 900)
+        user_session(user_id).set("selected_time", selected_time, 900)
 
-        specialist = redis_service.hget(f"user:{user_id}:session", "selected_specialist")
+        specialist = await user_session(user_id).get("selected_specialist")
         if specialist is None:
             await state.set_state(PatientInfo.getting_post)
             return Response(
@@ -240,11 +240,11 @@ class ScheduleSelectionHandler:
                 tts=f"Не выбран врач. - Выберите должность"
             )
 
-        slots = redis_service.hget(f"user:{user_id}:session", "available_slots")
+        slots = await user_session(user_id).get("available_slots")
         times_slots = slots[selected_date]
         selected_slot = times_slots[selected_time]
 
-        redis_service.hset(f"user:{user_id}:session", "selected_slot", selected_slot, 500)
+        user_session(user_id).set("selected_slot", selected_slot, 500)
         await state.set_state(PatientInfo.confirmation)
         await state.update_data(
             next_step='PatientInfo.appointment',
@@ -262,15 +262,15 @@ class ScheduleSelectionHandler:
                                   selected_time: str) -> Response:
         print('answer_nearest_time')
         user_id = message.session.user_id
-        redis_service.hset(f"user:{user_id}:session", "selected_date", selected_date, 900)
-        redis_service.hset(f"user:{user_id}:session", "selected_time", selected_time, 900)
+        user_session(user_id).set("selected_date", selected_date, 900)
+        user_session(user_id).set("selected_time", selected_time, 900)
         await state.set_state(PatientInfo.confirmation)
         await state.update_data(
             next_step='PatientInfo.appointment',
             previus_step='ask_expected_time',
         )
 
-        specialist = redis_service.hget(f"user:{user_id}:session", "selected_specialist")
+        specialist = await user_session(user_id).get("selected_specialist")
         if specialist is None:
             await state.set_state(PatientInfo.getting_post)
             return Response(
@@ -278,10 +278,10 @@ class ScheduleSelectionHandler:
                 tts=f"Не выбран врач. - Выберите должность"
             )
 
-        slots = redis_service.hget(f"user:{user_id}:session", "available_slots")
+        slots = await user_session(user_id).get("available_slots")
         times_slots = slots[selected_date]
         selected_slot = times_slots[selected_time]
-        redis_service.hset(f"user:{user_id}:session", "selected_slot", selected_slot, 500)
+        user_session(user_id).set("selected_slot", selected_slot, 500)
 
         specialist_fio = specialist['fio']
         fio = declension(specialist_fio, Case.DATIVE)
@@ -296,11 +296,11 @@ class ScheduleSelectionHandler:
         await state.set_state(PatientInfo.confirmation)
 
         if expected_time:
-            slots = redis_service.hget(f"user:{user_id}:session", "available_slots")
+            slots = await user_session(user_id).get("available_slots")
             times_slots = slots[nearest_date]
             times = list(times_slots.keys())
 
-            redis_service.hset(f"user:{user_id}:session", "selected_date", nearest_date, 900)
+            user_session(user_id).set("selected_date", nearest_date, 900)
             selected_time = None
 
             if expected_time in times:
@@ -310,9 +310,9 @@ class ScheduleSelectionHandler:
 
             if selected_time:
                 await state.update_data(next_step='PatientInfo.appointment', previus_step='ask_expected_date')
-                redis_service.hset(f"user:{user_id}:session", "selected_time", selected_time, 900)
+                user_session(user_id).set("selected_time", selected_time, 900)
                 selected_slot = times_slots[selected_time]
-                redis_service.hset(f"user:{user_id}:session", "selected_slot", selected_slot, 500)
+                user_session(user_id).set("selected_slot", selected_slot, 500)
                 return Response(
                     text=f"Слота на {expected_date} нет, записать вас на {nearest_date} в {selected_time}?",
                     tts=f"Слота на {format_date_russian(expected_date)} нет, - записать вас на {format_date_russian(nearest_date)} - в {selected_time}?"
@@ -322,7 +322,7 @@ class ScheduleSelectionHandler:
 
         user_text = message.original_text.lower()
 
-        redis_service.hset(f"user:{user_id}:session", "selected_date", nearest_date, 900)
+        user_session(user_id).set("selected_date", nearest_date, 900)
         if any(phrase in user_text for phrase in
                ['на ближайшую', 'ближайшую', 'ближайшая', 'как можно быстрее', 'как можно скорее']):
             return Response(
@@ -344,7 +344,7 @@ class ScheduleSelectionHandler:
         # await state.set_state(PatientInfo.getting_date)
         await state.update_data(next_step=None, previus_step=None)
 
-        specialist = redis_service.hget(f"user:{user_id}:session", "selected_specialist")
+        specialist = await user_session(user_id).get("selected_specialist")
         if specialist is None:
             await state.set_state(PatientInfo.getting_post)
             return Response(
@@ -353,7 +353,7 @@ class ScheduleSelectionHandler:
             )
         specialist_fio = specialist['fio']
 
-        slots = redis_service.hget(f"user:{user_id}:session", "available_slots")
+        slots = await user_session(user_id).get("available_slots")
         dates = list(slots.keys())
         dates_ttl = format_dates_russian(dates)
         dates_list_ttl = ";\n - ".join(dates_ttl)
@@ -397,12 +397,12 @@ class ScheduleSelectionHandler:
     async def answer_choose_time(self, message: Message, state: FSMContext, additional_text: Optional[str] = None) -> Response:
         print('answer_choose_time')
         user_id = message.session.user_id
-        selected_date_str = redis_service.hget(f"user:{user_id}:session", "selected_date")
+        selected_date_str = await user_session(user_id).get("selected_date")
         print(f"selected_date_str: {selected_date_str}")
         await state.set_state(PatientInfo.getting_time)
         await state.update_data(next_step=None, previus_step=None)
 
-        slots = redis_service.hget(f"user:{user_id}:session", "available_slots")
+        slots = await user_session(user_id).get("available_slots")
         times_slots = slots[selected_date_str]
         times = list(times_slots.keys())
         times_list = ";\n".join(times)
@@ -422,7 +422,7 @@ class ScheduleSelectionHandler:
     async def ask_expected_time(self, message: Message, state: FSMContext) -> Response:
         print('ask_expected_time')
         user_id = message.session.user_id
-        selected_date_str = redis_service.hget(f"user:{user_id}:session", "selected_date")
+        selected_date_str = await user_session(user_id).get("selected_date")
         print(f"selected_date_str: {selected_date_str}")
         await state.set_state(PatientInfo.getting_expected_time)
 
@@ -450,7 +450,7 @@ class ScheduleSelectionHandler:
             )
 
         selected_date = selected_date.strftime('%d.%m.%Y')
-        slots = redis_service.hget(f"user:{user_id}:session", "available_slots")
+        slots = await user_session(user_id).get("available_slots")
 
         try:
             times_slots = slots[selected_date]
@@ -462,7 +462,7 @@ class ScheduleSelectionHandler:
                 tts=f"Ответ не распознан, - на какую дату вас записать?"
             )
 
-        redis_service.hset(f"user:{user_id}:session", "selected_date", selected_date, 900)
+        user_session(user_id).set("selected_date", selected_date, 900)
         return await self.answer_choose_time(message, state)
 
     async def handle_given_time(self, message: Message, state: FSMContext) -> Response:
@@ -478,10 +478,10 @@ class ScheduleSelectionHandler:
                 tts=f"Не удалось распознать время, - повторите"
             )
 
-        slots = redis_service.hget(f"user:{user_id}:session", "available_slots")
-        specialist = redis_service.hget(f"user:{user_id}:session", "selected_specialist")
+        slots = await user_session(user_id).get("available_slots")
+        specialist = await user_session(user_id).get("selected_specialist")
         specialist_fio = specialist['fio']
-        selected_date = redis_service.hget(f"user:{user_id}:session", "selected_date")
+        selected_date = await user_session(user_id).get("selected_date")
 
         try:
             if slots is None:
@@ -507,7 +507,7 @@ class ScheduleSelectionHandler:
                 tts=f"Не удалось распознать время, - повторите"
             )
 
-        redis_service.hset(f"user:{user_id}:session", "selected_slot", selected_slot, 500)
+        user_session(user_id).set("selected_slot", selected_slot, 500)
         selected_time = selected_slot['time']
 
         await state.set_state(PatientInfo.confirmation)
@@ -0,0 +1,275 @@
+from typing import Dict, Any, List, Optional
+from datetime import datetime
+import asyncio
+import time
+
+from clients.async_fer_client import async_fer_client
+from clients.fer_errors import FERServiceBusyError
+from services.patient_service import PatientService
+from services.fer_cache import fer_cache
+from services.patient_lookup import patient_lookup
+from services.slots_planner import slots_planner, slots_windows, window_request, first_window
+
+
+class AsyncPatientService(PatientService):
+    """
+    Асинхронная версия PatientService для aiohttp обработчиков.
+
+    Формирование запросов и разбор ответов общие с PatientService,
+    отличается только транспорт: запросы к FER выполняются через AsyncFERClient
+    и не блокируют цикл событий.
+    """
+
+    async def find_patient_by_phone(self, patient_data: Dict[str, Any]) -> Optional[str]:
+        action, request_data = self._find_patient_by_phone_request(patient_data)
+
+        start_time = time.time()
+        try:
+            response = await async_fer_client.send(action, request_data)
+            self._log_call('find_patient_by_phone', start_time, response, request_data)
+            return self._parse_patient_by_phone(response, patient_data)
+        except FERServiceBusyError:
+            raise
+        except Exception as e:
+            print(f"Ошибка FER: {e}")
+            return None
+
+    async def find_patient_by_fio(
+        self,
+        patient_data: Dict[str, Any]
+    ) -> Optional[str]:
+        action, request_data = self._find_patient_by_fio_request(patient_data)
+
+        start_time = time.time()
+        try:
+            response = await async_fer_client.send(action, request_data)
+            self._log_call('find_patient_by_fio', start_time, response, request_data)
+            return self._parse_patient_info(response)
+        except FERServiceBusyError:
+            raise
+        except Exception as e:
+            print(f"Ошибка FER: {e}")
+            return None
+
+    async def find_patient_by_snils(
+        self,
+        patient_data: Dict[str, Any]
+    ) -> Optional[str]:
+        action, request_data = self._find_patient_by_snils_request(patient_data)
+
+        start_time = time.time()
+        try:
+            response = await async_fer_client.send(action, request_data)
+            self._log_call('find_patient_by_snils', start_time, response, request_data)
+            return self._parse_patient_info(response)
+        except FERServiceBusyError:
+            raise
+        except Exception as e:
+            print(f"Ошибка FER: {e}")
+            return None
+
+    async def find_patient(
+        self,
+        patient_data: Dict[str, Any]
+    ) -> Optional[str]:
+        """
+        Поиск пациента по применимым стратегиям.
+
+        В режиме 'concurrent' стратегии запускаются одновременно: берется первое
+        найденное совпадение (при одновременном завершении - по приоритету),
+        остальные запросы отменяются. В режиме 'sequential' - по очереди.
+        """
+        strategies = patient_lookup.plan(patient_data)
+        try:
+            if not patient_lookup.concurrent or len(strategies) < 2:
+                for strategy in strategies:
+                    patient_id = await self._lookup(strategy, patient_data)
+                    if patient_id:
+                        return patient_id
+                return None
+
+            return await self._find_patient_concurrently(strategies, patient_data)
+        except FERServiceBusyError:
+            raise
+        except Exception as e:
+            print(f"Ошибка FER: {e}")
+            return None
+
+    async def _lookup(self, strategy: str, patient_data: Dict[str, Any]) -> Optional[str]:
+        start_time = time.monotonic()
+        try:
+            patient_id = await patient_lookup.method(self, strategy)(patient_data)
+        except FERServiceBusyError:
+            patient_lookup.stats.record(strategy, 'busy', time.monotonic() - start_time)
+            raise
+        except asyncio.CancelledError:
+            patient_lookup.stats.record(strategy, 'cancelled', time.monotonic() - start_time)
+            raise
+        patient_lookup.stats.record(strategy, 'hit' if patient_id else 'miss', time.monotonic() - start_time)
+        return patient_id
+
+    async def _find_patient_concurrently(self, strategies: List[str], patient_data: Dict[str, Any]) -> Optional[str]:
+        tasks = {
+            asyncio.create_task(self._lookup(strategy, patient_data)): priority
+            for priority, strategy in enumerate(strategies)
+        }
+        pending = set(tasks)
+        busy_error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=tasks.get):
+                    error = task.exception()
+                    if isinstance(error, FERServiceBusyError):
+                        busy_error = error
+                    elif error is not None:
+                        print(f"Ошибка FER: {error}")
+                    elif task.result():
+                        return task.result()
+
+            # Никто не нашел пациента; если FER был перегружен - сообщаем об этом
+            if busy_error is not None:
+                raise busy_error
+            return None
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def get_mo(
+        self,
+        patient_data: Dict[str, Any],
+        post_id: int
+    ) -> List[Dict[str, Any]]:
+        action, request_data = self._get_mo_request(patient_data, post_id)
+
+        async def load():
+            start_time = time.time()
+            response = await async_fer_client.send(action, request_data)
+            self._log_call('get_mo', start_time, response)
+            return self._parse_mo(response)
+
+        try:
+            return await fer_cache.afetch(action, request_data, load)
+        except FERServiceBusyError:
+            raise
+        except Exception as e:
+            print(f"Ошибка FER: {e}")
+            return []
+
+    async def get_medics(
+            self,
+            patient_data: Dict[str, Any],
+            oid: str,
+            post_id: int
+    ) -> Dict:
+        action, request_data = self._get_medics_request(patient_data, oid, post_id)
+
+        async def load():
+            start_time = time.time()
+            response = await async_fer_client.send(action, request_data)
+            self._log_call('get_medics', start_time, response)
+            return self._parse_medics(response)
+
+        try:
+            return await fer_cache.afetch(action, request_data, load)
+        except FERServiceBusyError:
+            raise
+        except Exception as e:
+            print(f"Ошибка FER: {e}")
+            return {}
+
+    async def _load_slots(self, action: str, request_data: Dict[str, Any]) -> Dict:
+        async def load():
+            start_time = time.time()
+            response = await async_fer_client.send(action, request_data)
+            self._log_call('get_slots', start_time, response)
+            return self._parse_slots(response)
+
+        return await fer_cache.afetch(action, request_data, load)
+
+    async def get_slots(
+            self,
+            patient_data: Dict[str, Any],
+            specialist_snils: str,
+            post_id: int,
+            expected_date: Optional[datetime] = None,
+            timedelta_days: Optional[int] = 14
+    ) -> Dict:
+        """
+        Слоты первого непустого окна из timedelta_days, +7, ... до fer_slots_max_days дней.
+
+        Стратегию запроса (одно широкое окно или одновременные отрезки) выбирает slots_planner.
+        """
+        if expected_date is None:
+            expected_date = datetime.now()
+
+        action, request_data = self._get_slots_request(
+            patient_data, specialist_snils, post_id, expected_date, timedelta_days
+        )
+        windows = slots_windows(timedelta_days)
+        date_start = datetime.strptime(request_data['date_start'], '%Y-%m-%d').date()
+
+        try:
+            if slots_planner.choose(specialist_snils) == slots_planner.WIDE:
+                slots = await self._load_slots(action, window_request(request_data, 0, windows[-1]))
+                slots_planner.observe(specialist_snils, slots, windows[-1] + 1)
+                return first_window(slots, date_start, windows)
+
+            return await self._get_slots_concurrently(action, request_data, specialist_snils, windows)
+        except FERServiceBusyError:
+            raise
+        except Exception as e:
+            print(f"Ошибка FER: {e}")
+            return {}
+
+    async def _get_slots_concurrently(
+            self,
+            action: str,
+            request_data: Dict[str, Any],
+            specialist_snils: str,
+            windows: List[int]
+    ) -> Dict:
+        segments = slots_planner.segments(windows)
+        tasks = [
+            asyncio.create_task(self._load_slots(action, window_request(request_data, first_day, last_day)))
+            for first_day, last_day in segments
+        ]
+        try:
+            slots = {}
+            observed_days = 0
+            # Отрезки разбираются по порядку: первый непустой и есть ответ
+            for task, (first_day, last_day) in zip(tasks, segments):
+                slots.update(await task)
+                observed_days = last_day + 1
+                if slots:
+                    break
+            slots_planner.observe(specialist_snils, slots, observed_days)
+            return slots
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()
+
+    async def appointment(
+            self,
+            patient_data: Dict[str, Any],
+            slot_id: str
+    ):
+        action, request_data = self._appointment_request(patient_data, slot_id)
+
+        start_time = time.time()
+        try:
+            response = await async_fer_client.send(action, request_data)
+            self._log_call('appointment', start_time, response)
+            return self._parse_appointment(response)
+        except FERServiceBusyError:
+            raise
+        except Exception as e:
+            print(f"Ошибка FER: {e}")
+            return None, None
+
+
+# Создаем глобальный экземпляр сервиса
+async_patient_service = AsyncPatientService()
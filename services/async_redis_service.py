@@ -0,0 +1,279 @@
+import asyncio
+import logging
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Mapping, Optional
+
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+from config import config
+from services.l1_cache import l1_cache
+from services.redis_service import (
+    RAW, count_hset_many, decode_hash, decode_value, encode_value, index_user_key, pre_index_user_keys,
+    user_keys_index,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncRedisService:
+    """
+    Асинхронный сервис для работы с Redis (redis.asyncio) для aiohttp обработчиков.
+
+    Семантика значений та же, что у RedisService: строки и числа пишутся как есть,
+    остальное - кодеком из redis_codec. Все обращения процесса идут через один пул соединений.
+    """
+
+    def __init__(self):
+        self.redis_url = config.redis_url
+        self._client: Optional[aioredis.Redis] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.stats = Counter()
+
+    @property
+    def client(self) -> aioredis.Redis:
+        """Ленивая инициализация клиента в текущем цикле событий."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            pool = aioredis.ConnectionPool.from_url(
+                self.redis_url,
+                decode_responses=True,
+                max_connections=config.redis_pool_size,
+                socket_timeout=config.redis_socket_timeout,
+                socket_connect_timeout=config.redis_socket_timeout,
+                socket_keepalive=True,
+                health_check_interval=config.redis_health_check_interval,
+                retry_on_timeout=True,
+            )
+            self._client = aioredis.Redis(connection_pool=pool)
+            self._loop = loop
+        return self._client
+
+    def pipeline(self, transaction: bool = True):
+        """
+        Конвейер команд за один round trip.
+
+        Пример:
+            async with async_redis_service.pipeline() as pipe:
+                pipe.hset(name, 'a', encode_value(a))
+                pipe.expire(name, 900)
+                await pipe.execute()
+        """
+        return self.client.pipeline(transaction=transaction)
+
+    async def transaction(
+        self,
+        func: Callable[[Any], Awaitable[Any]],
+        *watches: str,
+        value_from_callable: bool = True
+    ) -> Any:
+        """
+        Оптимистичная транзакция: WATCH ключей, func(pipe) и повтор при конфликте.
+
+        func получает pipeline в режиме немедленного выполнения; после вызова
+        pipe.multi() команды буферизуются и выполняются атомарно.
+        """
+        try:
+            return await self.client.transaction(func, *watches, value_from_callable=value_from_callable)
+        except RedisError as e:
+            logger.error(f"Ошибка транзакции Redis: {e}")
+            return None
+
+    async def set(self, key: str, value: Any, expire: Optional[int] = None) -> bool:
+        try:
+            result = await self.client.set(key, encode_value(value), ex=expire or None)
+            await self.invalidate_l1(key)
+            return result
+        except RedisError as e:
+            logger.error(f"Ошибка записи в Redis: {e}")
+            return False
+
+    async def get(self, key: str, default: Any = None, raise_errors: bool = False) -> Any:
+        """Значение по ключу или default (raise_errors - пробросить RedisError)."""
+        try:
+            found, value = l1_cache.get(key)
+            if not found:
+                value = await self.client.execute_command('GET', key, **RAW)
+                l1_cache.put(key, value)
+            if value is None:
+                return default
+            return decode_value(value)
+        except RedisError as e:
+            if raise_errors:
+                raise
+            logger.error(f"Ошибка чтения из Redis: {e}")
+            return default
+
+    async def delete(self, *keys) -> int:
+        try:
+            deleted = await self.client.delete(*keys)
+            await self.invalidate_l1(*keys)
+            return deleted
+        except RedisError as e:
+            logger.error(f"Ошибка удаления из Redis: {e}")
+            return 0
+
+    async def delete_by_pattern(self, pattern: str) -> int:
+        """Удаляет все ключи, соответствующие шаблону (например, "user:123:*")."""
+        try:
+            deleted = 0
+            batch = []
+            async for key in self.client.scan_iter(match=pattern, count=500):
+                batch.append(key)
+                if len(batch) >= 500:
+                    deleted += await self.client.delete(*batch)
+                    batch = []
+            if batch:
+                deleted += await self.client.delete(*batch)
+            await self.invalidate_l1(pattern)
+            return deleted
+        except RedisError as e:
+            logger.error(f"Ошибка удаления ключей по шаблону {pattern}: {e}")
+            return 0
+
+    async def invalidate_l1(self, *keys: str):
+        """Сбрасывает локальный кэш и рассылает инвалидацию (см. RedisService.invalidate_l1)."""
+        keys = l1_cache.tracked(keys)
+        if not keys:
+            return
+        l1_cache.invalidate(keys)
+        try:
+            await self.client.publish(l1_cache.channel, l1_cache.message(keys))
+        except RedisError as e:
+            logger.error(f"Ошибка публикации инвалидации кэша: {e}")
+
+    async def delete_user_keys(self, user_id: str) -> int:
+        """Удаляет ключи пользователя по индексу (см. RedisService.delete_user_keys)."""
+        index = user_keys_index(user_id)
+        try:
+            keys = await self.client.smembers(index)
+            if keys:
+                self.stats['user_keys_indexed'] += 1
+                return max(await self.client.delete(*keys, index) - 1, 0)
+        except RedisError as e:
+            logger.error(f"Ошибка удаления ключей пользователя {user_id}: {e}")
+            return 0
+        if not config.redis_user_index_scan_fallback:
+            return 0
+        try:
+            if not await self.client.exists(*pre_index_user_keys(user_id)):
+                return 0
+        except RedisError as e:
+            logger.error(f"Ошибка проверки ключей пользователя {user_id}: {e}")
+            return 0
+        self.stats['user_keys_scan'] += 1
+        return await self.delete_by_pattern(f"user:{user_id}:*")
+
+    async def exists(self, key: str) -> bool:
+        try:
+            return await self.client.exists(key) == 1
+        except RedisError as e:
+            logger.error(f"Ошибка проверки ключа в Redis: {e}")
+            return False
+
+    async def expire(self, key: str, time: int) -> bool:
+        try:
+            return await self.client.expire(key, time)
+        except RedisError as e:
+            logger.error(f"Ошибка установки TTL в Redis: {e}")
+            return False
+
+    async def hset(self, name: str, key: str, value: Any, expire: Optional[int] = None) -> bool:
+        """Устанавливает значение поля в хеше и продлевает TTL (см. hset_many)."""
+        return await self.hset_many(name, {key: value}, expire)
+
+    async def hset_many(
+        self,
+        name: str,
+        mapping: Mapping[str, Any],
+        expire: Optional[int] = None,
+        remove: Iterable[str] = ()
+    ) -> bool:
+        """Атомарно записывает поля хеша (и удаляет remove) и задает TTL за один round trip."""
+        remove = list(remove)
+        if not mapping and not remove:
+            return True
+        try:
+            async with self.client.pipeline(transaction=True) as pipe:
+                if remove:
+                    pipe.hdel(name, *remove)
+                if mapping:
+                    pipe.hset(name, mapping={field: encode_value(value) for field, value in mapping.items()})
+                if expire:
+                    pipe.expire(name, expire)
+                index_user_key(pipe, name)
+                await pipe.execute()
+            count_hset_many(self.stats, mapping, expire, remove)
+            return True
+        except RedisError as e:
+            logger.error(f"Ошибка записи в хеш Redis: {e}")
+            return False
+
+    async def hget(self, name: str, key: str, default: Any = None) -> Any:
+        try:
+            value = await self.client.execute_command('HGET', name, key, **RAW)
+            if value is None:
+                return default
+            return decode_value(value)
+        except RedisError as e:
+            logger.error(f"Ошибка чтения из хеша Redis: {e}")
+            return default
+
+    async def hmget(self, name: str, *keys: str, raise_errors: bool = False) -> Dict[str, Any]:
+        """Несколько полей хеша за один запрос; отсутствующие поля - None (raise_errors - пробросить RedisError)."""
+        try:
+            values = await self.client.execute_command('HMGET', name, *keys, **RAW)
+            return {key: decode_value(value) if value is not None else None for key, value in zip(keys, values)}
+        except RedisError as e:
+            if raise_errors:
+                raise
+            logger.error(f"Ошибка чтения из хеша Redis: {e}")
+            return dict.fromkeys(keys)
+
+    async def hgetall(self, name: str, decode: bool = True) -> Dict[str, Any]:
+        """Все поля хеша; decode=False - значения в виде байтов для отложенного decode_value."""
+        try:
+            return decode_hash(await self.client.execute_command('HGETALL', name, **RAW), decode)
+        except RedisError as e:
+            logger.error(f"Ошибка чтения хеша из Redis: {e}")
+            return {}
+
+    async def sadd(self, name: str, *values) -> int:
+        try:
+            return await self.client.sadd(name, *(encode_value(value) for value in values))
+        except RedisError as e:
+            logger.error(f"Ошибка добавления в множество Redis: {e}")
+            return 0
+
+    async def smembers(self, name: str) -> List[Any]:
+        try:
+            return [decode_value(member) for member in await self.client.execute_command('SMEMBERS', name, **RAW)]
+        except RedisError as e:
+            logger.error(f"Ошибка чтения множества из Redis: {e}")
+            return []
+
+    async def incr(self, key: str, amount: int = 1) -> Optional[int]:
+        try:
+            return await self.client.incrby(key, amount)
+        except RedisError as e:
+            logger.error(f"Ошибка увеличения значения в Redis: {e}")
+            return None
+
+    async def decr(self, key: str, amount: int = 1) -> Optional[int]:
+        try:
+            return await self.client.decrby(key, amount)
+        except RedisError as e:
+            logger.error(f"Ошибка уменьшения значения в Redis: {e}")
+            return None
+
+    async def close(self):
+        """Закрывает пул соединений."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._loop = None
+            logger.info("Соединение с Redis (asyncio) закрыто")
+
+
+# Создаем глобальный экземпляр сервиса
+async_redis_service = AsyncRedisService()
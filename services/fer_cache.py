@@ -0,0 +1,258 @@
+import asyncio
+import logging
+import time
+from collections import Counter
+from fnmatch import fnmatchcase
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from redis.exceptions import RedisError
+
+from clients.fer_coalescer import COALESCED_ACTIONS, coalesce_key
+from config import config
+from services.redis_service import redis_service
+from services.async_redis_service import async_redis_service
+from services.l1_cache import l1_cache
+
+
+logger = logging.getLogger(__name__)
+
+
+class CachePolicy(NamedTuple):
+    ttl: int        # Сколько секунд ответ считается свежим
+    stale_ttl: int  # Сколько секунд после этого можно отдавать устаревший ответ, обновляя его в фоне
+
+
+CACHE_POLICIES: Dict[str, CachePolicy] = {
+    'GetMOInfoExtendedRequest': CachePolicy(config.fer_cache_mo_ttl, config.fer_cache_mo_ttl),
+    'GetMOResourceInfoRequest': CachePolicy(config.fer_cache_medics_ttl, config.fer_cache_medics_ttl),
+    'GetScheduleInfoRequest': CachePolicy(config.fer_cache_slots_ttl, config.fer_cache_slots_ttl),
+}
+
+# Записи расписания сбрасываются по врачу (ainvalidate_slots), а ключ содержит
+# еще и даты, время и post_id - ключи записей врача хранятся в множестве fer:cache:slots:{snils}
+SLOTS_ACTION = 'GetScheduleInfoRequest'
+
+
+class FERResponseCache:
+    """
+    Общий для всех пользователей кэш разобранных ответов FER.
+
+    Ключ строится по логическому запросу (без Session_ID пользователя),
+    время жизни задается политикой действия (CACHE_POLICIES).
+    """
+
+    prefix = "fer:cache"
+
+    def __init__(self):
+        self.enabled = config.fer_cache_enabled
+        self.stats = Counter()
+        self._refresh_tasks = set()
+        # Списки МО и врачей меняются редко - держим их и в памяти воркера
+        l1_cache.register('fer_mo', f"{self.prefix}:GetMOInfoExtendedRequest:")
+        l1_cache.register('fer_medics', f"{self.prefix}:GetMOResourceInfoRequest:")
+
+    def _key(self, action: str, data: Dict[str, Any]) -> Optional[str]:
+        if not self.enabled or action not in CACHE_POLICIES:
+            return None
+        return f"{self.prefix}:{coalesce_key(action, data)}"
+
+    def _slots_index(self, action: str, data: Dict[str, Any]) -> Optional[str]:
+        """Множество ключей расписания врача или None для других действий."""
+        if action != SLOTS_ACTION or data.get('specialist_snils') is None:
+            return None
+        return f"{self.prefix}:slots:{data['specialist_snils']}"
+
+    def _pattern(self, action: str, params: Dict[str, Any]) -> str:
+        fields = COALESCED_ACTIONS[action]
+        return ':'.join([self.prefix, action, *(str(params.get(field, '*')) for field in fields)])
+
+    def _get(self, key: str) -> Optional[Tuple[Any, bool]]:
+        entry = redis_service.get(key)
+        if not isinstance(entry, dict) or 'value' not in entry:
+            return None
+        return entry['value'], entry['fresh_until'] > time.time()
+
+    def _set(self, action: str, key: str, value: Any, data: Dict[str, Any]):
+        # Пустые ответы не кэшируем: это может быть временный сбой FER
+        if not value:
+            return
+        policy = CACHE_POLICIES[action]
+        redis_service.set(
+            key,
+            {'value': value, 'fresh_until': time.time() + policy.ttl},
+            expire=policy.ttl + policy.stale_ttl
+        )
+        index = self._slots_index(action, data)
+        if index is not None:
+            try:
+                with redis_service.client.pipeline(transaction=False) as pipe:
+                    pipe.sadd(index, key)
+                    pipe.expire(index, policy.ttl + policy.stale_ttl)
+                    pipe.execute()
+            except RedisError as e:
+                logger.error(f"Ошибка записи индекса кэша FER {index}: {e}")
+
+    async def _aget(self, key: str) -> Optional[Tuple[Any, bool]]:
+        entry = await async_redis_service.get(key)
+        if not isinstance(entry, dict) or 'value' not in entry:
+            return None
+        return entry['value'], entry['fresh_until'] > time.time()
+
+    async def _aset(self, action: str, key: str, value: Any, data: Dict[str, Any]):
+        if not value:
+            return
+        policy = CACHE_POLICIES[action]
+        await async_redis_service.set(
+            key,
+            {'value': value, 'fresh_until': time.time() + policy.ttl},
+            expire=policy.ttl + policy.stale_ttl
+        )
+        index = self._slots_index(action, data)
+        if index is not None:
+            try:
+                async with async_redis_service.client.pipeline(transaction=False) as pipe:
+                    pipe.sadd(index, key)
+                    pipe.expire(index, policy.ttl + policy.stale_ttl)
+                    await pipe.execute()
+            except RedisError as e:
+                logger.error(f"Ошибка записи индекса кэша FER {index}: {e}")
+
+    async def _aclaim_refresh(self, key: str, action: str) -> bool:
+        """Только один воркер обновляет устаревшую запись."""
+        try:
+            return bool(await async_redis_service.client.set(
+                f"{key}:refresh", 1, nx=True, ex=max(CACHE_POLICIES[action].ttl, config.fer_timeout)
+            ))
+        except RedisError:
+            return False
+
+    def fetch(self, action: str, data: Dict[str, Any], loader: Callable[[], Any]) -> Any:
+        """
+        Чтение через кэш для синхронного кода.
+
+        Устаревшая запись обновляется сразу; если FER недоступен - отдается устаревшая.
+        """
+        key = self._key(action, data)
+        if key is None:
+            return loader()
+
+        entry = self._get(key)
+        if entry is not None and entry[1]:
+            self.stats['hit'] += 1
+            return entry[0]
+
+        try:
+            value = loader()
+        except Exception:
+            if entry is None:
+                raise
+            self.stats['stale_on_error'] += 1
+            return entry[0]
+
+        self.stats['miss' if entry is None else 'refresh'] += 1
+        self._set(action, key, value, data)
+        return value
+
+    async def afetch(self, action: str, data: Dict[str, Any], loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Чтение через кэш для асинхронного кода (stale-while-revalidate).
+
+        Устаревшая запись отдается сразу, а обновление запускается в фоне.
+        """
+        key = self._key(action, data)
+        if key is None:
+            return await loader()
+
+        entry = await self._aget(key)
+        if entry is not None:
+            value, fresh = entry
+            if fresh:
+                self.stats['hit'] += 1
+                return value
+
+            self.stats['stale'] += 1
+            if await self._aclaim_refresh(key, action):
+                task = asyncio.create_task(self._refresh(action, key, data, loader))
+                self._refresh_tasks.add(task)
+                task.add_done_callback(self._refresh_tasks.discard)
+            return value
+
+        self.stats['miss'] += 1
+        value = await loader()
+        await self._aset(action, key, value, data)
+        return value
+
+    async def _refresh(self, action: str, key: str, data: Dict[str, Any], loader: Callable[[], Awaitable[Any]]):
+        try:
+            value = await loader()
+            await self._aset(action, key, value, data)
+            self.stats['refresh'] += 1
+        except Exception as e:
+            logger.warning(f"Background refresh of {key} failed: {e}")
+        finally:
+            await async_redis_service.delete(f"{key}:refresh")
+
+    def invalidate(self, action: str, **params) -> int:
+        """
+        Удаляет записи кэша действия.
+
+        Args:
+            action: SOAP действие (например, 'GetScheduleInfoRequest')
+            params: Значения полей логического запроса; не указанные поля
+                    совпадают с любым значением
+
+        Returns:
+            int: Количество удаленных записей
+        """
+        fields = COALESCED_ACTIONS[action]
+        if all(field in params for field in fields):
+            return redis_service.delete(self._key(action, params)) if self.enabled else 0
+
+        pattern = self._pattern(action, params)
+        index = self._slots_index(action, params)
+        try:
+            if index is not None:
+                # Расписание врача - по его множеству ключей, без обхода всего keyspace
+                keys = self._matching(redis_service.client.smembers(index), pattern)
+                if keys:
+                    redis_service.client.srem(index, *keys)
+            else:
+                keys = list(redis_service.client.scan_iter(match=pattern, count=500))
+        except RedisError as e:
+            logger.error(f"Ошибка поиска ключей кэша FER {pattern}: {e}")
+            return 0
+        return redis_service.delete(*keys) if keys else 0
+
+    @staticmethod
+    def _matching(keys, pattern: str) -> List[str]:
+        return [key for key in keys if fnmatchcase(key, pattern)]
+
+    def invalidate_slots(self, specialist_snils: str) -> int:
+        """Сбрасывает кэш расписания врача (после записи или занятого слота)."""
+        return self.invalidate('GetScheduleInfoRequest', specialist_snils=specialist_snils)
+
+    async def ainvalidate(self, action: str, **params) -> int:
+        """Асинхронный вариант invalidate."""
+        fields = COALESCED_ACTIONS[action]
+        if all(field in params for field in fields):
+            return await async_redis_service.delete(self._key(action, params)) if self.enabled else 0
+
+        pattern = self._pattern(action, params)
+        index = self._slots_index(action, params)
+        if index is None:
+            return await async_redis_service.delete_by_pattern(pattern)
+        try:
+            keys = self._matching(await async_redis_service.client.smembers(index), pattern)
+            if keys:
+                await async_redis_service.client.srem(index, *keys)
+        except RedisError as e:
+            logger.error(f"Ошибка поиска ключей кэша FER {pattern}: {e}")
+            return 0
+        return await async_redis_service.delete(*keys) if keys else 0
+
+    async def ainvalidate_slots(self, specialist_snils: str) -> int:
+        return await self.ainvalidate('GetScheduleInfoRequest', specialist_snils=specialist_snils)
+
+
+# Создаем глобальный экземпляр сервиса
+fer_cache = FERResponseCache()
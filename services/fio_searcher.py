@@ -1,9 +1,10 @@
-from fuzzywuzzy import process, fuzz
 import re
 from typing import List, Dict, Optional, Union, Any
 import os
 from pathlib import Path
 
+from services.fuzzy_scorer import FuzzyIndex
+
 
 class FioSearcher:
     def __init__(self, fio_list):
@@ -40,19 +41,13 @@ class FioSearcher:
 
         results: List[Dict[str, Any]] = []
 
-        matches = process.extract(normalized_input, normalized_list,
-                                  scorer=fuzz.token_sort_ratio,
-                                  limit=3)
+        matches = FuzzyIndex(normalized_list).extract(normalized_input, limit=3, threshold=threshold)
         print(matches)
-        for match in matches:
-            matched_normalized, score = match
-            if score >= threshold:
-                # Находим индекс совпадения в оригинальном списке
-                index = normalized_list.index(matched_normalized)
-                results.append({
-                    'fio': self.fio_list[index],
-                    'score': score
-                })
+        for index, score in matches:
+            results.append({
+                'fio': self.fio_list[index],
+                'score': score
+            })
 
         return results
 
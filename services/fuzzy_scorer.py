@@ -0,0 +1,170 @@
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from rapidfuzz import fuzz, process, utils
+
+from config import config
+
+SCORERS: Dict[str, Callable] = {
+    'ratio': fuzz.ratio,
+    'partial_ratio': fuzz.partial_ratio,
+    'token_sort_ratio': fuzz.token_sort_ratio,
+    'token_set_ratio': fuzz.token_set_ratio,
+    'WRatio': fuzz.WRatio,
+}
+
+
+class FuzzyScorer:
+    """
+    Пакетная нечеткая оценка запроса по всему корпусу строк.
+
+    Вектор оценок по корпусу считается одним вызовом rapidfuzz.process.cdist
+    (в нативном коде) для каждого оценщика; несколько оценщиков смешиваются
+    с весами. Результаты - индексы в корпусе, без поиска строки обратно
+    по списку. Оценки округляются до целых, как у fuzzywuzzy
+    (0-100, при равенстве выше запись, стоящая в корпусе раньше).
+
+    Корпус можно подготовить заранее (prepare): предобработка строк
+    выполняется один раз, при запросе обрабатывается только сам запрос.
+    """
+
+    def __init__(self, weights: Optional[Dict[str, float]] = None, processor: Optional[Callable] = utils.default_process):
+        """
+        Args:
+            weights: Оценщики и их веса, например {'token_sort_ratio': 0.7, 'partial_ratio': 0.3}
+            processor: Предобработка строк (по умолчанию как у fuzzywuzzy: нижний регистр, без пунктуации)
+        """
+        weights = weights or {'token_sort_ratio': 1.0}
+        unknown = [name for name in weights if name not in SCORERS]
+        if unknown:
+            raise ValueError(f"Неизвестные оценщики: {unknown}")
+        total = sum(weights.values())
+        if total <= 0:
+            raise ValueError("Сумма весов оценщиков должна быть положительной")
+        self.weights = {name: weight / total for name, weight in weights.items() if weight}
+        self.processor = processor
+
+    def prepare(self, choices: Iterable[str]) -> List[str]:
+        """Предобработанный корпус для повторных запросов (prepared=True)."""
+        if self.processor is None:
+            return list(choices)
+        return [self.processor(choice) for choice in choices]
+
+    def scores(self, query: str, choices: Sequence[str], prepared: bool = False) -> np.ndarray:
+        """Вектор оценок запроса по каждой строке корпуса (0-100)."""
+        if not prepared:
+            choices = self.prepare(choices)
+        if not len(choices):
+            return np.zeros(0, dtype=np.float64)
+        if self.processor is not None:
+            query = self.processor(query)
+
+        result = np.zeros(len(choices), dtype=np.float64)
+        for name, weight in self.weights.items():
+            result += weight * process.cdist([query], choices, scorer=SCORERS[name], dtype=np.float64)[0]
+        return result
+
+    def extract(
+        self,
+        query: str,
+        choices: Sequence[str],
+        limit: Optional[int] = 5,
+        threshold: int = 0,
+        prepared: bool = False,
+    ) -> List[Tuple[int, int]]:
+        """
+        Лучшие совпадения запроса в корпусе.
+
+        Returns:
+            List[Tuple[int, int]]: (индекс в корпусе, оценка), по убыванию оценки
+        """
+        scores = np.rint(self.scores(query, choices, prepared)).astype(np.int32)
+        order = np.argsort(-scores, kind='stable')
+        if limit is not None:
+            order = order[:limit]
+        return [(int(index), int(scores[index])) for index in order if scores[index] >= threshold]
+
+
+def ngrams(text: str, n: int = 3) -> Set[str]:
+    """Символьные n-граммы слов текста (слова дополняются пробелами, порядок слов не важен)."""
+    result = set()
+    for word in text.split():
+        padded = f" {word} "
+        result.update(padded[i:i + n] for i in range(max(1, len(padded) - n + 1)))
+    return result
+
+
+class NgramIndex:
+    """
+    Инвертированный индекс символьных n-грамм корпуса.
+
+    Для запроса отбирает кандидатов с наибольшей долей общих n-грамм
+    (коэффициент Дайса), не перебирая весь корпус.
+    """
+
+    def __init__(self, texts: Sequence[str], n: int = 3):
+        self.n = n
+        self.size = len(texts)
+        postings: Dict[str, List[int]] = defaultdict(list)
+        sizes = np.zeros(self.size, dtype=np.float32)
+        for index, text in enumerate(texts):
+            grams = ngrams(text, n)
+            sizes[index] = len(grams)
+            for gram in grams:
+                postings[gram].append(index)
+        self.postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+        self.sizes = sizes
+
+    def shortlist(self, query: str, size: int) -> np.ndarray:
+        """Индексы не более size кандидатов, по возрастанию (порядок корпуса)."""
+        grams = ngrams(query, self.n)
+        found = [self.postings[gram] for gram in grams if gram in self.postings]
+        if not found:
+            return np.zeros(0, dtype=np.int32)
+        shared = np.bincount(np.concatenate(found), minlength=self.size)
+        candidates = np.flatnonzero(shared)
+        if len(candidates) > size:
+            similarity = shared[candidates] / (self.sizes[candidates] + len(grams))
+            candidates = np.sort(candidates[np.argpartition(-similarity, size - 1)[:size]])
+        return candidates
+
+
+class FuzzyIndex:
+    """
+    Подготовленный корпус для нечеткого поиска.
+
+    Корпуса, не превышающие shortlist_size в fuzzy_shortlist_min_ratio раз,
+    оцениваются целиком: на них отбор кандидатов не окупается. Для больших
+    индекс триграмм строится сразу в конструкторе (у глобальных поисковиков -
+    в master-процессе gunicorn до fork), и точная оценка считается только
+    для shortlist_size кандидатов с наибольшей долей общих триграмм: время
+    поиска почти не растет с размером справочника.
+    """
+
+    def __init__(self, texts: Sequence[str], scorer: Optional[FuzzyScorer] = None, shortlist_size: Optional[int] = None):
+        self.scorer = scorer or fuzzy_scorer
+        self.prepared = self.scorer.prepare(texts)
+        self.shortlist_size = shortlist_size or config.fuzzy_shortlist_size
+        self.ngrams: Optional[NgramIndex] = None
+        if len(self.prepared) > self.shortlist_size * config.fuzzy_shortlist_min_ratio:
+            self.ngrams = NgramIndex(self.prepared)
+
+    def __len__(self) -> int:
+        return len(self.prepared)
+
+    def extract(self, query: str, limit: Optional[int] = 5, threshold: int = 0) -> List[Tuple[int, int]]:
+        """
+        Returns:
+            List[Tuple[int, int]]: (индекс в корпусе, оценка), по убыванию оценки
+        """
+        if self.ngrams is None:
+            return self.scorer.extract(query, self.prepared, limit, threshold, prepared=True)
+        candidates = self.ngrams.shortlist(self.scorer.prepare([query])[0], self.shortlist_size)
+        choices = [self.prepared[index] for index in candidates]
+        matches = self.scorer.extract(query, choices, limit, threshold, prepared=True)
+        return [(int(candidates[index]), score) for index, score in matches]
+
+
+# Создаем глобальный экземпляр сервиса
+fuzzy_scorer = FuzzyScorer()
@@ -0,0 +1,190 @@
+import fnmatch
+import logging
+import os
+import re
+import socket
+import threading
+import time
+from collections import Counter, OrderedDict, defaultdict
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import redis
+from redis.exceptions import RedisError
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+GLOB_CHARS = re.compile(r'[*?\[]')
+
+
+def is_pattern(key: str) -> bool:
+    return GLOB_CHARS.search(key) is not None
+
+
+class L1Family(NamedTuple):
+    name: str
+    prefix: str
+    ttl: float
+
+
+class L1Cache:
+    """
+    Локальный (в памяти воркера) кэш перед Redis для редко меняющихся ключей.
+
+    Кэшируются только ключи зарегистрированных семейств (register), записи
+    ограничены по числу (LRU) и по времени жизни семейства. Хранятся
+    закодированные значения, как они лежат в Redis: каждое чтение
+    декодирует свою копию, и изменение результата вызывающим кодом
+    не портит кэш.
+
+    Запись и удаление ключа семейства публикуются в канал
+    redis_l1_channel; фоновый поток подписчика в каждом процессе
+    (gunicorn и Celery воркеры) сбрасывает у себя устаревшие записи.
+    """
+
+    def __init__(self):
+        self.enabled = config.redis_l1_enabled
+        self.max_entries = config.redis_l1_max_entries
+        self.channel = config.redis_l1_channel
+        self.families: Dict[str, L1Family] = {}
+        self.stats: Dict[str, Counter] = defaultdict(Counter)
+        self._entries: 'OrderedDict[str, Tuple[str, float, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._listener = None
+        self._listener_pid: Optional[int] = None
+
+    @property
+    def origin(self) -> str:
+        """Отправитель сообщений: свои же инвалидации процесс пропускает."""
+        return f"{socket.gethostname()}:{os.getpid()}"
+
+    def register(self, name: str, prefix: str, ttl: Optional[float] = None):
+        """Включает локальный кэш для ключей, начинающихся с prefix."""
+        self.families[name] = L1Family(name, prefix, ttl or config.redis_l1_ttl)
+
+    def family(self, key: str) -> Optional[L1Family]:
+        if not self.enabled:
+            return None
+        for family in self.families.values():
+            if key.startswith(family.prefix):
+                return family
+        return None
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Returns:
+            Tuple[bool, Any]: (найдено, закодированное значение)
+        """
+        family = self.family(key)
+        if family is None:
+            return False, None
+        self._ensure_listener()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.stats[family.name]['hit'] += 1
+                return True, entry[2]
+            if entry is not None:
+                del self._entries[key]
+                self.stats[family.name]['expired'] += 1
+            self.stats[family.name]['miss'] += 1
+        return False, None
+
+    def put(self, key: str, raw: Any):
+        family = self.family(key)
+        if family is None or raw is None:
+            return
+        with self._lock:
+            self._entries[key] = (family.name, time.monotonic() + family.ttl, raw)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                _, (evicted_family, _, _) = self._entries.popitem(last=False)
+                self.stats[evicted_family]['evicted'] += 1
+
+    def invalidate(self, keys: Iterable[str]) -> int:
+        """Сбрасывает записи по ключам или шаблонам (glob, как у SCAN MATCH)."""
+        dropped = 0
+        with self._lock:
+            for key in keys:
+                if is_pattern(key):
+                    matched = [cached for cached in self._entries if fnmatch.fnmatchcase(cached, key)]
+                else:
+                    matched = [key] if key in self._entries else []
+                for cached in matched:
+                    family_name = self._entries.pop(cached)[0]
+                    self.stats[family_name]['invalidated'] += 1
+                    dropped += 1
+        return dropped
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def tracked(self, keys: Iterable[str]) -> List[str]:
+        """Ключи и шаблоны, которые могут затрагивать кэшируемые семейства."""
+        if not self.enabled:
+            return []
+        result = []
+        for key in keys:
+            if is_pattern(key):
+                literal = GLOB_CHARS.split(key, 1)[0]
+                relevant = any(
+                    literal.startswith(family.prefix) or family.prefix.startswith(literal)
+                    for family in self.families.values()
+                )
+            else:
+                relevant = self.family(key) is not None
+            if relevant:
+                result.append(key)
+        return result
+
+    def message(self, keys: Iterable[str]) -> str:
+        return '\n'.join([self.origin, *keys])
+
+    def handle_message(self, data: str):
+        origin, *keys = data.split('\n')
+        if origin != self.origin:
+            self.invalidate(keys)
+
+    def _ensure_listener(self):
+        """Запускает подписчика на инвалидации (в каждом процессе после fork заново)."""
+        pid = os.getpid()
+        if self._listener_pid == pid:
+            return
+        with self._lock:
+            if self._listener_pid == pid:
+                return
+            self._listener_pid = pid
+            self._entries.clear()
+        try:
+            pubsub = self._pubsub()
+            pubsub.subscribe(**{self.channel: lambda message: self.handle_message(message['data'])})
+            self._listener = pubsub.run_in_thread(
+                sleep_time=1.0, daemon=True, exception_handler=self._listener_error
+            )
+        except RedisError as e:
+            # Без подписки записи живут только до своего TTL
+            logger.warning(f"L1 cache invalidation listener is not running: {e}")
+
+    def _pubsub(self):
+        client = redis.Redis.from_url(config.redis_url, decode_responses=True, health_check_interval=30)
+        return client.pubsub(ignore_subscribe_messages=True)
+
+    def _listener_error(self, error: BaseException, pubsub, thread):
+        # Пока подписки нет, инвалидации теряются: сбрасываем все
+        logger.warning(f"L1 cache invalidation listener error: {error}")
+        self.clear()
+        time.sleep(1.0)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        result = {}
+        for name, counter in self.stats.items():
+            lookups = counter['hit'] + counter['miss']
+            result[name] = {**counter, 'hit_rate': round(counter['hit'] / lookups, 3) if lookups else None}
+        return result
+
+
+# Создаем глобальный экземпляр сервиса
+l1_cache = L1Cache()
@@ -1,6 +1,6 @@
-import pandas as pd
+import asyncio
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Optional
 import os
 import sys
 
@@ -9,11 +9,26 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(current_dir)
 
 sys.path.insert(0, project_root)
-from services.redis_service import redis_service
+from services.redis_service import encode_value, redis_service
+from services.async_redis_service import async_redis_service
+from services.l1_cache import l1_cache
+from utils.mo_alias_artifact import MoAliasArtifact, compile_artifact
+from config import config
 
 
 class MoAliasService:
-    def __init__(self, excel_file_path: str = None):
+    """
+    Короткие названия МО по OID.
+
+    Таблица хранится в Redis хешем mo_alias:by_oid (поле - OID), рядом -
+    номер версии mo_alias:version, который увеличивается при каждой загрузке.
+    В процессе держится снимок уже запрошенных OID: пока версия не изменилась,
+    повторные запросы обслуживаются из памяти, недостающие OID дочитываются
+    одним HMGET. Версия читается через l1_cache и при загрузке таблицы
+    инвалидируется во всех процессах.
+    """
+
+    def __init__(self, excel_file_path: str = None, artifact_path: str = None):
         # Определяем путь к файлу относительно расположения этого скрипта
         if excel_file_path is None:
             self.excel_file_path = os.path.join(
@@ -22,82 +37,178 @@ class MoAliasService:
             )
         else:
             self.excel_file_path = excel_file_path
+        # Скомпилированная таблица по умолчанию лежит рядом с xlsx
+        self.artifact_path = artifact_path or config.mo_alias_artifact_path or os.path.join(
+            os.path.dirname(os.path.abspath(self.excel_file_path)), "mo_alias.bin"
+        )
 
         self.redis_key = "mo_alias"
+        self.hash_key = f"{self.redis_key}:by_oid"
+        self.version_key = f"{self.redis_key}:version"
+        l1_cache.register('mo_alias', self.redis_key, ttl=300)
+
+        self._snapshot: Dict[str, Optional[Dict[str, str]]] = {}
+        self._version: Optional[int] = None
 
-    def load_mo_alias_from_excel(self) -> Dict[str, Dict[str, str]]:
+    def load_mo_alias_from_artifact(self) -> Dict[str, Dict[str, str]]:
         """
-        Чтение mo_alias.xlsx и преобразование в словарь.
+        Чтение скомпилированной таблицы mo_alias.bin и сохранение в Redis.
+
+        Файл собирается из mo_alias.xlsx при сборке образа
+        (python -m utils.mo_alias_artifact). Если его нет или он собран
+        из другой версии xlsx, он перекомпилируется здесь же.
 
         Returns:
             Dict[str, Dict[str, str]]: Словарь с OID в качестве ключа
         """
         try:
-            # Проверяем существование файла
-            if not os.path.exists(self.excel_file_path):
-                logger.error(f"Файл {self.excel_file_path} не найден")
-                return {}
+            if not os.path.exists(self.artifact_path) or self._artifact_is_stale():
+                if not os.path.exists(self.excel_file_path):
+                    logger.error(f"Файлы {self.artifact_path} и {self.excel_file_path} не найдены")
+                    return {}
+                logger.warning(f"{self.artifact_path} отсутствует или устарел, компилируем из {self.excel_file_path}")
+                compile_artifact(self.excel_file_path, self.artifact_path)
+
+            artifact = MoAliasArtifact(self.artifact_path)
+            try:
+                mo_alias = artifact.to_dict()
+            finally:
+                artifact.close()
 
-            # Читаем Excel файл
-            df = pd.read_excel(self.excel_file_path)
+            # Сохраняем в Redis
+            self._store(mo_alias)
+            logger.info(f"Успешно загружено {len(mo_alias)} записей из {self.artifact_path}")
 
-            # Проверяем наличие необходимых колонок
-            required_columns = [
-                'OID',
-                'Короткое наименование (текст)',
-                'Короткое наименование (ttl)'
-            ]
+            return mo_alias
 
-            missing_columns = [col for col in required_columns if col not in df.columns]
-            if missing_columns:
-                raise ValueError(f"Отсутствуют необходимые колонки: {missing_columns}")
+        except Exception as e:
+            logger.error(f"Ошибка при чтении файла {self.artifact_path}: {e}")
+            raise
 
-            # Преобразуем в словарь
-            mo_alias = {}
-            for _, row in df.iterrows():
-                oid = str(row['OID']).strip()  # Приводим к строке и убираем пробелы
+    def _artifact_is_stale(self) -> bool:
+        try:
+            artifact = MoAliasArtifact(self.artifact_path)
+        except ValueError:
+            return True
+        try:
+            return artifact.is_stale(self.excel_file_path)
+        finally:
+            artifact.close()
+
+    def _store(self, mo_alias: Dict[str, Dict[str, str]]):
+        """Атомарно заменяет хеш псевдонимов и увеличивает номер версии."""
+        if not mo_alias:
+            return
+        tmp_key = f"{self.hash_key}:tmp"
+        with redis_service.client.pipeline(transaction=True) as pipe:
+            pipe.delete(tmp_key)
+            pipe.hset(tmp_key, mapping={oid: encode_value(alias) for oid, alias in mo_alias.items()})
+            pipe.rename(tmp_key, self.hash_key)
+            pipe.incr(self.version_key)
+            # Прежний формат: вся таблица одной JSON-строкой
+            pipe.delete(self.redis_key)
+            pipe.execute()
+        redis_service.invalidate_l1(self.version_key, self.redis_key)
+        self._snapshot = {}
+        self._version = None
+
+    def _check_version(self):
+        """
+        Сбрасывает снимок, если таблица в Redis перезагружена; загружает ее, если ее нет.
 
-                short_text = row['Короткое наименование (текст)']
-                short_ttl = row['Короткое наименование (ttl)']
+        Ошибка Redis пробрасывается вызывающему: при недоступном Redis
+        таблица не перезагружается из mo_alias.bin на каждый запрос.
+        """
+        version = redis_service.get(self.version_key, raise_errors=True)
+        if version is None:
+            logger.info("Данные в Redis не найдены, загружаем из mo_alias.bin")
+            self.load_mo_alias_from_artifact()
+            version = redis_service.get(self.version_key, raise_errors=True)
+        self._set_version(version)
+
+    async def _acheck_version(self):
+        """Асинхронный _check_version: загрузка mo_alias.bin выполняется в потоке."""
+        version = await async_redis_service.get(self.version_key, raise_errors=True)
+        if version is None:
+            logger.info("Данные в Redis не найдены, загружаем из mo_alias.bin")
+            await asyncio.to_thread(self.load_mo_alias_from_artifact)
+            version = await async_redis_service.get(self.version_key, raise_errors=True)
+        self._set_version(version)
+
+    def _set_version(self, version: Optional[int]):
+        if version != self._version:
+            self._snapshot = {}
+            self._version = version
+
+    def version(self) -> Optional[int]:
+        """Номер версии таблицы в Redis (меняется при каждой загрузке), None - Redis недоступен."""
+        try:
+            self._check_version()
+            return self._version
+        except Exception as e:
+            logger.error(f"Ошибка при получении версии mo_alias: {e}")
+            return None
 
-                short_text = None if pd.isna(short_text) else str(short_text)
-                short_ttl = None if pd.isna(short_ttl) else str(short_ttl)
+    def get_many(self, oids: Iterable[str]) -> Dict[str, Optional[Dict[str, str]]]:
+        """
+        Информация о нескольких МО за один запрос к Redis (или без него).
 
-                mo_alias[oid] = {
-                    'short_name_text': short_text,
-                    'short_name_ttl': short_ttl
-                }
+        Args:
+            oids: OID медицинских организаций
 
-            # Сохраняем в Redis
-            redis_service.set(self.redis_key, mo_alias)
-            logger.info(f"Успешно загружено {len(mo_alias)} записей из {self.excel_file_path}")
+        Returns:
+            Dict[str, Optional[Dict[str, str]]]: Информация по OID, None - OID нет в таблице
+        """
+        oids = [str(oid).strip() for oid in oids]
+        try:
+            self._check_version()
+            missing = list(dict.fromkeys(oid for oid in oids if oid not in self._snapshot))
+            if missing:
+                # Сбой HMGET пробрасывается: в снимок попадают только прочитанные значения
+                self._snapshot.update(redis_service.hmget(self.hash_key, *missing, raise_errors=True))
+            return {oid: self._snapshot.get(oid) for oid in oids}
+        except Exception as e:
+            logger.error(f"Ошибка при получении mo_alias: {e}")
+            return dict.fromkeys(oids)
 
-            return mo_alias
+    async def aversion(self) -> Optional[int]:
+        """Асинхронный version() для обработчиков aiohttp."""
+        try:
+            await self._acheck_version()
+            return self._version
+        except Exception as e:
+            logger.error(f"Ошибка при получении версии mo_alias: {e}")
+            return None
 
-        except FileNotFoundError:
-            logger.error(f"Файл {self.excel_file_path} не найден")
-            raise
+    async def aget_many(self, oids: Iterable[str]) -> Dict[str, Optional[Dict[str, str]]]:
+        """Асинхронный get_many() для обработчиков aiohttp."""
+        oids = [str(oid).strip() for oid in oids]
+        try:
+            await self._acheck_version()
+            missing = list(dict.fromkeys(oid for oid in oids if oid not in self._snapshot))
+            if missing:
+                self._snapshot.update(await async_redis_service.hmget(self.hash_key, *missing, raise_errors=True))
+            return {oid: self._snapshot.get(oid) for oid in oids}
         except Exception as e:
-            logger.error(f"Ошибка при чтении файла {self.excel_file_path}: {e}")
-            raise
+            logger.error(f"Ошибка при получении mo_alias: {e}")
+            return dict.fromkeys(oids)
 
     def get_mo_alias(self) -> Dict[str, Dict[str, str]]:
         """
-        Получение mo_alias из Redis или из Excel файла.
+        Получение всей таблицы mo_alias из Redis или из mo_alias.bin.
 
         Returns:
             Dict[str, Dict[str, str]]: Словарь с данными mo_alias
         """
         try:
-            # Пытаемся получить из Redis
-            mo_alias = redis_service.get(self.redis_key)
+            mo_alias = redis_service.hgetall(self.hash_key)
 
-            if mo_alias is not None:
+            if mo_alias:
                 return mo_alias
 
-            # Если в Redis нет данных, загружаем из Excel
-            logger.info("Данные в Redis не найдены, загружаем из Excel файла")
-            return self.load_mo_alias_from_excel()
+            # Если в Redis нет данных, загружаем из скомпилированной таблицы
+            logger.info("Данные в Redis не найдены, загружаем из mo_alias.bin")
+            return self.load_mo_alias_from_artifact()
 
         except Exception as e:
             logger.error(f"Ошибка при получении mo_alias: {e}")
@@ -113,18 +224,17 @@ class MoAliasService:
         Returns:
             Optional[Dict[str, str]]: Информация о МО или None если не найдена
         """
-        mo_alias = self.get_mo_alias()
-        return mo_alias.get(str(oid).strip())
+        return self.get_many([oid]).get(str(oid).strip())
 
     def refresh_cache(self) -> Dict[str, Dict[str, str]]:
         """
-        Принудительное обновление кэша из Excel файла.
+        Принудительное обновление кэша из mo_alias.bin.
 
         Returns:
             Dict[str, Dict[str, str]]: Обновленные данные
         """
         logger.info("Принудительное обновление кэша mo_alias")
-        return self.load_mo_alias_from_excel()
+        return self.load_mo_alias_from_artifact()
 
 
 # Создаем глобальный экземпляр для удобства использования
@@ -152,12 +262,18 @@ if __name__ == "__main__":
             default="mo_alias.xlsx",
             help='Путь к Excel файлу с mo_alias'
         )
+        parser.add_argument(
+            '--artifact',
+            type=str,
+            default=None,
+            help='Путь к скомпилированному mo_alias.bin (по умолчанию рядом с Excel файлом)'
+        )
 
         args = parser.parse_args()
 
         try:
             # Создаем сервис с указанным путем к файлу
-            service = MoAliasService(args.file)
+            service = MoAliasService(args.file, args.artifact)
             result = service.refresh_cache()
             print(f"Успешно обработано {len(result)} записей")
             sys.exit(0)
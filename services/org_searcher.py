@@ -1,111 +1,172 @@
-from fuzzywuzzy import process, fuzz
+import hashlib
 import re
-from typing import List, Dict, Optional, Union, Any
+from typing import List, Dict, Optional, Tuple, Union, Any
 import os
 from pathlib import Path
+from config import config
 from services.mo_alias_service import mo_alias_service
-from collections import defaultdict
+from services.fuzzy_scorer import FuzzyIndex
+from collections import Counter, OrderedDict, defaultdict
 
 
-class OrgSearcher:
-    def __init__(self, medic_orgs):
-        self.medic_orgs = medic_orgs
+def _normalize_text(text: str) -> str:
+    """Нормализация текста для улучшения поиска"""
+    text = text.lower().strip()
+    text = text.replace('-', ' ')
+    text = re.sub(r'[^\w\s]', '', text)  # Удаляем пунктуацию
+    text = re.sub(r'\s+', ' ', text)  # Удаляем лишние пробелы
+    return text
 
-    @staticmethod
-    def _normalize_text(text: str) -> str:
-        """Нормализация текста для улучшения поиска"""
-        text = text.lower().strip()
-        text = text.replace('-', ' ')
-        text = re.sub(r'[^\w\s]', '', text)  # Удаляем пунктуацию
-        text = re.sub(r'\s+', ' ', text)  # Удаляем лишние пробелы
-        return text
 
-    def _find_fuzzy_matches(self, user_input: str, threshold: int = 50) -> List[Dict[str, Any]]:
-        """Нечеткий поиск совпадений"""
-        normalized_input = self._normalize_text(user_input)
-        org_names = [p['name'] for p in self.medic_orgs]
-        org_address = [p['address'] for p in self.medic_orgs]
+def _org_key(org: Dict[str, Any]) -> Tuple:
+    # Используем кортеж ключевых полей как идентификатор организации
+    return org.get('oid'), org.get('name'), org.get('address')
+
+
+def _oids(medic_orgs: List[Dict[str, Any]]) -> List[str]:
+    return [org['oid'] for org in medic_orgs if org.get('oid')]
+
+
+def org_list_hash(medic_orgs: List[Dict[str, Any]]) -> str:
+    """Хеш списка МО с учетом порядка - по полям, из которых строится индекс."""
+    payload = '\x1e'.join(f"{oid}\x1f{name}\x1f{address}" for oid, name, address in map(_org_key, medic_orgs))
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class OrgIndex:
+    """
+    Скомпилированный индекс поиска по списку МО: нормализованные короткие
+    названия (mo_alias), полные названия и адреса (FuzzyIndex) и словарь
+    ключ организации -> позиция первой такой организации в списке.
+
+    Хранит только позиции, поэтому один индекс обслуживает любой список
+    с тем же содержимым (org_index_cache). Короткие названия передаются
+    готовыми (mo_alias_service.get_many / aget_many): индекс не обращается к Redis.
+    """
+
+    def __init__(self, medic_orgs: List[Dict[str, Any]], aliases: Dict[str, Optional[Dict[str, str]]]):
+        org_names = [p['name'] for p in medic_orgs]
+        org_address = [p['address'] for p in medic_orgs]
 
         short_names = []
         short_names_indices = []
-        for i, org in enumerate(self.medic_orgs):
+        for i, org in enumerate(medic_orgs):
             oid = org.get('oid')
             if oid:
-                alias_object = mo_alias_service.get_mo_info_by_oid(oid)
+                alias_object = aliases.get(str(oid).strip())
                 if alias_object:
                     short_text = alias_object.get('short_name_text')
                     if short_text:
                         short_names.append(short_text)
                         short_names_indices.append(i)
 
-        normalized_names = [self._normalize_text(name) for name in org_names]
-        normalized_address = [self._normalize_text(address) for address in org_address]
-        normalized_short_names = [self._normalize_text(name) for name in short_names]
+        # Корпуса поиска: (индекс, исходные строки, позиции организаций)
+        all_indices = list(range(len(medic_orgs)))
+        self.corpora: List[Tuple[FuzzyIndex, List[str], List[int]]] = []
+        for originals, indices in ((short_names, short_names_indices), (org_names, all_indices), (org_address, all_indices)):
+            if originals:
+                self.corpora.append((FuzzyIndex([_normalize_text(text) for text in originals]), originals, indices))
+
+        # Оригинальная организация по ключу - первая с таким ключом в списке
+        self.positions_by_key: Dict[Tuple, int] = {}
+        for i, org in enumerate(medic_orgs):
+            self.positions_by_key.setdefault(_org_key(org), i)
+
+
+class OrgIndexCache:
+    """
+    Индексы OrgSearcher в памяти процесса, общие для всех пользователей.
+
+    Ключ - post_id, хеш содержимого списка МО и версия таблицы mo_alias:
+    индекс перестраивается, только когда меняется список организаций
+    или перезагружены короткие названия. Число индексов ограничено (LRU).
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max_entries or config.org_index_cache_size
+        self.stats = Counter()
+        self._entries: 'OrderedDict[Tuple, OrgIndex]' = OrderedDict()
+
+    def get(self, post_id: Any, medic_orgs: List[Dict[str, Any]]) -> OrgIndex:
+        key = self._key(post_id, medic_orgs, mo_alias_service.version())
+        index = self._lookup(key)
+        if index is None:
+            index = self._put(key, OrgIndex(medic_orgs, mo_alias_service.get_many(_oids(medic_orgs))))
+        return index
+
+    async def aget(self, post_id: Any, medic_orgs: List[Dict[str, Any]]) -> OrgIndex:
+        """Асинхронный get() для обработчиков aiohttp: mo_alias читается через async_redis_service."""
+        key = self._key(post_id, medic_orgs, await mo_alias_service.aversion())
+        index = self._lookup(key)
+        if index is None:
+            index = self._put(key, OrgIndex(medic_orgs, await mo_alias_service.aget_many(_oids(medic_orgs))))
+        return index
 
-        # Используем defaultdict для группировки результатов по организации
-        results_dict = defaultdict(lambda: {'score': 0, 'original_names': set()})
+    @staticmethod
+    def _key(post_id: Any, medic_orgs: List[Dict[str, Any]], version: Optional[int]) -> Tuple:
+        return None if post_id is None else str(post_id), org_list_hash(medic_orgs), version
 
-        # Поиск по коротким именам
-        if normalized_short_names:
-            short_matches = process.extract(normalized_input, normalized_short_names,
-                                            scorer=fuzz.token_sort_ratio,
-                                            limit=3)
-            for match in short_matches:
-                matched_normalized, score = match
-                if score >= threshold:
-                    # Находим индекс совпадения в списке коротких имен
-                    index_in_short = normalized_short_names.index(matched_normalized)
-                    # Получаем индекс оригинальной организации
-                    org_index = short_names_indices[index_in_short]
-                    org = self.medic_orgs[org_index]
-
-                    # Используем кортеж ключевых полей как идентификатор организации
-                    org_key = (org.get('oid'), org.get('name'), org.get('address'))
-                    results_dict[org_key]['score'] = max(results_dict[org_key]['score'], score)
-                    results_dict[org_key]['original_names'].add(short_names[index_in_short])
-
-        # Поиск по полным именам
-        matches = process.extract(normalized_input, normalized_names,
-                                  scorer=fuzz.token_sort_ratio,
-                                  limit=3)
-
-        for match in matches:
-            matched_normalized, score = match
-            if score >= threshold:
-                index = normalized_names.index(matched_normalized)
-                org = self.medic_orgs[index]
-
-                org_key = (org.get('oid'), org.get('name'), org.get('address'))
-                results_dict[org_key]['score'] = max(results_dict[org_key]['score'], score)
-                results_dict[org_key]['original_names'].add(org_names[index])
+    def _lookup(self, key: Tuple) -> Optional[OrgIndex]:
+        index = self._entries.get(key)
+        if index is not None:
+            self._entries.move_to_end(key)
+            self.stats['hit'] += 1
+        else:
+            self.stats['miss'] += 1
+        return index
 
-        # Поиск по адресам
-        matches = process.extract(normalized_input, normalized_address,
-                                  scorer=fuzz.token_sort_ratio,
-                                  limit=3)
+    def _put(self, key: Tuple, index: OrgIndex) -> OrgIndex:
+        self._entries[key] = index
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats['evicted'] += 1
+        return index
 
-        for match in matches:
-            matched_normalized, score = match
-            if score >= threshold:
-                index = normalized_address.index(matched_normalized)
-                org = self.medic_orgs[index]
+    def clear(self):
+        self._entries.clear()
 
-                org_key = (org.get('oid'), org.get('name'), org.get('address'))
+
+class OrgSearcher:
+    """
+    Поиск медицинской организации по фразе пользователя: по коротким
+    названиям (mo_alias), полным названиям и адресам.
+
+    Индекс берется из org_index_cache по post_id и содержимому списка МО;
+    из асинхронных обработчиков - через asearch(), без синхронных обращений к Redis.
+    """
+
+    def __init__(self, medic_orgs, post_id: Any = None):
+        self.medic_orgs = medic_orgs
+        self.post_id = post_id
+        self._index: Optional[OrgIndex] = None
+
+    _normalize_text = staticmethod(_normalize_text)
+
+    def _find_fuzzy_matches(self, user_input: str, threshold: int = 50) -> List[Dict[str, Any]]:
+        """Нечеткий поиск совпадений"""
+        normalized_input = self._normalize_text(user_input)
+        if self._index is None:
+            self._index = org_index_cache.get(self.post_id, self.medic_orgs)
+
+        # Используем defaultdict для группировки результатов по организации
+        results_dict = defaultdict(lambda: {'score': 0, 'original_names': set()})
+
+        # Поиск по коротким именам, полным именам и адресам
+        for index, originals, org_indices in self._index.corpora:
+            for position, score in index.extract(normalized_input, limit=3, threshold=threshold):
+                org_key = _org_key(self.medic_orgs[org_indices[position]])
                 results_dict[org_key]['score'] = max(results_dict[org_key]['score'], score)
-                results_dict[org_key]['original_names'].add(org_address[index])
+                results_dict[org_key]['original_names'].add(originals[position])
 
         # Преобразуем defaultdict в список результатов
-        results: List[Dict[str, Any]] = []
-        for org_key, data in results_dict.items():
-            # Находим оригинальную организацию по ключу
-            org = next((o for o in self.medic_orgs
-                        if (o.get('oid'), o.get('name'), o.get('address')) == org_key), None)
-            if org:
-                results.append({
-                    'org': org,
-                    'score': data['score'],
-                    'original_names': list(data['original_names'])
-                })
+        results: List[Dict[str, Any]] = [
+            {
+                'org': self.medic_orgs[self._index.positions_by_key[org_key]],
+                'score': data['score'],
+                'original_names': list(data['original_names'])
+            }
+            for org_key, data in results_dict.items()
+        ]
 
         # Сортируем результаты по score в убывающем порядке
         results.sort(key=lambda x: x['score'], reverse=True)
@@ -136,4 +197,14 @@ class OrgSearcher:
             # Иначе возвращаем список всех хороших совпадений
             return fuzzy_matches
 
-        return None
\ No newline at end of file
+        return None
+
+    async def asearch(self, user_input: str, threshold: int = 50) -> Union[Dict[str, str], List[Dict[str, Any]], None]:
+        """search() для асинхронных обработчиков: индекс берется через org_index_cache.aget."""
+        if self._index is None:
+            self._index = await org_index_cache.aget(self.post_id, self.medic_orgs)
+        return self.search(user_input, threshold)
+
+
+# Создаем глобальный экземпляр сервиса
+org_index_cache = OrgIndexCache()
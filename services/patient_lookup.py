@@ -0,0 +1,76 @@
+import logging
+from collections import Counter, defaultdict
+from typing import Any, Callable, Dict, List
+
+from config import config
+
+
+logger = logging.getLogger(__name__)
+
+# Стратегия -> (метод PatientService, условие применимости к данным пациента)
+# Поиск по СНИЛС передает и ФИО, поэтому поиск только по ФИО нужен, когда СНИЛС нет.
+# Как и прежний find_patient, условия проверяют наличие ключа, а не значение:
+# пустые snils/phone в данных FSM тоже отправляются в FER
+STRATEGIES: Dict[str, tuple] = {
+    'snils': ('find_patient_by_snils', lambda patient_data: 'snils' in patient_data),
+    'fio': ('find_patient_by_fio', lambda patient_data: 'snils' not in patient_data),
+    'phone': ('find_patient_by_phone', lambda patient_data: 'phone' in patient_data),
+}
+
+
+class PatientLookupStats:
+    """
+    Счетчики стратегий поиска пациента: попадания, промахи, ошибки,
+    отмененные запросы и суммарное время, для подбора порядка стратегий.
+    """
+
+    def __init__(self):
+        self.counters: Dict[str, Counter] = defaultdict(Counter)
+        self.latency: Dict[str, float] = defaultdict(float)
+
+    def record(self, strategy: str, outcome: str, latency: float):
+        """outcome: 'hit', 'miss', 'busy' или 'cancelled'."""
+        self.counters[strategy][outcome] += 1
+        if outcome != 'cancelled':
+            self.latency[strategy] += latency
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        result = {}
+        for strategy, counter in self.counters.items():
+            finished = counter['hit'] + counter['miss'] + counter['busy']
+            result[strategy] = {
+                **counter,
+                'hit_rate': round(counter['hit'] / finished, 3) if finished else None,
+                'avg_latency': round(self.latency[strategy] / finished, 3) if finished else None,
+            }
+        return result
+
+
+class PatientLookupPlanner:
+    """Порядок стратегий поиска пациента из настройки fer_find_patient_strategies."""
+
+    def __init__(self):
+        self.mode = config.fer_find_patient_mode
+        self.priorities = [
+            name.strip() for name in config.fer_find_patient_strategies.split(',') if name.strip()
+        ]
+        unknown = [name for name in self.priorities if name not in STRATEGIES]
+        if unknown:
+            raise ValueError(f"Unknown patient lookup strategies: {unknown}")
+        self.stats = PatientLookupStats()
+
+    @property
+    def concurrent(self) -> bool:
+        return self.mode == 'concurrent'
+
+    def plan(self, patient_data: Dict[str, Any]) -> List[str]:
+        """Применимые к данным пациента стратегии в порядке приоритета."""
+        return [name for name in self.priorities if STRATEGIES[name][1](patient_data)]
+
+    @staticmethod
+    def method(service, strategy: str) -> Callable:
+        return getattr(service, STRATEGIES[strategy][0])
+
+
+# Создаем глобальный экземпляр сервиса
+patient_lookup = PatientLookupPlanner()
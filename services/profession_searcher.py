@@ -1,21 +1,76 @@
-from fuzzywuzzy import process, fuzz
 import csv
+import logging
 import re
-from typing import List, Dict, Optional, Union, Any
+from typing import List, Dict, FrozenSet, Optional, Union, Any
 import os
 from pathlib import Path
 
+from config import config
+from services.fuzzy_scorer import FuzzyIndex
+from utils.spec_lemmas import SpecLemmaTable, compile_table, default_synonyms_path, default_table_path
+
+logger = logging.getLogger(__name__)
+
 
 class ProfessionSearcher:
-    def __init__(self, csv_filename: str = 'spec_list.csv'):
+    """
+    Поиск специализации по фразе пользователя.
+
+    Индекс строится один раз при создании: нормализованные названия,
+    множества их слов, корпус для нечеткого поиска (FuzzyIndex) и словари
+    по коду и названию. Разговорные названия и словоформы ("к лору",
+    "окулисту", "зубной") находятся по таблице лемм и синонимов
+    (utils/spec_lemmas.py) без нечеткого поиска. Глобальный экземпляр
+    profession_searcher создается при импорте модуля; gunicorn.conf.py
+    импортирует его в master-процессе, и воркеры получают готовый индекс после fork.
+    """
+
+    def __init__(self, csv_filename: str = 'spec_list.csv', lemmas_path: str = None):
         """
         Инициализация поисковика профессий
 
         Args:
             csv_filename: Путь к CSV файлу с профессиями (по умолчанию 'spec_list.csv')
+            lemmas_path: Путь к таблице лемм (по умолчанию spec_list.lemmas.json рядом с CSV)
         """
         self.csv_filename = self._resolve_csv_path(csv_filename)
+        self.lemmas_path = lemmas_path or config.spec_lemmas_path or default_table_path(self.csv_filename)
         self.professions: List[Dict[str, str]] = self._load_professions()
+        self._build_index()
+
+    def _build_index(self):
+        """Предварительная нормализация названий и словари для поиска по коду и названию"""
+        self.normalized_names: List[str] = [self._normalize_text(p['name']) for p in self.professions]
+        self.name_tokens: List[FrozenSet[str]] = [frozenset(name.split()) for name in self.normalized_names]
+        self._name_index = FuzzyIndex(self.normalized_names)
+        self.help_professions: List[Dict[str, str]] = [p for p in self.professions if p['show_in_help'] == '1']
+
+        # При повторах, как и при линейном поиске, побеждает первая запись
+        self._by_code: Dict[str, Dict[str, str]] = {}
+        self._by_name: Dict[str, Dict[str, str]] = {}
+        for index, profession in enumerate(self.professions):
+            self._by_code.setdefault(profession['code'], profession)
+            self._by_name.setdefault(profession['name'], profession)
+
+        self._lemma_table: Optional[SpecLemmaTable] = self._load_lemma_table()
+
+    def _load_lemma_table(self) -> Optional[SpecLemmaTable]:
+        """
+        Таблица лемм и синонимов. Собирается при сборке образа
+        (python -m utils.spec_lemmas); если ее нет или она собрана
+        из других CSV - собираем заново. Без таблицы работает нечеткий поиск.
+        """
+        synonyms_path = default_synonyms_path(self.csv_filename)
+        try:
+            table = SpecLemmaTable(self.lemmas_path) if os.path.exists(self.lemmas_path) else None
+            if table is None or table.is_stale(self.csv_filename, synonyms_path):
+                logger.warning(f"{self.lemmas_path} отсутствует или устарел, собираем из {self.csv_filename}")
+                compile_table(self.csv_filename, synonyms_path, self.lemmas_path)
+                table = SpecLemmaTable(self.lemmas_path)
+            return table
+        except Exception as e:
+            logger.error(f"Таблица лемм {self.lemmas_path} недоступна, поиск без нее: {e}")
+            return None
 
     def _resolve_csv_path(self, csv_filename: str) -> str:
         """Разрешает путь к CSV файлу относительно корня проекта"""
@@ -69,42 +124,42 @@ class ProfessionSearcher:
     def _find_exact_match(self, user_input: str) -> Optional[Dict[str, str]]:
         """Поиск точного совпадения"""
         normalized_input = self._normalize_text(user_input)
-        for profession in self.professions:
-            if normalized_input in self._normalize_text(profession['name']):
-                return profession
+        for index, normalized_name in enumerate(self.normalized_names):
+            if normalized_input in normalized_name:
+                return self.professions[index]
         return None
 
+    def _find_by_lemmas(self, user_input: str) -> Optional[Dict[str, str]]:
+        """Поиск по таблице лемм и синонимов: одно обращение к словарю"""
+        if self._lemma_table is None:
+            return None
+        row = self._lemma_table.lookup(user_input)
+        return None if row is None else self.professions[row]
+
     def _find_fuzzy_matches(self, user_input: str, threshold: int = 50) -> List[Dict[str, Any]]:
         """Нечеткий поиск совпадений"""
         normalized_input = self._normalize_text(user_input)
-        profession_names = [p['name'] for p in self.professions]
-        normalized_names = [self._normalize_text(name) for name in profession_names]
 
-        matches = process.extract(normalized_input, normalized_names,
-                                  scorer=fuzz.token_sort_ratio,
-                                  limit=5)
+        matches = self._name_index.extract(normalized_input, limit=5, threshold=threshold)
 
         results: List[Dict[str, Any]] = []
-        for match in matches:
-            matched_normalized, score = match
-            if score >= threshold:
-                # Находим индекс совпадения в оригинальном списке
-                index = normalized_names.index(matched_normalized)
-                results.append({
-                    'profession': self.professions[index],
-                    'score': score,
-                    'original_name': profession_names[index]
-                })
+        for index, score in matches:
+            results.append({
+                'profession': self.professions[index],
+                'score': score,
+                'original_name': self.professions[index]['name']
+            })
 
         return results
 
     def _find_by_keywords(self, user_input: str) -> Optional[Dict[str, str]]:
         """Поиск по ключевым словам"""
-        keywords = user_input.split()
-        for profession in self.professions:
-            profession_lower = self._normalize_text(profession['name'])
-            if all(self._normalize_text(keyword) in profession_lower for keyword in keywords):
-                return profession
+        keywords = [self._normalize_text(keyword) for keyword in user_input.split()]
+        keyword_tokens = frozenset(keywords)
+        for index, profession_lower in enumerate(self.normalized_names):
+            # Все слова совпали целиком - подстроки можно не проверять
+            if keyword_tokens <= self.name_tokens[index] or all(keyword in profession_lower for keyword in keywords):
+                return self.professions[index]
         return None
 
     def search(self, user_input: str, threshold: int = 50) -> Union[Dict[str, str], List[Dict[str, Any]], None]:
@@ -125,6 +180,11 @@ class ProfessionSearcher:
         # if exact_match:
         #     return exact_match
 
+        # 1. Словоформы и синонимы
+        lemma_match = self._find_by_lemmas(user_input)
+        if lemma_match:
+            return lemma_match
+
         # 2. Нечеткий поиск
         fuzzy_matches = self._find_fuzzy_matches(user_input, threshold)
         if fuzzy_matches:
@@ -147,14 +207,12 @@ class ProfessionSearcher:
 
     def get_profession_by_code(self, code: str) -> Optional[Dict[str, str]]:
         """Найти профессию по коду"""
-        for profession in self.professions:
-            if profession['code'] == code:
-                return profession
-        return None
+        return self._by_code.get(code)
 
     def get_profession_by_name(self, name: str) -> Optional[Dict[str, str]]:
         """Найти профессию по точному названию"""
-        for profession in self.professions:
-            if profession['name'] == name:
-                return profession
-        return None
\ No newline at end of file
+        return self._by_name.get(name)
+
+
+# Создаем глобальный экземпляр сервиса
+profession_searcher = ProfessionSearcher()
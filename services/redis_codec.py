@@ -0,0 +1,130 @@
+import json
+import logging
+import zlib
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+import msgpack
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+# Заголовок значения в новом формате: MAGIC + версия формата + id кодека + флаги.
+# Значения без заголовка - прежний формат: строки и числа как есть, остальное JSON.
+MAGIC = b'\x00'
+FORMAT_VERSION = 1
+HEADER_SIZE = 4
+
+FLAG_ZLIB = 0x01
+
+
+class Codec(ABC):
+    """Кодек структурированных значений (dict, list и т.п.) в байты."""
+
+    id: int
+    name: str
+
+    @abstractmethod
+    def dumps(self, value: Any) -> bytes:
+        ...
+
+    @abstractmethod
+    def loads(self, data: bytes) -> Any:
+        ...
+
+
+class JsonCodec(Codec):
+    """Компактный JSON (без пробелов, UTF-8 без экранирования)."""
+
+    id = 1
+    name = 'json'
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class MsgpackCodec(Codec):
+    """MessagePack: двоичный формат, короче и быстрее JSON для вложенных словарей."""
+
+    id = 2
+    name = 'msgpack'
+
+    def dumps(self, value: Any) -> bytes:
+        return msgpack.packb(value, use_bin_type=True)
+
+    def loads(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+
+CODECS: Dict[int, Codec] = {}
+
+
+def register_codec(codec: Codec):
+    """Регистрирует кодек; значения читаются по id из заголовка независимо от текущей настройки."""
+    CODECS[codec.id] = codec
+
+
+register_codec(JsonCodec())
+register_codec(MsgpackCodec())
+
+
+class ValueCodec:
+    """
+    Кодирование значений для Redis.
+
+    Строки и числа пишутся как есть (их читают и другие клиенты, в том числе
+    служебные поля), структуры - выбранным кодеком с заголовком формата,
+    при размере от compress_min_bytes - со сжатием zlib, если оно дает выигрыш.
+    decode понимает и новый формат с любым зарегистрированным кодеком,
+    и прежние JSON-значения.
+    """
+
+    def __init__(self, codec_name: str = 'msgpack', compress_min_bytes: Optional[int] = 1024, compress_level: int = 1):
+        codecs = {codec.name: codec for codec in CODECS.values()}
+        if codec_name not in codecs:
+            raise ValueError(f"Unknown Redis value codec: {codec_name}")
+        self.codec = codecs[codec_name]
+        self.compress_min_bytes = compress_min_bytes
+        self.compress_level = compress_level
+
+    def encode(self, value: Any) -> Any:
+        if isinstance(value, (str, int, float)):
+            return value
+        payload = self.codec.dumps(value)
+        flags = 0
+        if self.compress_min_bytes and len(payload) >= self.compress_min_bytes:
+            compressed = zlib.compress(payload, self.compress_level)
+            if len(compressed) < len(payload):
+                payload = compressed
+                flags |= FLAG_ZLIB
+        return MAGIC + bytes((FORMAT_VERSION, self.codec.id, flags)) + payload
+
+    def decode(self, value: Any) -> Any:
+        if isinstance(value, bytes):
+            if value[:1] == MAGIC and len(value) >= HEADER_SIZE:
+                return self._decode_tagged(value)
+            value = value.decode('utf-8')
+        try:
+            return json.loads(value)
+        except (json.JSONDecodeError, TypeError):
+            return value
+
+    def _decode_tagged(self, value: bytes) -> Any:
+        version, codec_id, flags = value[1], value[2], value[3]
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported Redis value format version: {version}")
+        codec = CODECS.get(codec_id)
+        if codec is None:
+            raise ValueError(f"Unknown Redis value codec id: {codec_id}")
+        payload = value[HEADER_SIZE:]
+        if flags & FLAG_ZLIB:
+            payload = zlib.decompress(payload)
+        return codec.loads(payload)
+
+
+# Создаем глобальный экземпляр сервиса
+value_codec = ValueCodec(config.redis_codec, config.redis_compress_min_bytes)
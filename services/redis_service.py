@@ -1,21 +1,85 @@
-import json
 import logging
-from typing import Any, Optional, Dict, List, Union
+from collections import Counter
+from typing import Any, Optional, Dict, Iterable, List, Mapping, Union
 from datetime import timedelta
 import redis
+from redis.client import NEVER_DECODE
 from redis.exceptions import RedisError
 
 from config import config
+from services.l1_cache import l1_cache
+from services.redis_codec import value_codec
 
 logger = logging.getLogger(__name__)
 
 
+# Опция команды: ответ без декодирования в строку (значения могут быть двоичными)
+RAW = {NEVER_DECODE: True}
+
+
+def encode_value(value: Any) -> Any:
+    """Значение для записи в Redis: строки и числа как есть, остальное - кодеком (см. redis_codec)."""
+    return value_codec.encode(value)
+
+
+def decode_value(value: Any) -> Any:
+    """Значение из Redis: новый формат или прежний JSON, иначе возвращается строка."""
+    return value_codec.decode(value)
+
+
+def decode_hash(result: Dict[Any, Any], decode: bool = True) -> Dict[str, Any]:
+    """Ответ HGETALL без декодирования: имена полей - строки, значения - decode_value или байты."""
+    return {
+        (field.decode('utf-8') if isinstance(field, bytes) else field): decode_value(value) if decode else value
+        for field, value in result.items()
+    }
+
+
+def user_key_owner(key: str) -> Optional[str]:
+    """Пользователь, которому принадлежит ключ вида user:{user_id}:..., иначе None."""
+    parts = key.split(':', 2)
+    if len(parts) == 3 and parts[0] == 'user' and parts[1] and parts[2] != 'keys':
+        return parts[1]
+    return None
+
+
+def user_keys_index(user_id: str) -> str:
+    """Множество ключей пользователя: user:{user_id}:keys."""
+    return f"user:{user_id}:keys"
+
+
+def pre_index_user_keys(user_id: str) -> List[str]:
+    """Ключи, которые код до индекса user:{user_id}:keys писал без регистрации в нем."""
+    return [f"user:{user_id}:session"]
+
+
+def index_user_key(pipe, key: str):
+    """Добавляет в конвейер регистрацию ключа в индексе его пользователя."""
+    owner = user_key_owner(key)
+    if owner is not None:
+        index = user_keys_index(owner)
+        pipe.sadd(index, key)
+        pipe.expire(index, config.redis_user_index_ttl)
+
+
+def count_hset_many(stats: Counter, mapping: Mapping[str, Any], expire: Optional[int], remove: Iterable[str] = ()):
+    """
+    Учет hset_many: один round trip вместо отдельных HSET/HDEL на каждое поле
+    и EXPIRE после каждой записи, как делали поштучные hset.
+    """
+    separate = len(mapping) * (2 if expire else 1) + (1 if remove else 0)
+    stats['hset_many'] += 1
+    stats['round_trips'] += 1
+    stats['round_trips_saved'] += max(separate - 1, 0)
+
+
 class RedisService:
     """Сервис для работы с Redis."""
     
     def __init__(self):
         self.redis_url = config.redis_url
         self._client = None
+        self.stats = Counter()
     
     @property
     def client(self) -> redis.Redis:
@@ -42,46 +106,49 @@ class RedisService:
         
         Args:
             key: Ключ
-            value: Значение (будет сериализовано в JSON)
+            value: Значение (структуры кодируются кодеком, см. redis_codec)
             expire: Время жизни в секундах
             
         Returns:
             bool: Успешность операции
         """
         try:
-            if not isinstance(value, (str, int, float)):
-                value = json.dumps(value)
-            
+            value = encode_value(value)
+
             if expire:
-                return self.client.setex(key, timedelta(seconds=expire), value)
+                result = self.client.setex(key, timedelta(seconds=expire), value)
             else:
-                return self.client.set(key, value)
+                result = self.client.set(key, value)
+            self.invalidate_l1(key)
+            return result
         except RedisError as e:
             logger.error(f"Ошибка записи в Redis: {e}")
             return False
     
-    def get(self, key: str, default: Any = None) -> Any:
+    def get(self, key: str, default: Any = None, raise_errors: bool = False) -> Any:
         """
         Получает значение по ключу.
         
         Args:
             key: Ключ
             default: Значение по умолчанию, если ключ не найден
+            raise_errors: Пробрасывать RedisError, чтобы отличить сбой от отсутствующего ключа
             
         Returns:
             Any: Значение или default
         """
         try:
-            value = self.client.get(key)
+            found, value = l1_cache.get(key)
+            if not found:
+                value = self.client.execute_command('GET', key, **RAW)
+                l1_cache.put(key, value)
             if value is None:
                 return default
-            
-            # Пытаемся десериализовать JSON
-            try:
-                return json.loads(value)
-            except json.JSONDecodeError:
-                return value
+
+            return decode_value(value)
         except RedisError as e:
+            if raise_errors:
+                raise
             logger.error(f"Ошибка чтения из Redis: {e}")
             return default
     
@@ -96,7 +163,9 @@ class RedisService:
             int: Количество удаленных ключей
         """
         try:
-            return self.client.delete(*keys)
+            deleted = self.client.delete(*keys)
+            self.invalidate_l1(*keys)
+            return deleted
         except RedisError as e:
             logger.error(f"Ошибка удаления из Redis: {e}")
             return 0
@@ -104,6 +173,7 @@ class RedisService:
     def delete_by_pattern(self, pattern: str) -> int:
         """
         Удаляет все ключи, соответствующие заданному шаблону.
+        Ключи перебираются курсором SCAN, а не KEYS, чтобы не блокировать Redis.
         
         Args:
             pattern: Шаблон для поиска ключей (например, "user:123:*")
@@ -112,17 +182,68 @@ class RedisService:
             int: Количество удаленных ключей
         """
         try:
-            # Находим все ключи, соответствующие шаблону
-            keys = self.client.keys(pattern)
+            deleted = 0
+            batch = []
+            for key in self.client.scan_iter(match=pattern, count=500):
+                batch.append(key)
+                if len(batch) >= 500:
+                    deleted += self.client.delete(*batch)
+                    batch = []
+            if batch:
+                deleted += self.client.delete(*batch)
+            self.invalidate_l1(pattern)
+            return deleted
+        except RedisError as e:
+            logger.error(f"Ошибка удаления ключей по шаблону {pattern}: {e}")
+            return 0
+
+    def invalidate_l1(self, *keys: str):
+        """
+        Сбрасывает локальный кэш (l1_cache) по ключам или шаблонам
+        и рассылает инвалидацию остальным процессам.
+        """
+        keys = l1_cache.tracked(keys)
+        if not keys:
+            return
+        l1_cache.invalidate(keys)
+        try:
+            self.client.publish(l1_cache.channel, l1_cache.message(keys))
+        except RedisError as e:
+            logger.error(f"Ошибка публикации инвалидации кэша: {e}")
+
+    def delete_user_keys(self, user_id: str) -> int:
+        """
+        Удаляет ключи пользователя по индексу user:{user_id}:keys за O(число его ключей).
+
+        Индекса нет у нового пользователя, после сброса и по истечении TTL индекса -
+        тогда удалять нечего. SCAN (redis_user_index_scan_fallback, по умолчанию
+        выключен) выполняется, только если есть ключ, записанный до появления индекса.
+        
+        Args:
+            user_id: Идентификатор пользователя
             
-            if not keys:
+        Returns:
+            int: Количество удаленных ключей
+        """
+        index = user_keys_index(user_id)
+        try:
+            keys = self.client.smembers(index)
+            if keys:
+                self.stats['user_keys_indexed'] += 1
+                return max(self.client.delete(*keys, index) - 1, 0)
+        except RedisError as e:
+            logger.error(f"Ошибка удаления ключей пользователя {user_id}: {e}")
+            return 0
+        if not config.redis_user_index_scan_fallback:
+            return 0
+        try:
+            if not self.client.exists(*pre_index_user_keys(user_id)):
                 return 0
-                
-            # Удаляем все найденные ключи
-            return self.client.delete(*keys)
         except RedisError as e:
-            logger.error(f"Ошибка удаления ключей по шаблону {pattern}: {e}")
+            logger.error(f"Ошибка проверки ключей пользователя {user_id}: {e}")
             return 0
+        self.stats['user_keys_scan'] += 1
+        return self.delete_by_pattern(f"user:{user_id}:*")
     
     def exists(self, key: str) -> bool:
         """
@@ -165,18 +286,48 @@ class RedisService:
             name: Имя хеша
             key: Ключ поля
             value: Значение поля
-            expire: Время жизни в секундах
+            expire: Время жизни в секундах (продлевается при каждой записи)
             
         Returns:
             bool: Успешность операции
         """
+        return self.hset_many(name, {key: value}, expire)
+
+    def hset_many(
+        self,
+        name: str,
+        mapping: Mapping[str, Any],
+        expire: Optional[int] = None,
+        remove: Iterable[str] = ()
+    ) -> bool:
+        """
+        Атомарно записывает несколько полей хеша и задает TTL за один round trip
+        (HDEL + HSET + EXPIRE в MULTI/EXEC).
+        
+        Args:
+            name: Имя хеша
+            mapping: Поля и значения
+            expire: Время жизни хеша в секундах
+            remove: Поля, удаляемые в той же транзакции
+            
+        Returns:
+            bool: Успешность операции
+        """
+        remove = list(remove)
+        if not mapping and not remove:
+            return True
         try:
-            if not isinstance(value, (str, int, float)):
-                value = json.dumps(value)
-            hset_result = self.client.hset(name, key, value)
-            if expire and hset_result:
-                self.client.expire(name, expire)
-            return hset_result
+            with self.client.pipeline(transaction=True) as pipe:
+                if remove:
+                    pipe.hdel(name, *remove)
+                if mapping:
+                    pipe.hset(name, mapping={field: encode_value(value) for field, value in mapping.items()})
+                if expire:
+                    pipe.expire(name, expire)
+                index_user_key(pipe, name)
+                pipe.execute()
+            count_hset_many(self.stats, mapping, expire, remove)
+            return True
         except RedisError as e:
             logger.error(f"Ошибка записи в хеш Redis: {e}")
             return False
@@ -194,19 +345,38 @@ class RedisService:
             Any: Значение или default
         """
         try:
-            value = self.client.hget(name, key)
+            value = self.client.execute_command('HGET', name, key, **RAW)
             if value is None:
                 return default
-            
-            # Пытаемся десериализовать JSON
-            try:
-                return json.loads(value)
-            except json.JSONDecodeError:
-                return value
+
+            return decode_value(value)
         except RedisError as e:
             logger.error(f"Ошибка чтения из хеша Redis: {e}")
             return default
     
+    def hmget(self, name: str, *keys: str, raise_errors: bool = False) -> Dict[str, Any]:
+        """
+        Получает несколько полей хеша за один запрос.
+        
+        Args:
+            name: Имя хеша
+            keys: Ключи полей
+            raise_errors: Пробрасывать RedisError, чтобы отличить сбой от отсутствующих полей
+            
+        Returns:
+            Dict[str, Any]: Значения по ключам, отсутствующие поля - None
+        """
+        if not keys:
+            return {}
+        try:
+            values = self.client.execute_command('HMGET', name, *keys, **RAW)
+            return {key: decode_value(value) if value is not None else None for key, value in zip(keys, values)}
+        except RedisError as e:
+            if raise_errors:
+                raise
+            logger.error(f"Ошибка чтения из хеша Redis: {e}")
+            return dict.fromkeys(keys)
+
     def hgetall(self, name: str) -> Dict[str, Any]:
         """
         Получает все поля и значения хеша.
@@ -218,14 +388,7 @@ class RedisService:
             Dict[str, Any]: Словарь с полями и значениями
         """
         try:
-            result = self.client.hgetall(name)
-            decoded_result = {}
-            for key, value in result.items():
-                try:
-                    decoded_result[key] = json.loads(value)
-                except json.JSONDecodeError:
-                    decoded_result[key] = value
-            return decoded_result
+            return decode_hash(self.client.execute_command('HGETALL', name, **RAW))
         except RedisError as e:
             logger.error(f"Ошибка чтения хеша из Redis: {e}")
             return {}
@@ -242,12 +405,7 @@ class RedisService:
             int: Количество добавленных элементов
         """
         try:
-            # Сериализуем нестроковые значения
-            serialized_values = [
-                json.dumps(value) if not isinstance(value, (str, int, float)) else value
-                for value in values
-            ]
-            return self.client.sadd(name, *serialized_values)
+            return self.client.sadd(name, *(encode_value(value) for value in values))
         except RedisError as e:
             logger.error(f"Ошибка добавления в множество Redis: {e}")
             return 0
@@ -263,14 +421,7 @@ class RedisService:
             List[Any]: Список элементов
         """
         try:
-            members = self.client.smembers(name)
-            result = []
-            for member in members:
-                try:
-                    result.append(json.loads(member))
-                except json.JSONDecodeError:
-                    result.append(member)
-            return result
+            return [decode_value(member) for member in self.client.execute_command('SMEMBERS', name, **RAW)]
         except RedisError as e:
             logger.error(f"Ошибка чтения множества из Redis: {e}")
             return []
@@ -0,0 +1,123 @@
+import logging
+from collections import Counter, OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import config
+
+
+logger = logging.getLogger(__name__)
+
+SLOTS_DATE_FORMAT = '%d.%m.%Y'
+REQUEST_DATE_FORMAT = '%Y-%m-%d'
+
+
+def slots_windows(timedelta_days: int) -> List[int]:
+    """
+    Окна поиска слотов (в днях от начальной даты): исходное и расширенные
+    с шагом fer_slots_step_days до fer_slots_max_days, как раньше делал
+    рекурсивный get_slots (14 -> 21 -> 28).
+    """
+    windows = [timedelta_days]
+    while windows[-1] < config.fer_slots_max_days:
+        windows.append(windows[-1] + config.fer_slots_step_days)
+    return windows
+
+
+def window_request(request_data: Dict[str, Any], first_day: int, last_day: int) -> Dict[str, Any]:
+    """Запрос за дни [first_day, last_day] от начальной даты исходного запроса."""
+    date_start = datetime.strptime(request_data['date_start'], REQUEST_DATE_FORMAT).date()
+    return {
+        **request_data,
+        'date_start': (date_start + timedelta(days=first_day)).strftime(REQUEST_DATE_FORMAT),
+        'date_end': (date_start + timedelta(days=last_day)).strftime(REQUEST_DATE_FORMAT),
+    }
+
+
+def slice_slots(slots: Dict[str, Dict], date_start: date, days: int) -> Dict[str, Dict]:
+    """Слоты с датой не позже date_start + days."""
+    last_date = date_start + timedelta(days=days)
+    return {
+        slot_date: times for slot_date, times in slots.items()
+        if datetime.strptime(slot_date, SLOTS_DATE_FORMAT).date() <= last_date
+    }
+
+
+def first_window(slots: Dict[str, Dict], date_start: date, windows: List[int]) -> Dict[str, Dict]:
+    """Слоты первого непустого окна - то, что вернул бы последовательный перебор окон."""
+    for days in windows:
+        window = slice_slots(slots, date_start, days)
+        if window:
+            return window
+    return {}
+
+
+class SlotsPlanner:
+    """
+    Выбор стратегии запроса расписания врача.
+
+    'wide' - один запрос за максимальное окно, окна нарезаются локально:
+             один запрос к FER, но разбирается все расписание на fer_slots_max_days.
+    'concurrent' - окна запрашиваются одновременно непересекающимися отрезками,
+             ответ - первый непустой отрезок по порядку: ответы меньше,
+             но запросов к FER несколько.
+
+    В режиме 'auto' выбор делается по наблюдаемой плотности расписания врача
+    (слотов в день): если в максимальном окне ожидается не больше
+    fer_slots_wide_max_slots слотов - 'wide', иначе 'concurrent'.
+    Для неизвестного врача - 'wide', заодно по ответу измеряется плотность.
+    """
+
+    WIDE = 'wide'
+    CONCURRENT = 'concurrent'
+
+    # Вес нового наблюдения в скользящем среднем плотности
+    alpha = 0.3
+    max_specialists = 10000
+
+    def __init__(self):
+        self.mode = config.fer_slots_strategy
+        self._density: 'OrderedDict[str, float]' = OrderedDict()
+        self.stats = Counter()
+
+    def density(self, specialist_snils: str) -> Optional[float]:
+        return self._density.get(specialist_snils)
+
+    def choose(self, specialist_snils: str, concurrent_available: bool = True) -> str:
+        if self.mode == self.CONCURRENT and concurrent_available:
+            strategy = self.CONCURRENT
+        elif self.mode == self.WIDE or not concurrent_available:
+            strategy = self.WIDE
+        else:
+            density = self.density(specialist_snils)
+            if density is None or density * config.fer_slots_max_days <= config.fer_slots_wide_max_slots:
+                strategy = self.WIDE
+            else:
+                strategy = self.CONCURRENT
+        self.stats[strategy] += 1
+        return strategy
+
+    def observe(self, specialist_snils: str, slots: Dict[str, Dict], days: int):
+        """Учитывает ответ FER за days дней в плотности расписания врача."""
+        if days <= 0:
+            return
+        observed = sum(len(times) for times in slots.values()) / days
+        previous = self._density.pop(specialist_snils, None)
+        self._density[specialist_snils] = (
+            observed if previous is None else previous + self.alpha * (observed - previous)
+        )
+        if len(self._density) > self.max_specialists:
+            self._density.popitem(last=False)
+
+    def segments(self, windows: List[int]) -> List[Tuple[int, int]]:
+        """Непересекающиеся отрезки дней для окон: [0, 14], [15, 21], [22, 28]."""
+        bounds = []
+        first_day = 0
+        for days in windows:
+            bounds.append((first_day, days))
+            first_day = days + 1
+        return bounds
+
+
+# Создаем глобальный экземпляр сервиса
+slots_planner = SlotsPlanner()
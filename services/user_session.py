@@ -0,0 +1,215 @@
+import contextvars
+import logging
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional, Set
+
+from redis.exceptions import RedisError
+
+from services.async_redis_service import async_redis_service
+from services.redis_service import decode_value, redis_service
+
+logger = logging.getLogger(__name__)
+
+# Служебное поле хеша со сроком жизни поля (unix time): "<поле>:expires_at"
+EXPIRES_SUFFIX = ':expires_at'
+
+# Префикс полей FSM (fsm/redis_storage.py) в том же хеше: "fsm:state", "fsm:data"
+FSM_PREFIX = 'fsm'
+
+
+def is_fsm_field(field: str) -> bool:
+    return field.startswith(FSM_PREFIX + ':')
+
+
+def session_name(user_id: str) -> str:
+    return f"user:{user_id}:session"
+
+
+def set_session_field(user_id: str, field: str, value: Any, expire: int) -> bool:
+    """
+    Запись поля сессии вне запроса (Celery) по той же схеме, что UserSession.flush():
+    рядом с полем - момент его истечения, а TTL хеша не опускается ниже
+    сроков остальных полей (FSM живет fsm_ttl, а не expire этого поля).
+    """
+    name = session_name(user_id)
+    now = time.time()
+    deadline = now + expire
+    try:
+        deadlines = [
+            float(marker) for marker_field, marker in redis_service.client.hscan_iter(name, match=f"*{EXPIRES_SUFFIX}")
+            if marker_field != field + EXPIRES_SUFFIX
+        ]
+    except RedisError as e:
+        logger.error(f"Ошибка чтения сроков полей {name}: {e}")
+        return False
+    hash_expire = math.ceil(max(deadlines + [deadline]) - now)
+    return redis_service.hset_many(
+        name, {field: value, field + EXPIRES_SUFFIX: str(round(deadline, 3))}, hash_expire
+    )
+
+
+class UserSession:
+    """
+    Сессия пользователя user:{user_id}:session в рамках одного запроса.
+
+    Хеш читается из Redis одним HGETALL при первом обращении, значения
+    декодируются по мере чтения и дальше отдаются из памяти. Записи копятся
+    и уходят одной транзакцией HSET + EXPIRE (hset_many) в flush() при формировании ответа.
+
+    Срок жизни задается для каждого поля: рядом с полем хранится служебное
+    поле с моментом истечения, просроченные поля при чтении не видны
+    и удаляются при следующей записи. Сам хеш живет до истечения самого
+    долгоживущего из известных полей, поэтому короткий TTL одного поля
+    (selected_slot - 500 с) не сокращает жизнь остальных.
+    """
+
+    def __init__(self, user_id: str):
+        self.user_id = user_id
+        self.name = session_name(user_id)
+        self._raw: Optional[Dict[str, bytes]] = None
+        self._values: Dict[str, Any] = {}
+        self._deadlines: Dict[str, float] = {}
+        self._dirty: Dict[str, Optional[int]] = {}
+        self._removed: Set[str] = set()
+
+    async def load(self):
+        """Загружает хеш из Redis (один раз за запрос)."""
+        if self._raw is not None:
+            return
+        raw = await async_redis_service.hgetall(self.name, decode=False)
+
+        now = time.time()
+        self._raw = {}
+        for field, value in raw.items():
+            # Поля, удаленные до загрузки (delete), из Redis не подхватываем
+            if field.endswith(EXPIRES_SUFFIX) or field in self._removed:
+                continue
+            deadline = raw.get(field + EXPIRES_SUFFIX)
+            if deadline is not None:
+                if float(deadline) <= now:
+                    self._removed.add(field)
+                    continue
+                self._deadlines.setdefault(field, float(deadline))
+            self._raw[field] = value
+
+    async def get(self, field: str, default: Any = None) -> Any:
+        if field in self._values:
+            return self._values[field]
+        await self.load()
+        if field not in self._raw:
+            return default
+        value = self._values[field] = decode_value(self._raw[field])
+        return value
+
+    def set(self, field: str, value: Any, expire: Optional[int] = None):
+        """Запоминает значение поля; в Redis оно попадет при flush()."""
+        self._values[field] = value
+        self._dirty[field] = expire
+        self._removed.discard(field)
+
+    def delete(self, field: str):
+        """Удаляет поле; в Redis удаление попадет при flush()."""
+        self._values.pop(field, None)
+        self._dirty.pop(field, None)
+        self._deadlines.pop(field, None)
+        if self._raw is not None:
+            self._raw.pop(field, None)
+        self._removed.add(field)
+
+    async def clear(self) -> int:
+        """
+        Сбрасывает сессию: удаляет ключи пользователя и несохраненные изменения.
+
+        Поля FSM (fsm:*) сохраняются с оставшимся сроком жизни - данные
+        пациента и fer_session_id сбрасывает state.clear(), а не сессия обработчиков.
+        """
+        await self.load()
+        now = time.time()
+        kept = {}
+        for field in set(self._raw) | set(self._values):
+            if not is_fsm_field(field):
+                continue
+            if field in self._dirty:
+                expire = self._dirty[field]
+            elif field in self._deadlines:
+                expire = max(math.ceil(self._deadlines[field] - now), 1)
+            else:
+                expire = None
+            kept[field] = (await self.get(field), expire)
+
+        self._raw = {}
+        self._values.clear()
+        self._deadlines.clear()
+        self._dirty.clear()
+        self._removed.clear()
+        deleted = await async_redis_service.delete_user_keys(self.user_id)
+        if kept:
+            for field, (value, expire) in kept.items():
+                self.set(field, value, expire)
+            await self.flush()
+        return deleted
+
+    async def flush(self) -> bool:
+        """Записывает измененные поля одним конвейером. Без изменений Redis не трогает."""
+        if not self._dirty and not self._removed:
+            return True
+
+        now = time.time()
+        mapping = {}
+        removed = set()
+        for field in self._removed:
+            removed.update((field, field + EXPIRES_SUFFIX))
+        for field, expire in self._dirty.items():
+            mapping[field] = self._values[field]
+            if expire:
+                self._deadlines[field] = now + expire
+                mapping[field + EXPIRES_SUFFIX] = str(round(now + expire, 3))
+            else:
+                self._deadlines.pop(field, None)
+                removed.add(field + EXPIRES_SUFFIX)
+
+        expire = math.ceil(max(self._deadlines.values()) - now) if self._deadlines else None
+        if not await async_redis_service.hset_many(self.name, mapping, expire, remove=removed):
+            return False
+
+        self._dirty.clear()
+        self._removed.clear()
+        return True
+
+
+_sessions: contextvars.ContextVar[Optional[Dict[str, UserSession]]] = contextvars.ContextVar(
+    'user_sessions', default=None
+)
+
+
+@asynccontextmanager
+async def session_scope():
+    """
+    Область запроса: сессии, открытые через user_session() внутри нее,
+    записываются в Redis при выходе (в том числе при исключении в обработчике).
+    """
+    sessions: Dict[str, UserSession] = {}
+    token = _sessions.set(sessions)
+    try:
+        yield sessions
+    finally:
+        _sessions.reset(token)
+        for session in sessions.values():
+            await session.flush()
+
+
+def in_session_scope() -> bool:
+    return _sessions.get() is not None
+
+
+def user_session(user_id: str) -> UserSession:
+    """Сессия пользователя в текущем запросе."""
+    sessions = _sessions.get()
+    if sessions is None:
+        raise RuntimeError("user_session() вызван вне session_scope()")
+    session = sessions.get(user_id)
+    if session is None:
+        session = sessions[user_id] = UserSession(user_id)
+    return session
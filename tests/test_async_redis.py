@@ -0,0 +1,82 @@
+import sys
+import os
+import asyncio
+
+# Добавляем корневую директорию проекта в Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import config
+from services.async_redis_service import async_redis_service
+from services.redis_service import encode_value
+
+
+async def _async_redis_hash():
+    await async_redis_service.hset("test_async_hset", 'person', {'name': "Иван Иванов", 'age': 44}, 60)
+    await async_redis_service.hset("test_async_hset", 'work', 'hard', 60)
+
+    person = await async_redis_service.hget("test_async_hset", 'person')
+    fields = await async_redis_service.hmget("test_async_hset", 'work', 'missing')
+    ttl = await async_redis_service.client.ttl("test_async_hset")
+    await async_redis_service.delete("test_async_hset")
+    await async_redis_service.close()
+    return person, fields, ttl
+
+
+async def _async_redis_pipeline():
+    async with async_redis_service.pipeline() as pipe:
+        pipe.hset("test_async_pipe", 'a', encode_value({'x': 1}))
+        pipe.expire("test_async_pipe", 60)
+        await pipe.execute()
+
+    value = await async_redis_service.hgetall("test_async_pipe")
+    await async_redis_service.delete("test_async_pipe")
+    await async_redis_service.close()
+    return value
+
+
+async def _async_redis_user_keys():
+    await async_redis_service.hset("user:test_index:session", 'a', 1, 60)
+    indexed = await async_redis_service.client.smembers("user:test_index:keys")
+    deleted = await async_redis_service.delete_user_keys("test_index")
+    # Без индекса и без ключей, записанных до него, SCAN не выполняется
+    scans = async_redis_service.stats['user_keys_scan']
+    config.redis_user_index_scan_fallback = True
+    try:
+        nothing = await async_redis_service.delete_user_keys("test_index")
+        without_scan = async_redis_service.stats['user_keys_scan'] == scans
+        # Сессия, записанная до индекса, удаляется через SCAN
+        await async_redis_service.client.hset("user:test_index:session", 'a', 1)
+        await async_redis_service.client.expire("user:test_index:session", 60)
+        scanned = await async_redis_service.delete_user_keys("test_index")
+    finally:
+        config.redis_user_index_scan_fallback = False
+    left = await async_redis_service.client.exists("user:test_index:session", "user:test_index:keys")
+    await async_redis_service.close()
+    return indexed, deleted, nothing, without_scan, scanned, left
+
+
+def test_async_redis_hash():
+    person, fields, ttl = asyncio.run(_async_redis_hash())
+    assert person == {'name': "Иван Иванов", 'age': 44}
+    assert fields == {'work': 'hard', 'missing': None}
+    assert 0 < ttl <= 60
+
+
+def test_async_redis_pipeline():
+    assert asyncio.run(_async_redis_pipeline()) == {'a': {'x': 1}}
+
+
+def test_async_redis_user_keys():
+    indexed, deleted, nothing, without_scan, scanned, left = asyncio.run(_async_redis_user_keys())
+    assert indexed == {"user:test_index:session"}
+    assert deleted == 1
+    assert nothing == 0 and without_scan
+    assert scanned == 1
+    assert left == 0
+
+
+if __name__ == "__main__":
+    test_async_redis_hash()
+    test_async_redis_pipeline()
+    test_async_redis_user_keys()
+    print('test_async_redis: success')
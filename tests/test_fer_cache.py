@@ -0,0 +1,48 @@
+import sys
+import os
+import asyncio
+
+# Добавляем корневую директорию проекта в Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.async_redis_service import async_redis_service
+from services.fer_cache import fer_cache
+
+
+def _schedule(snils: str, date_start: str) -> dict:
+    return {'specialist_snils': snils, 'post_id': 109, 'date_start': date_start, 'date_end': date_start,
+            'time_start': '08:00', 'time_end': '18:00'}
+
+
+async def _fer_cache_slots():
+    async def load():
+        return [{'slot_id': '1'}]
+
+    requests = [_schedule('test-snils-1', '01.02.2025'), _schedule('test-snils-1', '02.02.2025'),
+                _schedule('test-snils-2', '01.02.2025')]
+    for data in requests:
+        await fer_cache.afetch('GetScheduleInfoRequest', data, load)
+
+    index = await async_redis_service.client.smembers("fer:cache:slots:test-snils-1")
+    deleted = await fer_cache.ainvalidate_slots('test-snils-1')
+    left = [await async_redis_service.exists(fer_cache._key('GetScheduleInfoRequest', data)) for data in requests]
+
+    await fer_cache.ainvalidate_slots('test-snils-2')
+    await async_redis_service.delete("fer:cache:slots:test-snils-1", "fer:cache:slots:test-snils-2")
+    await async_redis_service.close()
+    return index, deleted, left
+
+
+def test_fer_cache_invalidate_slots():
+    if not fer_cache.enabled:
+        return
+    index, deleted, left = asyncio.run(_fer_cache_slots())
+    # Записи врача сбрасываются по его множеству ключей, чужие остаются
+    assert len(index) == 2
+    assert deleted == 2
+    assert left == [False, False, True]
+
+
+if __name__ == "__main__":
+    test_fer_cache_invalidate_slots()
+    print('test_fer_cache: success')
@@ -0,0 +1,75 @@
+import sys
+import os
+
+# Добавляем корневую директорию проекта в Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.fer_decoders import (
+    AppointmentResult,
+    MedicalOrganization,
+    Patient,
+    Slot,
+    decode_appointment,
+    decode_mo_list,
+    decode_patient_by_phone,
+    decode_patient_info,
+)
+
+ENVELOPE = (
+    '<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/"><soap:Body>'
+    '{body}</soap:Body></soap:Envelope>'
+)
+
+
+def test_decode_patient_by_phone():
+    response = ENVELOPE.format(body=(
+        '<IdentifyPatientByPhoneResponse xmlns="http://www.rt-eu.ru/med/er/v2_0"><Patient_Data>'
+        '<Patient_Id>42</Patient_Id><Last_Name>Иванов</Last_Name><First_Name>Иван</First_Name>'
+        '</Patient_Data></IdentifyPatientByPhoneResponse>'
+    ))
+    assert decode_patient_by_phone(response) == Patient('42', 'Иванов', 'Иван', None)
+    assert decode_patient_by_phone(ENVELOPE.format(body='<Fault/>')) is None
+
+
+def test_decode_patient_info():
+    response = ENVELOPE.format(body=(
+        '<GetPatientInfoResponse xmlns="http://www.rt-eu.ru/med/er/v2_0">'
+        '<Patient_Id>7</Patient_Id></GetPatientInfoResponse>'
+    ))
+    assert decode_patient_info(response).patient_id == '7'
+
+
+def test_decode_mo_list():
+    response = ENVELOPE.format(body=(
+        '<GetMOInfoExtendedResponse xmlns="http://www.rt-eu.ru/med/er/v2_0"><MO_List>'
+        '<MO><MO_Id>1</MO_Id><MO_OID>1.2.3</MO_OID><MO_Name>Поликлиника</MO_Name>'
+        '<MO_Address>ул. Ленина, 1</MO_Address></MO>'
+        '</MO_List></GetMOInfoExtendedResponse>'
+    ))
+    organizations = decode_mo_list(response)
+    assert organizations == [MedicalOrganization('1', '1.2.3', 'Поликлиника', 'ул. Ленина, 1', None)]
+    assert MedicalOrganization.from_dict(organizations[0].to_dict()) == organizations[0]
+
+
+def test_decode_appointment():
+    response = ENVELOPE.format(body=(
+        '<CreateAppointmentResponse xmlns="http://www.rt-eu.ru/med/er/v2_0">'
+        '<Status><Status_Code>SUCCESS</Status_Code></Status><Book_Id_Mis>B-1</Book_Id_Mis>'
+        '</CreateAppointmentResponse>'
+    ))
+    assert decode_appointment(response) == AppointmentResult('SUCCESS', 'B-1')
+
+
+def test_slot_round_trip():
+    slot = Slot('5', '10.01.2025', '09:00', '101')
+    assert slot.to_dict() == {'time': '09:00', 'room': '101', 'slot_id': '5', 'date': '10.01.2025'}
+    assert Slot.from_dict(slot.to_dict()) == slot
+
+
+if __name__ == "__main__":
+    test_decode_patient_by_phone()
+    test_decode_patient_info()
+    test_decode_mo_list()
+    test_decode_appointment()
+    test_slot_round_trip()
+    print('test_fer_decoders: success')
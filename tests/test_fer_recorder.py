@@ -0,0 +1,54 @@
+import sys
+import os
+
+# Добавляем корневую директорию проекта в Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from clients.fer_recorder import FERRecorder, FERReplayTransport, FERSanitizer
+
+RESPONSE = (
+    '<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/"><soap:Body>'
+    '<GetScheduleInfoResponse xmlns="http://www.rt-eu.ru/med/er/v2_0"><Schedule>'
+    '<Slots><Slot_Id>1</Slot_Id><VisitTime>2025-01-10T09:00:00</VisitTime><SNILS>12345678901</SNILS></Slots>'
+    '</Schedule></GetScheduleInfoResponse></soap:Body></soap:Envelope>'
+)
+REQUEST = {
+    'session_id': 'secret-session',
+    'specialist_snils': '12345678901',
+    'post_id': 109,
+    'date_start': '2025-01-10',
+    'date_end': '2025-01-24',
+    'time_start': '06:00:00',
+    'time_end': '23:59:59',
+}
+
+
+def test_pseudonym_keeps_shape():
+    sanitizer = FERSanitizer('salt')
+    value = sanitizer.pseudonym('Иванов 123')
+    assert value == sanitizer.pseudonym('Иванов 123')
+    assert len(value) == len('Иванов 123') and value[6] == ' ' and value[7:].isdigit()
+    assert value != 'Иванов 123'
+
+
+def test_record_and_replay(tmp_path):
+    recorder = FERRecorder(str(tmp_path))
+    recorder.record('GetScheduleInfoRequest', REQUEST, RESPONSE, 0.25)
+
+    corpus = (tmp_path / 'GetScheduleInfoRequest.jsonl.gz').read_bytes()
+    assert b'12345678901' not in corpus and b'secret-session' not in corpus
+
+    replay = FERReplayTransport(str(tmp_path))
+    response, latency = replay.lookup('GetScheduleInfoRequest', dict(REQUEST, session_id='other'))
+    assert latency == 0.25 or not replay.with_latency
+    assert '<Slot_Id>1</Slot_Id>' in response
+    assert replay.stats['hit'] == 1
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    test_pseudonym_keeps_shape()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_record_and_replay(pathlib.Path(tmp))
+    print('test_fer_recorder: success')
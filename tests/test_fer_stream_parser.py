@@ -0,0 +1,56 @@
+import sys
+import os
+
+# Добавляем корневую директорию проекта в Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lxml import etree
+from utils.fer_stream_parser import parse_medics_stream, parse_slots_stream
+from utils.slots_parser import prepare_slots
+
+NAMESPACES = {'ns': 'http://www.rt-eu.ru/med/er/v2_0'}
+
+MEDICS_RESPONSE = """<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/"><soap:Body>
+<GetMOResourceInfoResponse xmlns="http://www.rt-eu.ru/med/er/v2_0"><MO_Resource_List><MO_Available><Resource_Available>
+  <Resource>
+    <Specialist><SNILS>11111111111</SNILS><Last_Name>Петров</Last_Name><First_Name>Петр</First_Name><Middle_Name>Петрович</Middle_Name></Specialist>
+    <Available_Dates><Available_Date>2025-01-10</Available_Date></Available_Dates>
+  </Resource>
+  <Resource>
+    <Specialist><SNILS>22222222222</SNILS><Last_Name>Сидоров</Last_Name><First_Name>Сидор</First_Name></Specialist>
+    <Available_Dates><Available_Date>2025-01-11</Available_Date></Available_Dates>
+    <No_Schedule_Reason><No_Schedule_Reason_Сode>1</No_Schedule_Reason_Сode></No_Schedule_Reason>
+  </Resource>
+  <Resource>
+    <Specialist><SNILS>33333333333</SNILS><Last_Name>Без</Last_Name><First_Name>Дат</First_Name></Specialist>
+    <Available_Dates/>
+  </Resource>
+</Resource_Available></MO_Available></MO_Resource_List></GetMOResourceInfoResponse>
+</soap:Body></soap:Envelope>"""
+
+SLOTS_RESPONSE = """<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/"><soap:Body>
+<GetScheduleInfoResponse xmlns="http://www.rt-eu.ru/med/er/v2_0"><Schedule>
+  <Slots><Slot_Id>1</Slot_Id><VisitTime>2025-01-10T09:00:00</VisitTime><Room>101</Room></Slots>
+  <Slots><Slot_Id>2</Slot_Id><VisitTime>2025-01-10T09:15:00+03:00</VisitTime><Room>101</Room></Slots>
+  <Slots><Slot_Id>3</Slot_Id><VisitTime>2025-01-11T14:30:00</VisitTime></Slots>
+</Schedule></GetScheduleInfoResponse>
+</soap:Body></soap:Envelope>"""
+
+
+def test_parse_medics_stream():
+    assert parse_medics_stream(MEDICS_RESPONSE) == {'Петров Петр Петрович': '11111111111'}
+
+
+def test_parse_slots_stream_matches_prepare_slots():
+    root = etree.fromstring(SLOTS_RESPONSE.encode('utf-8'))
+    slots_elements = root.xpath('//ns:GetScheduleInfoResponse/ns:Schedule/ns:Slots', namespaces=NAMESPACES)
+
+    slots = parse_slots_stream(SLOTS_RESPONSE)
+    assert slots == prepare_slots(slots_elements, NAMESPACES)
+    assert slots['10.01.2025']['09:15'] == {'time': '09:15', 'room': '101', 'slot_id': '2', 'date': '10.01.2025'}
+
+
+if __name__ == "__main__":
+    test_parse_medics_stream()
+    test_parse_slots_stream_matches_prepare_slots()
+    print('test_fer_stream_parser: success')
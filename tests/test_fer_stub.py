@@ -0,0 +1,50 @@
+import sys
+import os
+
+# Добавляем корневую директорию проекта в Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import date, timedelta
+from fer_stub.data import FERDataset
+from fer_stub.server import FERStub, Latency, _per_action
+from utils.fer_decoders import decode_mo_list
+from utils.fer_stream_parser import parse_slots_stream
+
+
+def _stub(**kwargs):
+    dataset = FERDataset(patients=10, mos=3, medics_per_mo=5, no_schedule_rate=0, **kwargs)
+    return FERStub(dataset, latency=_per_action([], Latency, 'fixed:0'), error_rate=_per_action([], float, '0'))
+
+
+def test_dataset_is_deterministic():
+    first, second = _stub(seed=1), _stub(seed=1)
+    snils = first.dataset.medics[first.dataset.mos[0].oid][0].snils
+    start = date.today() + timedelta(days=1)
+    end = start + timedelta(days=14)
+    assert list(first.dataset.slots(snils, start, end)) == list(second.dataset.slots(snils, start, end))
+
+
+def test_responses_decode_with_skill_parsers():
+    stub = _stub()
+    envelope = '<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/"><soap:Body>{}</soap:Body></soap:Envelope>'
+
+    organizations = decode_mo_list(envelope.format(stub.get_mo_info({})))
+    assert len(organizations) == 3
+
+    snils = stub.dataset.medics[organizations[0].oid][0].snils
+    start = date.today() + timedelta(days=1)
+    slots = parse_slots_stream(envelope.format(stub.get_schedule_info({
+        'Specialist_SNILS': snils,
+        'Start_Date_Range': start.isoformat(),
+        'End_Date_Range': (start + timedelta(days=14)).isoformat(),
+    })))
+    slot = next(iter(next(iter(slots.values())).values()))
+
+    assert stub.dataset.book(slot['slot_id']) == 'SUCCESS'
+    assert stub.dataset.book(slot['slot_id']) == 'APPOINT_TIME_IS_BUSY'
+
+
+if __name__ == "__main__":
+    test_dataset_is_deterministic()
+    test_responses_decode_with_skill_parsers()
+    print('test_fer_stub: success')
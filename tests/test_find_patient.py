@@ -0,0 +1,74 @@
+import sys
+import os
+
+# Добавляем корневую директорию проекта в Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+from services.async_patient_service import AsyncPatientService
+from services.patient_lookup import patient_lookup
+
+
+class FakeService(AsyncPatientService):
+    def __init__(self, delays, results):
+        super().__init__()
+        self.delays = delays
+        self.results = results
+        self.finished = []
+
+    async def _fake(self, strategy):
+        await asyncio.sleep(self.delays[strategy])
+        self.finished.append(strategy)
+        return self.results[strategy]
+
+    async def find_patient_by_snils(self, patient_data):
+        return await self._fake('snils')
+
+    async def find_patient_by_fio(self, patient_data):
+        return await self._fake('fio')
+
+    async def find_patient_by_phone(self, patient_data):
+        return await self._fake('phone')
+
+
+PATIENT = {'last_name': 'Иванов', 'first_name': 'Иван', 'phone': '79000000000'}
+
+
+def test_first_success_wins_and_rest_cancelled():
+    patient_lookup.mode = 'concurrent'
+    service = FakeService({'fio': 0.2, 'phone': 0.01}, {'fio': 'by-fio', 'phone': 'by-phone'})
+
+    assert asyncio.run(service.find_patient(PATIENT)) == 'by-phone'
+    assert service.finished == ['phone']
+
+
+def test_miss_falls_through_to_other_strategy():
+    patient_lookup.mode = 'concurrent'
+    service = FakeService({'fio': 0.01, 'phone': 0.05}, {'fio': None, 'phone': 'by-phone'})
+
+    assert asyncio.run(service.find_patient(PATIENT)) == 'by-phone'
+    assert patient_lookup.stats.counters['fio']['miss'] >= 1
+
+
+def test_sequential_mode_respects_priority():
+    patient_lookup.mode = 'sequential'
+    try:
+        service = FakeService({'fio': 0.05, 'phone': 0.01}, {'fio': 'by-fio', 'phone': 'by-phone'})
+        assert asyncio.run(service.find_patient(PATIENT)) == 'by-fio'
+        assert service.finished == ['fio']
+    finally:
+        patient_lookup.mode = 'concurrent'
+
+
+def test_plan_checks_keys_like_baseline():
+    # Стратегия выбирается по наличию ключа, даже если значение пустое
+    assert patient_lookup.plan({'snils': '', 'phone': None}) == ['snils', 'phone']
+    assert patient_lookup.plan({'last_name': 'Иванов'}) == ['fio']
+
+
+if __name__ == "__main__":
+    test_first_success_wins_and_rest_cancelled()
+    test_miss_falls_through_to_other_strategy()
+    test_sequential_mode_respects_priority()
+    test_plan_checks_keys_like_baseline()
+    print('test_find_patient: success')
@@ -0,0 +1,109 @@
+import sys
+import os
+import asyncio
+
+# Добавляем корневую директорию проекта в Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aliceio import Dispatcher, Router, Skill
+from aliceio.fsm.context import FSMContext
+from aliceio.fsm.storage.base import StorageKey
+from aliceio.types import Message, Response
+
+from fsm.redis_storage import FSM_STRATEGY, RedisSessionStorage
+from fsm.states import PatientInfo
+from services.async_redis_service import async_redis_service
+from services.user_session import session_scope, user_session
+from web.middleware import SessionMiddleware
+
+
+async def _fsm_storage():
+    storage = RedisSessionStorage()
+    key = StorageKey(skill_id="test_skill", user_id="test_fsm", session_id=None, application_id=None)
+    await async_redis_service.delete("user:test_fsm:session")
+
+    # В рамках запроса состояние пишется вместе с полями сессии
+    async with session_scope():
+        await storage.set_state(key, PatientInfo.getting_post)
+        await storage.update_data(key, {'fer_session_id': 'abc', 'next_step': None})
+        user_session("test_fsm").set("post_id", 109, 2000)
+    fields = await async_redis_service.hgetall("user:test_fsm:session")
+
+    # Вне запроса - сразу в Redis
+    state = await storage.get_state(key)
+    data = await storage.get_data(key)
+    await storage.set_state(key, None)
+    await storage.set_data(key, {})
+    cleared = await storage.get_state(key), await storage.get_data(key)
+
+    await async_redis_service.delete("user:test_fsm:session")
+    await async_redis_service.close()
+    return fields, state, data, cleared
+
+
+def test_fsm_storage():
+    fields, state, data, cleared = asyncio.run(_fsm_storage())
+    assert fields['fsm:state'] == 'PatientInfo:getting_post'
+    assert fields['post_id'] == 109
+    assert state == 'PatientInfo:getting_post'
+    assert data == {'fer_session_id': 'abc', 'next_step': None}
+    assert cleared == (None, {})
+
+
+def _update(text: str) -> dict:
+    # Авторизованный пользователь: session.user.user_id отличается от id приложения
+    return {
+        "meta": {"locale": "ru-RU", "timezone": "UTC", "client_id": "test", "interfaces": {}},
+        "session": {
+            "message_id": 1, "session_id": "test_session", "skill_id": "test_skill", "new": False,
+            "user_id": "test_fsm_app", "application": {"application_id": "test_fsm_app"},
+            "user": {"user_id": "test_fsm_account"},
+        },
+        "request": {
+            "command": text, "original_utterance": text, "type": "SimpleUtterance",
+            "nlu": {"tokens": [], "entities": [], "intents": {}}, "markup": {"dangerous_context": False},
+        },
+        "version": "1.0",
+    }
+
+
+async def _fsm_authorized_user():
+    router = Router()
+
+    @router.message()
+    async def handler(message: Message, state: FSMContext):
+        user_session(message.session.user_id).set("post_id", 109, 900)
+        await state.update_data(fer_session_id='abc')
+        await state.set_state(PatientInfo.getting_post)
+        return Response(text='ok')
+
+    # Как в web/server.py при fsm_storage='redis'
+    dp = Dispatcher(storage=RedisSessionStorage(), fsm_strategy=FSM_STRATEGY)
+    dp.update.outer_middleware.unregister(dp.fsm)
+    dp.update.outer_middleware(SessionMiddleware())
+    dp.update.outer_middleware(dp.fsm)
+    dp.include_router(router)
+
+    await async_redis_service.delete("user:test_fsm_app:session", "user:test_fsm_account:session")
+    await dp.feed_webhook_update(Skill(skill_id="test_skill"), _update("терапевт"))
+    fields = await async_redis_service.hgetall("user:test_fsm_app:session")
+    account_exists = await async_redis_service.exists("user:test_fsm_account:session")
+
+    await async_redis_service.delete("user:test_fsm_app:session")
+    await async_redis_service.close()
+    return fields, account_exists
+
+
+def test_fsm_authorized_user():
+    fields, account_exists = asyncio.run(_fsm_authorized_user())
+    # FSM и поля обработчиков - в одном хеше, по id приложения
+    assert fields['post_id'] == 109
+    assert fields['fsm:state'] == 'PatientInfo:getting_post'
+    assert fields['fsm:data'] == {'fer_session_id': 'abc'}
+    assert not account_exists
+
+
+if __name__ == "__main__":
+    test_fsm_storage()
+    test_fsm_authorized_user()
+    print('test_fsm_storage: success')
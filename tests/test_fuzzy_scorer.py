@@ -0,0 +1,55 @@
+import sys
+import os
+
+# Добавляем корневую директорию проекта в Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import config
+from services.fuzzy_scorer import FuzzyIndex, FuzzyScorer, fuzzy_scorer, ngrams
+
+
+def test_fuzzy_scorer_extract():
+    corpus = ['терапевт', 'терапевт участковый', 'стоматолог хирург', 'терапевт']
+    matches = fuzzy_scorer.extract('терапевт', corpus, limit=3)
+    # Одинаковые строки - разные индексы, при равной оценке раньше та, что раньше в корпусе
+    assert matches[:2] == [(0, 100), (3, 100)]
+    assert matches[2][0] == 1
+    assert fuzzy_scorer.extract('хирург стоматолог', corpus, limit=1) == [(2, 100)]
+    assert fuzzy_scorer.extract('абв', corpus, threshold=50) == []
+    assert fuzzy_scorer.extract('терапевт', []) == []
+
+    prepared = fuzzy_scorer.prepare(corpus)
+    assert fuzzy_scorer.extract('Терапевт!', prepared, prepared=True) == fuzzy_scorer.extract('терапевт', corpus)
+
+
+def test_fuzzy_scorer_weights():
+    corpus = ['детская поликлиника 3', 'поликлиника']
+    scorer = FuzzyScorer({'token_sort_ratio': 1, 'partial_ratio': 1})
+    scores = scorer.scores('поликлиника', corpus)
+    assert scores[1] == 100
+    assert fuzzy_scorer.scores('поликлиника', corpus)[0] < scores[0] < 100
+    try:
+        FuzzyScorer({'unknown': 1})
+        assert False, 'ожидалась ошибка'
+    except ValueError:
+        pass
+
+
+def test_fuzzy_index_shortlist():
+    assert ngrams('лор') == {' ло', 'лор', 'ор '}
+    corpus = [f"поликлиника {i} ул ленина {i % 7}" for i in range(300)] + ['областная больница 2']
+    # Корпус ненамного больше shortlist_size оценивается целиком
+    assert FuzzyIndex(corpus[:20 * config.fuzzy_shortlist_min_ratio], shortlist_size=20).ngrams is None
+    # Индекс триграмм строится в конструкторе, до первого поиска
+    index = FuzzyIndex(corpus, shortlist_size=20)
+    assert index.ngrams is not None
+    assert index.extract('больница 2 областная', limit=1) == [(300, 100)]
+    assert index.extract('ленина 4 поликлиника 123 ул', limit=1) == [(123, 100)]
+    assert index.extract('', threshold=50) == []
+
+
+if __name__ == "__main__":
+    test_fuzzy_scorer_extract()
+    test_fuzzy_scorer_weights()
+    test_fuzzy_index_shortlist()
+    print('test_fuzzy_scorer: success')
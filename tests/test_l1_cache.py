@@ -0,0 +1,60 @@
+import sys
+import os
+import time
+
+# Добавляем корневую директорию проекта в Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.l1_cache import L1Cache
+
+
+def make_cache(max_entries: int = 2) -> L1Cache:
+    cache = L1Cache()
+    cache.enabled = True
+    cache.max_entries = max_entries
+    # Без подписчика на инвалидации: тест не требует Redis
+    cache._listener_pid = os.getpid()
+    cache.register('mo', 'fer:cache:GetMOInfoExtendedRequest:', ttl=60)
+    cache.register('short', 'short:', ttl=0.05)
+    return cache
+
+
+def test_l1_cache_lru_and_ttl():
+    cache = make_cache()
+    cache.put('fer:cache:GetMOInfoExtendedRequest:1', b'1')
+    cache.put('fer:cache:GetMOInfoExtendedRequest:2', b'2')
+    assert cache.get('fer:cache:GetMOInfoExtendedRequest:1') == (True, b'1')
+    cache.put('fer:cache:GetMOInfoExtendedRequest:3', b'3')
+    # Вытеснена давно не читавшаяся запись
+    assert cache.get('fer:cache:GetMOInfoExtendedRequest:2') == (False, None)
+    assert cache.get('user:1:session') == (False, None)
+    assert cache.snapshot()['mo']['hit'] == 1 and cache.snapshot()['mo']['evicted'] == 1
+
+    cache.put('short:1', b'x')
+    time.sleep(0.06)
+    assert cache.get('short:1') == (False, None)
+    assert cache.snapshot()['short']['expired'] == 1
+
+
+def test_l1_cache_invalidation_messages():
+    cache = make_cache(max_entries=10)
+    cache.put('fer:cache:GetMOInfoExtendedRequest:1', b'1')
+    cache.put('fer:cache:GetMOInfoExtendedRequest:2', b'2')
+    assert cache.tracked(['fer:cache:GetMOInfoExtendedRequest:1', 'user:1:session', 'fer:cache:*']) == [
+        'fer:cache:GetMOInfoExtendedRequest:1', 'fer:cache:*'
+    ]
+
+    # Свои сообщения процесс пропускает
+    cache.handle_message(cache.message(['fer:cache:GetMOInfoExtendedRequest:1']))
+    assert cache.get('fer:cache:GetMOInfoExtendedRequest:1')[0]
+
+    cache.handle_message('other-host:1\nfer:cache:GetMOInfoExtendedRequest:*')
+    assert cache.get('fer:cache:GetMOInfoExtendedRequest:1') == (False, None)
+    assert cache.get('fer:cache:GetMOInfoExtendedRequest:2') == (False, None)
+    assert cache.snapshot()['mo']['invalidated'] == 2
+
+
+if __name__ == "__main__":
+    test_l1_cache_lru_and_ttl()
+    test_l1_cache_invalidation_messages()
+    print('test_l1_cache: success')
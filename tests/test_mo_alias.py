@@ -0,0 +1,89 @@
+import sys
+import os
+
+# Добавляем корневую директорию проекта в Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.mo_alias_service import MoAliasService
+from services.redis_service import redis_service
+from redis.exceptions import ConnectionError
+
+
+def test_mo_alias_get_many():
+    service = MoAliasService()
+    service.redis_key = "test_mo_alias"
+    service.hash_key = "test_mo_alias:by_oid"
+    service.version_key = "test_mo_alias:version"
+    try:
+        service._store({'1.2.3': {'short_name_text': 'Поликлиника 1', 'short_name_ttl': None}})
+        first = service.get_many(['1.2.3', '9.9.9'])
+        assert first == {'1.2.3': {'short_name_text': 'Поликлиника 1', 'short_name_ttl': None}, '9.9.9': None}
+        assert service.get_mo_info_by_oid(' 1.2.3 ') == first['1.2.3']
+
+        # Перезагрузка таблицы меняет версию и сбрасывает снимок процесса
+        service._store({'9.9.9': {'short_name_text': 'Поликлиника 9', 'short_name_ttl': None}})
+        assert service.get_many(['1.2.3', '9.9.9'])['9.9.9'] == {'short_name_text': 'Поликлиника 9', 'short_name_ttl': None}
+        assert service.get_mo_info_by_oid('1.2.3') is None
+    finally:
+        redis_service.delete(service.hash_key, service.version_key)
+
+
+def test_mo_alias_get_many_after_redis_error():
+    service = MoAliasService()
+    service.redis_key = "test_mo_alias"
+    service.hash_key = "test_mo_alias:by_oid"
+    service.version_key = "test_mo_alias:version"
+    client = redis_service.client
+    execute_command = client.execute_command
+    failures = []
+
+    def failing_execute_command(*args, **options):
+        # Первый HMGET падает, как при обрыве соединения
+        if args[0] == 'HMGET' and not failures:
+            failures.append(args)
+            raise ConnectionError('test')
+        return execute_command(*args, **options)
+
+    try:
+        service._store({'1.2.3': {'short_name_text': 'Поликлиника 1', 'short_name_ttl': None}})
+        client.execute_command = failing_execute_command
+        assert service.get_many(['1.2.3']) == {'1.2.3': None}
+        assert failures
+        # None от сбоя не попал в снимок - псевдоним возвращается
+        assert service.get_many(['1.2.3'])['1.2.3'] == {'short_name_text': 'Поликлиника 1', 'short_name_ttl': None}
+    finally:
+        del client.execute_command
+        redis_service.delete(service.hash_key, service.version_key)
+
+def test_mo_alias_version_redis_error():
+    service = MoAliasService()
+    service.redis_key = "test_mo_alias"
+    service.hash_key = "test_mo_alias:by_oid"
+    service.version_key = "test_mo_alias:version"
+    client = redis_service.client
+    execute_command = client.execute_command
+    loads = []
+
+    def failing_execute_command(*args, **options):
+        if args[0] == 'GET':
+            raise ConnectionError('test')
+        return execute_command(*args, **options)
+
+    try:
+        service._store({'1.2.3': {'short_name_text': 'Поликлиника 1', 'short_name_ttl': None}})
+        service.load_mo_alias_from_artifact = lambda: loads.append(1)
+        client.execute_command = failing_execute_command
+        # Сбой Redis - не повод перечитывать mo_alias.bin
+        assert service.version() is None
+        assert service.get_many(['1.2.3']) == {'1.2.3': None}
+        assert not loads
+    finally:
+        del client.execute_command
+        redis_service.delete(service.hash_key, service.version_key)
+
+
+if __name__ == "__main__":
+    test_mo_alias_get_many()
+    test_mo_alias_get_many_after_redis_error()
+    test_mo_alias_version_redis_error()
+    print('test_mo_alias: success')
@@ -0,0 +1,47 @@
+import sys
+import os
+import tempfile
+
+# Добавляем корневую директорию проекта в Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.mo_alias_artifact import MoAliasArtifact, write_artifact
+
+
+def test_mo_alias_artifact_round_trip():
+    mo_alias = {
+        '1.2.643.5.1.13.13.12.2.72.9001': {'short_name_text': 'Поликлиника №1', 'short_name_ttl': 'поликлиника один'},
+        '1.2.643.5.1.13.13.12.2.72.10': {'short_name_text': 'ОКБ', 'short_name_ttl': None},
+        '1.2.3': {'short_name_text': None, 'short_name_ttl': ''},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'mo_alias.bin')
+        write_artifact(mo_alias, path)
+        artifact = MoAliasArtifact(path)
+        try:
+            assert artifact.count == 3
+            assert artifact.to_dict() == mo_alias
+            for oid, alias in mo_alias.items():
+                assert artifact.get(oid) == alias
+            assert artifact.get('1.2.4') is None
+            assert artifact.get('') is None
+        finally:
+            artifact.close()
+
+
+def test_mo_alias_artifact_bad_format():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'mo_alias.bin')
+        with open(path, 'wb') as file:
+            file.write(b'not an artifact' * 10)
+        try:
+            MoAliasArtifact(path)
+            assert False, 'ожидалась ошибка формата'
+        except ValueError:
+            pass
+
+
+if __name__ == "__main__":
+    test_mo_alias_artifact_round_trip()
+    test_mo_alias_artifact_bad_format()
+    print('test_mo_alias_artifact: success')
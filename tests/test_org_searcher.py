@@ -0,0 +1,59 @@
+import sys
+import os
+import asyncio
+
+# Добавляем корневую директорию проекта в Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.async_redis_service import async_redis_service
+from services.org_searcher import OrgSearcher, org_index_cache
+
+
+def test_org_searcher_index_cache():
+    medic_orgs = [
+        {'oid': f"test.{i}", 'name': f'ГБУЗ ТО "Городская поликлиника №{i}"', 'address': f"г. Тюмень, ул. Ленина, д. {i}"}
+        for i in range(1, 6)
+    ]
+    org_index_cache.clear()
+    misses = org_index_cache.stats['miss']
+
+    assert OrgSearcher(medic_orgs, 109).search('поликлиника 3') is medic_orgs[2]
+    # Другой пользователь с тем же списком - индекс из кэша, организация из своего списка
+    same_orgs = [dict(org) for org in medic_orgs]
+    assert OrgSearcher(same_orgs, 109).search('тюмень ул ленина д 4') is same_orgs[3]
+    assert org_index_cache.stats['miss'] == misses + 1
+
+    # Список изменился - индекс перестраивается
+    same_orgs[0]['address'] = 'г. Тюмень, ул. Мира, д. 1'
+    assert OrgSearcher(same_orgs, 109).search('тюмень ул мира д 1') is same_orgs[0]
+    assert org_index_cache.stats['miss'] == misses + 2
+
+
+async def _org_searcher_asearch(medic_orgs):
+    first = await OrgSearcher(medic_orgs, 109).asearch('поликлиника 3')
+    second = await OrgSearcher([dict(org) for org in medic_orgs], 109).asearch('тюмень ул ленина д 4')
+    await async_redis_service.close()
+    return first, second
+
+
+def test_org_searcher_asearch():
+    medic_orgs = [
+        {'oid': f"test.{i}", 'name': f'ГБУЗ ТО "Городская поликлиника №{i}"', 'address': f"г. Тюмень, ул. Ленина, д. {i}"}
+        for i in range(1, 6)
+    ]
+    org_index_cache.clear()
+    misses = org_index_cache.stats['miss']
+
+    first, second = asyncio.run(_org_searcher_asearch(medic_orgs))
+    assert first is medic_orgs[2]
+    assert second['address'] == medic_orgs[3]['address']
+    # Индекс, построенный асинхронно, общий с синхронным поиском
+    assert org_index_cache.stats['miss'] == misses + 1
+    assert OrgSearcher(medic_orgs, 109).search('поликлиника 2') is medic_orgs[1]
+    assert org_index_cache.stats['miss'] == misses + 1
+
+
+if __name__ == "__main__":
+    test_org_searcher_index_cache()
+    test_org_searcher_asearch()
+    print('test_org_searcher: success')
@@ -0,0 +1,38 @@
+import sys
+import os
+
+# Добавляем корневую директорию проекта в Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.profession_searcher import ProfessionSearcher, profession_searcher
+
+
+def test_profession_searcher_index():
+    assert profession_searcher.get_profession_by_code('109')['name'] == 'терапевт'
+    assert profession_searcher.get_profession_by_name('терапевт участковый')['code'] == '110'
+    assert profession_searcher.get_profession_by_code('нет такого') is None
+    assert all(p['show_in_help'] == '1' for p in profession_searcher.help_professions)
+    assert len(profession_searcher.normalized_names) == len(profession_searcher.professions)
+
+
+def test_profession_searcher_search():
+    assert profession_searcher.search('терапевт')['id'] == '109'
+    # Индекс не зависит от экземпляра: тот же результат, что у нового поисковика
+    assert ProfessionSearcher().search('стоматолог хирург') == profession_searcher.search('стоматолог хирург')
+
+
+def test_profession_searcher_lemmas():
+    # Словоформы и разговорные названия (spec_synonyms.csv) - без нечеткого поиска
+    assert profession_searcher._find_by_lemmas('к лору')['name'] == 'оториноларинголог'
+    assert profession_searcher._find_by_lemmas('окулисту')['code'] == '54'
+    assert profession_searcher._find_by_lemmas('запишите к зубному врачу')['code'] == '104'
+    assert profession_searcher._find_by_lemmas('к участковому педиатру')['name'] == 'педиатр участковый'
+    assert profession_searcher._find_by_lemmas('массаж') is None
+    assert profession_searcher.search('кожнику')['code'] == '24'
+
+
+if __name__ == "__main__":
+    test_profession_searcher_index()
+    test_profession_searcher_search()
+    test_profession_searcher_lemmas()
+    print('test_profession_searcher: success')
@@ -59,6 +59,25 @@ def test_redis_hget():
         print(f"Ошибка Redis test_redis_hget: {e}")
         return False
 
+def test_redis_hset_many():
+    try:
+        redis_service.hset_many("test_key_hset_many", {'a': 1, 'b': {'x': [1, 2]}}, 30)
+        redis_service.client.expire("test_key_hset_many", 5)
+        # Обновление существующего поля тоже продлевает TTL
+        redis_service.hset("test_key_hset_many", 'a', 2, 60)
+
+        object = redis_service.hgetall("test_key_hset_many")
+        ttl = redis_service.client.ttl("test_key_hset_many")
+        redis_service.delete("test_key_hset_many")
+
+        if object == {'a': 2, 'b': {'x': [1, 2]}} and 30 < ttl <= 60:
+            print('test_redis_hset_many: success')
+        else:
+            print('test_redis_hset_many: fail')
+    except Exception as e:
+        print(f"Ошибка Redis test_redis_hset_many: {e}")
+        return False
+
 def test_redis_delete():
     try:
         redis_service.delete("test_key_name")
@@ -84,4 +103,5 @@ if __name__ == "__main__":
     test_redis_simple()
     test_redis_hset()
     test_redis_hget()
+    test_redis_hset_many()
     test_redis_delete()
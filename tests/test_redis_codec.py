@@ -0,0 +1,74 @@
+import sys
+import os
+
+# Добавляем корневую директорию проекта в Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.redis_codec import FLAG_ZLIB, HEADER_SIZE, MAGIC, Codec, ValueCodec
+
+
+SLOTS = {
+    f"{day:02d}.01.2025": {
+        f"{hour:02d}:00": {'time': f"{hour:02d}:00", 'room': 'Кабинет 1', 'slot_id': f"{day}{hour}", 'date': f"{day:02d}.01.2025"}
+        for hour in range(8, 18)
+    }
+    for day in range(1, 29)
+}
+
+
+def test_redis_codec_round_trip():
+    for codec_name in ('json', 'msgpack'):
+        codec = ValueCodec(codec_name, compress_min_bytes=1024)
+        encoded = codec.encode(SLOTS)
+        assert encoded[:1] == MAGIC
+        assert encoded[3] & FLAG_ZLIB
+        assert codec.decode(encoded) == SLOTS
+        assert codec.decode(codec.encode({'fio': 'Иванов'})) == {'fio': 'Иванов'}
+        assert codec.encode('строка') == 'строка' and codec.encode(5) == 5
+
+
+def test_redis_codec_reads_other_codecs_and_legacy():
+    msgpack_codec = ValueCodec('msgpack', compress_min_bytes=0)
+    json_codec = ValueCodec('json')
+    assert json_codec.decode(msgpack_codec.encode([1, 2])) == [1, 2]
+    assert msgpack_codec.encode([1, 2])[3] == 0
+    # Прежний формат: JSON-строка, число и строка как есть
+    assert msgpack_codec.decode('{"fio": "\\u0418\\u0432\\u0430\\u043d\\u043e\\u0432"}') == {'fio': 'Иванов'}
+    assert msgpack_codec.decode(b'900') == 900
+    assert msgpack_codec.decode('01.01.2025') == '01.01.2025'
+
+
+def test_redis_codec_unknown_version():
+    codec = ValueCodec('msgpack')
+    encoded = codec.encode([1])
+    try:
+        codec.decode(MAGIC + bytes((99,)) + encoded[2:])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('unknown format version must raise ValueError')
+    assert len(encoded) > HEADER_SIZE
+
+
+def test_redis_codec_incomplete_codec():
+    class DumpsOnly(Codec):
+        id = 99
+        name = 'dumps_only'
+
+        def dumps(self, value):
+            return b''
+
+    try:
+        DumpsOnly()
+    except TypeError:
+        pass
+    else:
+        raise AssertionError('codec without loads must not be instantiable')
+
+
+if __name__ == "__main__":
+    test_redis_codec_round_trip()
+    test_redis_codec_reads_other_codecs_and_legacy()
+    test_redis_codec_unknown_version()
+    test_redis_codec_incomplete_codec()
+    print('test_redis_codec: success')
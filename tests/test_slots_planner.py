@@ -0,0 +1,44 @@
+import sys
+import os
+
+# Добавляем корневую директорию проекта в Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import date
+from services.slots_planner import SlotsPlanner, first_window, slots_windows, window_request
+
+SLOTS = {
+    '20.01.2025': {'09:00': {'time': '09:00', 'room': '1', 'slot_id': '1', 'date': '20.01.2025'}},
+    '27.01.2025': {'10:00': {'time': '10:00', 'room': '1', 'slot_id': '2', 'date': '27.01.2025'}},
+}
+
+
+def test_windows_and_segments():
+    assert slots_windows(14) == [14, 21, 28]
+    assert SlotsPlanner().segments([14, 21, 28]) == [(0, 14), (15, 21), (22, 28)]
+
+    request = window_request({'date_start': '2025-01-01', 'date_end': '2025-01-15', 'post_id': 109}, 15, 21)
+    assert (request['date_start'], request['date_end'], request['post_id']) == ('2025-01-16', '2025-01-22', 109)
+
+
+def test_first_window_matches_sequential_widening():
+    # Первое окно (до 15.01) пустое, второе (до 22.01) содержит только слот 20.01
+    assert first_window(SLOTS, date(2025, 1, 1), [14, 21, 28]) == {'20.01.2025': SLOTS['20.01.2025']}
+    assert first_window(SLOTS, date(2025, 1, 1), [7]) == {}
+
+
+def test_auto_strategy_uses_density():
+    planner = SlotsPlanner()
+    planner.mode = 'auto'
+    assert planner.choose('1') == SlotsPlanner.WIDE
+
+    planner.observe('1', {'01.01.2025': {str(i): {} for i in range(1000)}}, 29)
+    assert planner.choose('1') == SlotsPlanner.CONCURRENT
+    assert planner.choose('1', concurrent_available=False) == SlotsPlanner.WIDE
+
+
+if __name__ == "__main__":
+    test_windows_and_segments()
+    test_first_window_matches_sequential_widening()
+    test_auto_strategy_uses_density()
+    print('test_slots_planner: success')
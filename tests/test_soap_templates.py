@@ -0,0 +1,50 @@
+import sys
+import os
+
+# Добавляем корневую директорию проекта в Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lxml import etree
+from clients.soap_templates import soap_templates, SoapTemplate
+
+
+def test_all_templates_loaded():
+    assert set(soap_templates.actions()) == {
+        'CreateAppointmentRequest',
+        'GetMOInfoExtendedRequest',
+        'GetMOResourceInfoRequest',
+        'GetPatientInfoBySnilsRequest',
+        'GetPatientInfoRequest',
+        'GetScheduleInfoRequest',
+        'IdentifyPatientByPhoneRequest',
+    }
+
+
+def test_render_escapes_values():
+    body = soap_templates.render('IdentifyPatientByPhoneRequest', {
+        'session_id': 'a1b2',
+        'phone': '<b>&"Иван"',
+    })
+    assert isinstance(body, bytes)
+
+    root = etree.fromstring(body)
+    phone = root.xpath('//*[local-name()="Phone"]/text()')
+    assert phone == ['<b>&"Иван"']
+
+
+def test_render_missing_key():
+    template = SoapTemplate('Test', '<a>{session_id}</a><b>{slot_id}</b>')
+    assert template.fields == {'session_id', 'slot_id'}
+    try:
+        template.render({'session_id': '1'})
+    except KeyError as e:
+        assert str(e) == "'slot_id'"
+    else:
+        raise AssertionError('KeyError expected')
+
+
+if __name__ == "__main__":
+    test_all_templates_loaded()
+    test_render_escapes_values()
+    test_render_missing_key()
+    print('test_soap_templates: success')
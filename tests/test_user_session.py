@@ -0,0 +1,98 @@
+import sys
+import os
+import asyncio
+
+# Добавляем корневую директорию проекта в Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.async_redis_service import async_redis_service
+from services.redis_service import redis_service
+from services.user_session import session_scope, set_session_field, user_session
+
+
+async def _user_session():
+    await async_redis_service.delete("user:test_session:session")
+    async with session_scope():
+        session = user_session("test_session")
+        session.set("available_slots", {'01.02.2025': {'10:00': {'slot_id': '1', 'room': '101'}}}, 900)
+        session.set("selected_slot", {'slot_id': '1'}, 1)
+        cached = await session.get("available_slots")
+
+    ttl = await async_redis_service.client.ttl("user:test_session:session")
+    await asyncio.sleep(1.1)
+    async with session_scope():
+        session = user_session("test_session")
+        slots = await session.get("available_slots")
+        selected_slot = await session.get("selected_slot")
+        selected_date = await session.get("selected_date", 'нет')
+
+    await async_redis_service.delete("user:test_session:session")
+    await async_redis_service.close()
+    return cached, ttl, slots, selected_slot, selected_date
+
+
+def test_user_session():
+    cached, ttl, slots, selected_slot, selected_date = asyncio.run(_user_session())
+    assert cached == slots == {'01.02.2025': {'10:00': {'slot_id': '1', 'room': '101'}}}
+    assert 1 < ttl <= 900
+    assert selected_slot is None
+    assert selected_date == 'нет'
+
+
+async def _user_session_clear():
+    await async_redis_service.delete("user:test_session:session")
+    async with session_scope():
+        session = user_session("test_session")
+        session.set("fsm:data", {'last_name': 'Иванов', 'fer_session_id': 'abc'}, 3600)
+        session.set("post_id", 109, 900)
+
+    async with session_scope():
+        session = user_session("test_session")
+        await session.clear()
+        in_request = await session.get("fsm:data"), await session.get("post_id")
+
+    async with session_scope():
+        session = user_session("test_session")
+        stored = await session.get("fsm:data"), await session.get("post_id")
+    ttl = await async_redis_service.client.ttl("user:test_session:session")
+
+    await async_redis_service.delete("user:test_session:session")
+    await async_redis_service.close()
+    return in_request, stored, ttl
+
+
+def test_user_session_clear_keeps_fsm():
+    in_request, stored, ttl = asyncio.run(_user_session_clear())
+    # Поля обработчиков сброшены, данные FSM - нет
+    assert in_request == stored == ({'last_name': 'Иванов', 'fer_session_id': 'abc'}, None)
+    assert 3500 < ttl <= 3600
+
+
+async def _set_session_field():
+    await async_redis_service.delete("user:test_session:session")
+    async with session_scope():
+        user_session("test_session").set("fsm:data", {'last_name': 'Иванов'}, 3600)
+
+    # Запись из Celery не сокращает TTL хеша до срока своего поля
+    written = set_session_field("test_session", "medic_orgs", [{'oid': '1.2.3'}], 900)
+    ttl = redis_service.client.ttl("user:test_session:session")
+    async with session_scope():
+        medic_orgs = await user_session("test_session").get("medic_orgs")
+
+    await async_redis_service.delete("user:test_session:session")
+    await async_redis_service.close()
+    return written, ttl, medic_orgs
+
+
+def test_set_session_field():
+    written, ttl, medic_orgs = asyncio.run(_set_session_field())
+    assert written
+    assert 3500 < ttl <= 3600
+    assert medic_orgs == [{'oid': '1.2.3'}]
+
+
+if __name__ == "__main__":
+    test_user_session()
+    test_user_session_clear_keeps_fsm()
+    test_set_session_field()
+    print('test_user_session: success')
@@ -0,0 +1,151 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Union
+
+from lxml import etree
+
+NAMESPACES = {
+    'soap': 'http://schemas.xmlsoap.org/soap/envelope/',
+    'ns': 'http://www.rt-eu.ru/med/er/v2_0'
+}
+
+
+@dataclass(slots=True)
+class Patient:
+    patient_id: str
+    last_name: Optional[str] = None
+    first_name: Optional[str] = None
+    middle_name: Optional[str] = None
+
+
+@dataclass(slots=True)
+class MedicalOrganization:
+    id: str
+    oid: str
+    name: str
+    address: str
+    phone: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'id': self.id, 'oid': self.oid, 'name': self.name, 'address': self.address, 'phone': self.phone}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'MedicalOrganization':
+        return cls(data.get('id', ''), data.get('oid', ''), data.get('name', ''), data.get('address', ''), data.get('phone'))
+
+
+@dataclass(slots=True)
+class Resource:
+    snils: Optional[str]
+    last_name: str = ''
+    first_name: str = ''
+    middle_name: str = ''
+    available_dates: List[str] = field(default_factory=list)
+    no_schedule_reason: Optional[str] = None
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.last_name} {self.first_name} {self.middle_name}"
+
+    @property
+    def available(self) -> bool:
+        """Есть свободные даты и нет причины отсутствия расписания."""
+        return not self.no_schedule_reason and bool(self.available_dates)
+
+
+@dataclass(slots=True)
+class Slot:
+    slot_id: str
+    date: str  # ДД.ММ.ГГГГ
+    time: str  # ЧЧ:ММ
+    room: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'time': self.time, 'room': self.room, 'slot_id': self.slot_id, 'date': self.date}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Slot':
+        return cls(data['slot_id'], data['date'], data['time'], data.get('room'))
+
+
+@dataclass(slots=True)
+class AppointmentResult:
+    status: Optional[str]
+    book_id: Optional[str] = None
+
+
+def _xpath(path: str) -> etree.XPath:
+    return etree.XPath(path, namespaces=NAMESPACES, smart_strings=False)
+
+
+# Выражения компилируются один раз при импорте модуля
+_PHONE_PATIENT = _xpath('//ns:IdentifyPatientByPhoneResponse/ns:Patient_Data')
+_PATIENT_INFO_ID = _xpath('//ns:GetPatientInfoResponse/ns:Patient_Id/text()')
+_PATIENT_ID = _xpath('ns:Patient_Id/text()')
+_LAST_NAME = _xpath('ns:Last_Name/text()')
+_FIRST_NAME = _xpath('ns:First_Name/text()')
+_MIDDLE_NAME = _xpath('ns:Middle_Name/text()')
+
+_MO = _xpath('//ns:GetMOInfoExtendedResponse/ns:MO_List/ns:MO')
+_MO_ID = _xpath('ns:MO_Id/text()')
+_MO_OID = _xpath('ns:MO_OID/text()')
+_MO_NAME = _xpath('ns:MO_Name/text()')
+_MO_ADDRESS = _xpath('ns:MO_Address/text()')
+_MO_PHONE = _xpath('ns:MO_Phone/text()')
+
+_APPOINTMENT_STATUS = _xpath('//ns:CreateAppointmentResponse/ns:Status/ns:Status_Code/text()')
+_APPOINTMENT_BOOK_ID = _xpath('//ns:CreateAppointmentResponse/ns:Book_Id_Mis/text()')
+
+
+def _root(response: Union[str, bytes]):
+    if isinstance(response, str):
+        response = response.encode('utf-8')
+    return etree.fromstring(response)
+
+
+def _first(xpath: etree.XPath, node, default=None):
+    result = xpath(node)
+    return result[0] if result else default
+
+
+def decode_patient_by_phone(response: Union[str, bytes]) -> Optional[Patient]:
+    """Разбор IdentifyPatientByPhoneResponse."""
+    patient_data = _first(_PHONE_PATIENT, _root(response))
+    if patient_data is None:
+        return None
+
+    patient_id = _first(_PATIENT_ID, patient_data)
+    if not patient_id:
+        return None
+
+    return Patient(
+        patient_id,
+        _first(_LAST_NAME, patient_data),
+        _first(_FIRST_NAME, patient_data),
+        _first(_MIDDLE_NAME, patient_data),
+    )
+
+
+def decode_patient_info(response: Union[str, bytes]) -> Optional[Patient]:
+    """Разбор GetPatientInfoResponse (поиск по ФИО или СНИЛС)."""
+    patient_id = _first(_PATIENT_INFO_ID, _root(response))
+    return Patient(patient_id) if patient_id else None
+
+
+def decode_mo_list(response: Union[str, bytes]) -> List[MedicalOrganization]:
+    """Разбор GetMOInfoExtendedResponse."""
+    return [
+        MedicalOrganization(
+            _first(_MO_ID, mo, ''),
+            _first(_MO_OID, mo, ''),
+            _first(_MO_NAME, mo, ''),
+            _first(_MO_ADDRESS, mo, ''),
+            _first(_MO_PHONE, mo),
+        )
+        for mo in _MO(_root(response))
+    ]
+
+
+def decode_appointment(response: Union[str, bytes]) -> AppointmentResult:
+    """Разбор CreateAppointmentResponse."""
+    root = _root(response)
+    return AppointmentResult(_first(_APPOINTMENT_STATUS, root), _first(_APPOINTMENT_BOOK_ID, root))
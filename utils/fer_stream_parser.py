@@ -0,0 +1,136 @@
+from datetime import datetime
+from io import BytesIO
+from typing import Dict, Iterator, Optional, Union
+
+from lxml import etree
+
+from utils.fer_decoders import Resource, Slot
+
+NS = '{http://www.rt-eu.ru/med/er/v2_0}'
+
+RESOURCE = NS + 'Resource'
+RESOURCE_AVAILABLE = NS + 'Resource_Available'
+SPECIALIST = NS + 'Specialist'
+LAST_NAME = NS + 'Last_Name'
+FIRST_NAME = NS + 'First_Name'
+MIDDLE_NAME = NS + 'Middle_Name'
+SNILS = NS + 'SNILS'
+NO_SCHEDULE_REASON = NS + 'No_Schedule_Reason'
+NO_SCHEDULE_REASON_CODE = NS + 'No_Schedule_Reason_Сode'
+AVAILABLE_DATES = NS + 'Available_Dates'
+AVAILABLE_DATE = NS + 'Available_Date'
+
+SLOTS = NS + 'Slots'
+SCHEDULE = NS + 'Schedule'
+SLOT_ID = NS + 'Slot_Id'
+VISIT_TIME = NS + 'VisitTime'
+ROOM = NS + 'Room'
+
+
+def _source(response: Union[str, bytes]) -> BytesIO:
+    if isinstance(response, str):
+        response = response.encode('utf-8')
+    return BytesIO(response)
+
+
+def _release(elem):
+    """Освобождает разобранный элемент и уже обработанных соседей."""
+    elem.clear()
+    parent = elem.getparent()
+    if parent is not None:
+        while elem.getprevious() is not None:
+            del parent[0]
+
+
+def _split_visit_time(visit_time: str):
+    # Быстрый путь для 'YYYY-MM-DDTHH:MM...' без создания datetime
+    if len(visit_time) >= 16 and visit_time[4] == '-' and visit_time[7] == '-' and visit_time[10] in 'T ':
+        return (
+            f"{visit_time[8:10]}.{visit_time[5:7]}.{visit_time[0:4]}",
+            visit_time[11:16]
+        )
+    dt = datetime.fromisoformat(visit_time.replace('Z', '+00:00'))
+    return dt.strftime('%d.%m.%Y'), dt.strftime('%H:%M')
+
+
+def iter_resources(response: Union[str, bytes]) -> Iterator[Resource]:
+    """Потоковый разбор ресурсов (врачей) из GetMOResourceInfoResponse."""
+    for _, element in etree.iterparse(_source(response), events=('end',), tag=RESOURCE):
+        parent = element.getparent()
+        if parent is None or parent.tag != RESOURCE_AVAILABLE:
+            continue
+
+        resource = Resource(None)
+        for child in element:
+            tag = child.tag
+            if tag == SPECIALIST:
+                for field in child:
+                    if field.tag == LAST_NAME and not resource.last_name:
+                        resource.last_name = field.text or ''
+                    elif field.tag == FIRST_NAME and not resource.first_name:
+                        resource.first_name = field.text or ''
+                    elif field.tag == MIDDLE_NAME and not resource.middle_name:
+                        resource.middle_name = field.text or ''
+                    elif field.tag == SNILS and not resource.snils:
+                        resource.snils = field.text
+            elif tag == NO_SCHEDULE_REASON:
+                for code in child:
+                    if code.tag == NO_SCHEDULE_REASON_CODE and code.text and not resource.no_schedule_reason:
+                        resource.no_schedule_reason = code.text
+            elif tag == AVAILABLE_DATES:
+                resource.available_dates.extend(
+                    date.text for date in child if date.tag == AVAILABLE_DATE and date.text
+                )
+
+        _release(element)
+        yield resource
+
+
+def iter_slots(response: Union[str, bytes]) -> Iterator[Slot]:
+    """Потоковый разбор слотов из GetScheduleInfoResponse (без Slot_Id или VisitTime пропускаются)."""
+    for _, element in etree.iterparse(_source(response), events=('end',), tag=SLOTS):
+        parent = element.getparent()
+        if parent is None or parent.tag != SCHEDULE:
+            continue
+
+        slot_id = visit_time = room = None
+        for child in element:
+            tag = child.tag
+            if tag == SLOT_ID and not slot_id:
+                slot_id = child.text
+            elif tag == VISIT_TIME and not visit_time:
+                visit_time = child.text
+            elif tag == ROOM and not room:
+                room = child.text
+
+        _release(element)
+
+        if not slot_id or not visit_time:
+            continue
+
+        date_str, time_str = _split_visit_time(visit_time)
+        yield Slot(slot_id, date_str, time_str, room)
+
+
+def parse_medics_stream(response: Union[str, bytes]) -> Dict[str, Optional[str]]:
+    """
+    Потоковый разбор GetMOResourceInfoResponse за один проход.
+
+    Returns:
+        Dict[str, Optional[str]]: ФИО врача -> СНИЛС для врачей,
+        у которых есть доступные даты и нет причины отсутствия расписания
+    """
+    return {resource.full_name: resource.snils for resource in iter_resources(response) if resource.available}
+
+
+def parse_slots_stream(response: Union[str, bytes]) -> Dict[str, Dict[str, Dict[str, str]]]:
+    """
+    Потоковый разбор GetScheduleInfoResponse за один проход.
+
+    Returns:
+        Dict: дата (ДД.ММ.ГГГГ) -> время (ЧЧ:ММ) -> {'time', 'room', 'slot_id', 'date'}
+    """
+    slots = {}
+    for slot in iter_slots(response):
+        slots.setdefault(slot.date, {})[slot.time] = slot.to_dict()
+    return slots
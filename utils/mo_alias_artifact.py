@@ -0,0 +1,196 @@
+"""
+Скомпилированная таблица коротких названий МО (mo_alias.bin).
+
+mo_alias.xlsx компилируется при сборке образа:
+    python -m utils.mo_alias_artifact mo_alias.xlsx -o mo_alias.bin
+
+Формат (little-endian):
+    заголовок: MAGIC (8 байт), версия формата (u32), число записей (u32),
+               sha256 исходного xlsx (32 байта)
+    индекс:    записи, отсортированные по OID: для OID, короткого названия
+               (текст) и короткого названия (ttl) - смещение в блоке строк (u32)
+               и длина (u16, NONE_LENGTH - значение отсутствует)
+    строки:    UTF-8
+
+Файл читается через mmap: поиск OID - двоичный поиск по индексу
+без разбора всей таблицы, pandas и openpyxl во время работы не нужны.
+"""
+import argparse
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import sys
+from typing import Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'MOALIAS\x00'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<8sII32s')
+ENTRY = struct.Struct('<IHIHIH')
+NONE_LENGTH = 0xFFFF
+
+REQUIRED_COLUMNS = ['OID', 'Короткое наименование (текст)', 'Короткое наименование (ttl)']
+
+Alias = Dict[str, Optional[str]]
+
+
+def file_sha256(path: str) -> bytes:
+    with open(path, 'rb') as file:
+        return hashlib.sha256(file.read()).digest()
+
+
+def read_excel(xlsx_path: str) -> Dict[str, Alias]:
+    """
+    Чтение mo_alias.xlsx (только на этапе сборки) с проверкой колонок.
+
+    Returns:
+        Dict[str, Alias]: Словарь с OID в качестве ключа
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(xlsx_path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(cell).strip() if cell is not None else '' for cell in next(rows, ())]
+        missing_columns = [column for column in REQUIRED_COLUMNS if column not in header]
+        if missing_columns:
+            raise ValueError(f"Отсутствуют необходимые колонки: {missing_columns}")
+        oid_index, text_index, ttl_index = (header.index(column) for column in REQUIRED_COLUMNS)
+
+        mo_alias = {}
+        for line, row in enumerate(rows, start=2):
+            if row is None or all(cell is None for cell in row):
+                continue
+            oid = row[oid_index]
+            if oid is None or not str(oid).strip():
+                raise ValueError(f"Строка {line}: пустой OID")
+            oid = str(oid).strip()
+            if oid in mo_alias:
+                logger.warning(f"Строка {line}: OID {oid} повторяется, используется последнее значение")
+            mo_alias[oid] = {
+                'short_name_text': None if row[text_index] is None else str(row[text_index]),
+                'short_name_ttl': None if row[ttl_index] is None else str(row[ttl_index]),
+            }
+        return mo_alias
+    finally:
+        workbook.close()
+
+
+def write_artifact(mo_alias: Dict[str, Alias], path: str, source_sha256: bytes = b'\x00' * 32):
+    """Записывает таблицу в файл формата mo_alias.bin (атомарно, через временный файл)."""
+    blob = bytearray()
+    entries = []
+
+    def add(value: Optional[str]) -> Tuple[int, int]:
+        if value is None:
+            return 0, NONE_LENGTH
+        data = value.encode('utf-8')
+        if len(data) >= NONE_LENGTH:
+            raise ValueError(f"Слишком длинное значение: {value[:50]}...")
+        offset = len(blob)
+        blob.extend(data)
+        return offset, len(data)
+
+    for oid in sorted(mo_alias, key=lambda oid: oid.encode('utf-8')):
+        alias = mo_alias[oid]
+        entries.append(ENTRY.pack(*add(oid), *add(alias.get('short_name_text')), *add(alias.get('short_name_ttl'))))
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(entries), source_sha256))
+        file.write(b''.join(entries))
+        file.write(bytes(blob))
+    os.replace(tmp_path, path)
+
+
+def compile_artifact(xlsx_path: str, artifact_path: str) -> int:
+    """Компилирует xlsx в mo_alias.bin; возвращает число записей."""
+    mo_alias = read_excel(xlsx_path)
+    if not mo_alias:
+        raise ValueError(f"В {xlsx_path} нет записей")
+    write_artifact(mo_alias, artifact_path, file_sha256(xlsx_path))
+    return len(mo_alias)
+
+
+class MoAliasArtifact:
+    """Чтение mo_alias.bin через mmap."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as file:
+            self._data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.count, self.source_sha256 = HEADER.unpack_from(self._data, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self._data.close()
+            raise ValueError(f"{path}: неизвестный формат ({magic!r}, версия {version})")
+        self._blob_offset = HEADER.size + self.count * ENTRY.size
+        if len(self._data) < self._blob_offset:
+            self._data.close()
+            raise ValueError(f"{path}: файл поврежден")
+
+    def _entry(self, index: int) -> Tuple[int, ...]:
+        return ENTRY.unpack_from(self._data, HEADER.size + index * ENTRY.size)
+
+    def _string(self, offset: int, length: int) -> Optional[str]:
+        if length == NONE_LENGTH:
+            return None
+        start = self._blob_offset + offset
+        return self._data[start:start + length].decode('utf-8')
+
+    def _raw_oid(self, index: int) -> bytes:
+        offset, length = self._entry(index)[:2]
+        start = self._blob_offset + offset
+        return self._data[start:start + length]
+
+    def _alias(self, entry: Tuple[int, ...]) -> Alias:
+        return {'short_name_text': self._string(*entry[2:4]), 'short_name_ttl': self._string(*entry[4:6])}
+
+    def get(self, oid: str) -> Optional[Alias]:
+        key = oid.encode('utf-8')
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._raw_oid(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.count and self._raw_oid(low) == key:
+            return self._alias(self._entry(low))
+        return None
+
+    def items(self) -> Iterator[Tuple[str, Alias]]:
+        for index in range(self.count):
+            entry = self._entry(index)
+            yield self._string(*entry[0:2]), self._alias(entry)
+
+    def to_dict(self) -> Dict[str, Alias]:
+        return dict(self.items())
+
+    def is_stale(self, xlsx_path: str) -> bool:
+        """Скомпилирован ли файл не из текущей версии xlsx."""
+        return os.path.exists(xlsx_path) and file_sha256(xlsx_path) != self.source_sha256
+
+    def close(self):
+        self._data.close()
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description='Компиляция mo_alias.xlsx в mo_alias.bin')
+    parser.add_argument('xlsx', nargs='?', default='mo_alias.xlsx', help='Путь к Excel файлу с mo_alias')
+    parser.add_argument('-o', '--output', default='mo_alias.bin', help='Путь к скомпилированному файлу')
+    args = parser.parse_args()
+
+    try:
+        count = compile_artifact(args.xlsx, args.output)
+    except Exception as e:
+        logger.error(f"Ошибка компиляции {args.xlsx}: {e}")
+        sys.exit(1)
+    print(f"Скомпилировано {count} записей: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
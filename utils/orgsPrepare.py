@@ -8,6 +8,8 @@ def prepareOrgsList(medic_orgs):
     if medic_orgs is None:
         return None, None
 
+    aliases = mo_alias_service.get_many(org['oid'] for org in medic_orgs if org['oid'])
+
     for i, org in enumerate(medic_orgs, 1):
         oid = org['oid'] if org['oid'] else None
         name = org['name'] if org['name'] else None
@@ -16,7 +18,7 @@ def prepareOrgsList(medic_orgs):
         if oid is None:
             continue
 
-        alias_object = mo_alias_service.get_mo_info_by_oid(oid)
+        alias_object = aliases.get(str(oid).strip())
         if alias_object:
             short_name = alias_object['short_name_text'] if alias_object['short_name_ttl'] else None
             short_name_ttl = alias_object['short_name_ttl'] if alias_object['short_name_ttl'] else None
@@ -0,0 +1,220 @@
+"""
+Таблица лемм и синонимов специализаций (spec_list.lemmas.json).
+
+Собирается при сборке образа из spec_list.csv и spec_synonyms.csv
+(разговорные названия -> код специализации):
+    python -m utils.spec_lemmas spec_list.csv -o spec_list.lemmas.json
+
+Содержимое (JSON):
+    sources: sha256 исходных CSV - по нему видно, что таблица устарела
+    forms:   словоформа -> лемма для всех форм слов словаря и стоп-слов
+             (парадигмы pymorphy3 строятся один раз, при сборке)
+    stop:    леммы стоп-слов ("к", "запись", "врач", ...)
+    phrases: ключ фразы (отсортированные леммы через пробел) -> номер
+             строки spec_list.csv
+
+Во время работы фраза пользователя разбирается поиском словоформ в словаре;
+pymorphy3 загружается лениво и только для слов, которых нет в таблице,
+результаты его разбора запоминаются.
+"""
+import argparse
+import csv
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+
+# Слова, которые не различают специализации: предлоги, "запись", "врач" и т.п.
+STOP_WORDS = [
+    'к', 'ко', 'на', 'в', 'во', 'у', 'по', 'до', 'и', 'с', 'со', 'мне', 'меня', 'я', 'нас', 'мы',
+    'хочу', 'хотеть', 'нужен', 'нужно', 'надо', 'пожалуйста', 'можно',
+    'запись', 'записать', 'записаться', 'записывать', 'записываться', 'запиши', 'запишите',
+    'прием', 'приём', 'талон', 'врач', 'доктор', 'специалист',
+]
+
+_morph = None
+
+
+def _normalize_text(text: str) -> str:
+    """Нормализация текста, как в ProfessionSearcher, плюс ё -> е"""
+    text = text.lower().strip().replace('ё', 'е')
+    text = text.replace('-', ' ')
+    text = re.sub(r'[^\w\s]', '', text)  # Удаляем пунктуацию
+    text = re.sub(r'\s+', ' ', text)  # Удаляем лишние пробелы
+    return text
+
+
+def _get_morph():
+    """MorphAnalyzer создается при первом обращении (словари pymorphy3 - десятки МБ)."""
+    global _morph
+    if _morph is None:
+        import pymorphy3
+
+        _morph = pymorphy3.MorphAnalyzer()
+    return _morph
+
+
+@lru_cache(maxsize=4096)
+def lemmatize(word: str) -> str:
+    """Нормальная форма слова по наиболее вероятному разбору pymorphy3 (с запоминанием)."""
+    return _get_morph().parse(word)[0].normal_form.replace('ё', 'е')
+
+
+def sources_sha256(*paths: str) -> str:
+    digest = hashlib.sha256()
+    for path in paths:
+        if os.path.exists(path):
+            with open(path, 'rb') as file:
+                digest.update(file.read())
+        digest.update(b'\x00')
+    return digest.hexdigest()
+
+
+def default_synonyms_path(spec_path: str) -> str:
+    return os.path.join(os.path.dirname(spec_path), 'spec_synonyms.csv')
+
+
+def default_table_path(spec_path: str) -> str:
+    return f"{os.path.splitext(spec_path)[0]}.lemmas.json"
+
+
+def read_synonyms(path: str) -> List[Tuple[str, str]]:
+    """Чтение spec_synonyms.csv: пары (синоним, код). Файла может не быть."""
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as file:
+        return [
+            (row['Синоним'], row['Код'].strip())
+            for row in csv.DictReader(file, delimiter=',')
+            if row.get('Синоним') and row.get('Код')
+        ]
+
+
+def read_spec_names(path: str) -> List[Tuple[str, str]]:
+    """Строки spec_list.csv: пары (наименование, код) в порядке файла."""
+    with open(path, 'r', encoding='utf-8') as file:
+        return [(row.get('Наименование', ''), row.get('Код', '')) for row in csv.DictReader(file, delimiter=',')]
+
+
+def build_table(spec_path: str, synonyms_path: str) -> Dict:
+    """Строит таблицу лемм; требует pymorphy3."""
+    morph = _get_morph()
+    forms: Dict[str, str] = {}
+
+    def add_word(word: str, vocabulary: bool = True) -> str:
+        parses = morph.parse(word)
+        # Наименования специализаций - существительные и прилагательные ("зубник", а не глагол "зубникнуть")
+        parse = next((p for p in parses if vocabulary and p.tag.POS in ('NOUN', 'ADJF')), parses[0])
+        lemma = parse.normal_form.replace('ё', 'е')
+        # Сама словоформа - раньше парадигмы: "лору" - форма "лор", а не имени "Лора"
+        forms.setdefault(word, lemma)
+        for form in parse.lexeme:
+            forms.setdefault(form.word.replace('ё', 'е'), lemma)
+        return lemma
+
+    stop = sorted({add_word(word, vocabulary=False) for word in map(_normalize_text, STOP_WORDS)})
+
+    def phrase_key(text: str) -> str:
+        lemmas = {add_word(word) for word in _normalize_text(text).split()}
+        return ' '.join(sorted(lemmas.difference(stop)))
+
+    phrases: Dict[str, int] = {}
+    row_by_code: Dict[str, int] = {}
+    for row, (name, code) in enumerate(read_spec_names(spec_path)):
+        row_by_code.setdefault(code, row)
+        key = phrase_key(name)
+        # При повторах, как и в ProfessionSearcher, побеждает первая запись
+        if key:
+            phrases.setdefault(key, row)
+
+    for synonym, code in read_synonyms(synonyms_path):
+        if code not in row_by_code:
+            logger.warning(f"Синоним '{synonym}': кода {code} нет в {spec_path}")
+            continue
+        key = phrase_key(synonym)
+        if key in phrases and phrases[key] != row_by_code[code]:
+            logger.warning(f"Синоним '{synonym}' совпадает с наименованием строки {phrases[key]}, пропускаем")
+            continue
+        if key:
+            phrases[key] = row_by_code[code]
+
+    return {
+        'version': FORMAT_VERSION,
+        'sources': sources_sha256(spec_path, synonyms_path),
+        'forms': forms,
+        'stop': stop,
+        'phrases': phrases,
+    }
+
+
+def compile_table(spec_path: str, synonyms_path: str, table_path: str) -> int:
+    """Собирает таблицу и записывает ее атомарно; возвращает число фраз."""
+    table = build_table(spec_path, synonyms_path)
+    tmp_path = f"{table_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as file:
+        json.dump(table, file, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, table_path)
+    return len(table['phrases'])
+
+
+class SpecLemmaTable:
+    """Поиск специализации по леммам фразы пользователя."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'r', encoding='utf-8') as file:
+            table = json.load(file)
+        if table.get('version') != FORMAT_VERSION:
+            raise ValueError(f"{path}: неизвестная версия формата {table.get('version')}")
+        self.sources: str = table['sources']
+        self.forms: Dict[str, str] = table['forms']
+        self.stop = frozenset(table['stop'])
+        self.phrases: Dict[str, int] = table['phrases']
+
+    def lemmas(self, text: str) -> List[str]:
+        result = []
+        for word in _normalize_text(text).split():
+            lemma = self.forms.get(word)
+            if lemma is None:
+                lemma = lemmatize(word)
+            result.append(lemma)
+        return result
+
+    def lookup(self, text: str) -> Optional[int]:
+        """Номер строки spec_list.csv для фразы или None."""
+        key = ' '.join(sorted(set(self.lemmas(text)).difference(self.stop)))
+        return self.phrases.get(key) if key else None
+
+    def is_stale(self, spec_path: str, synonyms_path: str) -> bool:
+        """Собрана ли таблица не из текущих версий CSV."""
+        return sources_sha256(spec_path, synonyms_path) != self.sources
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description='Сборка таблицы лемм и синонимов специализаций')
+    parser.add_argument('spec', nargs='?', default='spec_list.csv', help='Путь к CSV файлу со специализациями')
+    parser.add_argument('-s', '--synonyms', default=None, help='Путь к CSV с синонимами (по умолчанию рядом со spec)')
+    parser.add_argument('-o', '--output', default=None, help='Путь к таблице (по умолчанию рядом со spec)')
+    args = parser.parse_args()
+
+    synonyms_path = args.synonyms or default_synonyms_path(args.spec)
+    output = args.output or default_table_path(args.spec)
+    try:
+        count = compile_table(args.spec, synonyms_path, output)
+    except Exception as e:
+        logger.error(f"Ошибка сборки таблицы лемм {args.spec}: {e}")
+        sys.exit(1)
+    print(f"Собрано {count} фраз: {output}")
+
+
+if __name__ == '__main__':
+    main()
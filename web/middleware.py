@@ -2,8 +2,11 @@ import json
 import logging
 from datetime import datetime
 from aiohttp import web
+from aliceio.dispatcher.middlewares.base import BaseMiddleware
+from aliceio.types import Update
 from typing import Callable, Awaitable, Dict, Any
 from config import config
+from services.user_session import session_scope
 
 logging.basicConfig(
     level=logging.INFO,
@@ -114,4 +117,19 @@ def setup_middlewares(app: web.Application) -> None:
     app.middlewares.append(logging_middleware)
     app.middlewares.append(error_handling_middleware)
     app.middlewares.append(validation_middleware)
-    app.middlewares.append(get_requests_middleware)
\ No newline at end of file
+    app.middlewares.append(get_requests_middleware)
+
+class SessionMiddleware(BaseMiddleware[Update]):
+    """
+    Middleware aliceio: сессии пользователей (user:{user_id}:session), открытые
+    обработчиками, записываются в Redis одним конвейером до отправки ответа Алисе.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[Update, Dict[str, Any]], Awaitable[Any]],
+        event: Update,
+        data: Dict[str, Any]
+    ) -> Any:
+        async with session_scope():
+            return await handler(event, data)
@@ -5,9 +5,12 @@ from aliceio.webhook.aiohttp_server import (
     setup_application,
 )
 from config import config
-from web.middleware import logging_middleware, error_handling_middleware, validation_middleware, get_requests_middleware #, address_middleware
+from web.middleware import logging_middleware, error_handling_middleware, validation_middleware, get_requests_middleware, SessionMiddleware #, address_middleware
 from services.patient_service import patient_service
 from clients.fer_client import FERClient
+from clients.async_fer_client import async_fer_client
+from services.async_redis_service import async_redis_service
+from fsm.redis_storage import FSM_STRATEGY, RedisSessionStorage
 from handlers.patient_introduction import setup_patient_introduction_handlers
 from handlers.schedule_selection import setup_schedule_handlers
 from handlers.help import setup_help_handlers
@@ -18,11 +21,28 @@ from handlers.error import setup_error_handlers
 from handlers.step_back import setup_step_back_handlers
 
 
+async def close_fer_client(app: web.Application) -> None:
+    await async_fer_client.close()
+
+
+async def close_redis(app: web.Application) -> None:
+    await async_redis_service.close()
+
+
 def create_app() -> web.Application:
     # Инициализация зависимостей
        
     # Настройка диспетчера
-    dp = Dispatcher(use_api_storage=True)
+    if config.fsm_storage == 'api':
+        dp = Dispatcher(use_api_storage=True)
+        dp.update.outer_middleware(SessionMiddleware())
+    else:
+        dp = Dispatcher(storage=RedisSessionStorage(), fsm_strategy=FSM_STRATEGY)
+        # Сессия открывается до FSMContextMiddleware: состояние FSM читается
+        # тем же HGETALL, что и сессия обработчиков, и записывается вместе с ней
+        dp.update.outer_middleware.unregister(dp.fsm)
+        dp.update.outer_middleware(SessionMiddleware())
+        dp.update.outer_middleware(dp.fsm)
             
     # Регистрируем обработчики из других модулей
     setup_help_handlers(dp)
@@ -45,6 +65,8 @@ def create_app() -> web.Application:
     # Регистрация обработчиков
     requests_handler.register(app, path=config.webhook_path)
     setup_application(app, dp, skill=skill)
+    app.on_cleanup.append(close_fer_client)
+    app.on_cleanup.append(close_redis)
     
     return app
 